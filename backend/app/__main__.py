@@ -1,14 +1,127 @@
+import argparse
+import asyncio
 import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
 
 import uvicorn
 
 
+def _import_times() -> List[Tuple[str, int, int]]:
+	"""(module, self µs, cumulative µs) for ``import app.main`` in a fresh interpreter."""
+	backend_root = Path(__file__).resolve().parents[1]
+	proc = subprocess.run(
+		[sys.executable, "-X", "importtime", "-c", "import app.main"],
+		cwd=backend_root,
+		capture_output=True,
+		text=True,
+	)
+	if proc.returncode != 0:
+		raise SystemExit(proc.stderr)
+	rows = []
+	for line in proc.stderr.splitlines():
+		# "import time:       self [us] |    cumulative | imported package"
+		if not line.startswith("import time:") or "[us]" in line:
+			continue
+		self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+		rows.append((name.rstrip(), int(self_us), int(cumulative_us)))
+	return rows
+
+
+def _startup_report(top: int) -> None:
+	rows = _import_times()
+	total = next((cumulative for name, _, cumulative in rows if name.strip() == "app.main"), 0)
+	print(f"import app.main: {total / 1000:.1f} ms (fresh interpreter, python -X importtime)\n")
+
+	# Self time summed per top-level package shows which dependency the time goes to
+	packages: Dict[str, int] = {}
+	for name, self_us, _ in rows:
+		root = name.strip().split(".", 1)[0]
+		packages[root] = packages.get(root, 0) + self_us
+	print(f"{'package':<28} {'self ms':>9}")
+	for root, self_us in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+		print(f"{root:<28} {self_us / 1000:>9.1f}")
+
+	print(f"\n{'module':<48} {'cumulative ms':>13}")
+	for name, _, cumulative in sorted(rows, key=lambda row: -row[2])[:top]:
+		print(f"{name.strip():<48} {cumulative / 1000:>13.1f}")
+
+	# In this process: app construction and each startup handler, as a server would run them
+	start = time.perf_counter()
+	from .main import create_app, enabled_routers
+
+	imported = time.perf_counter()
+	app = create_app()
+	created = time.perf_counter()
+	print(f"\nrouters: {', '.join(enabled_routers())}")
+	print(f"{'step':<48} {'ms':>13}")
+	print(f"{'import app.main (this process)':<48} {(imported - start) * 1000:>13.1f}")
+	print(f"{'create_app()':<48} {(created - imported) * 1000:>13.1f}")
+
+	async def run_handlers() -> None:
+		for handler in app.router.on_startup:
+			begin = time.perf_counter()
+			result = handler()
+			if asyncio.iscoroutine(result):
+				await result
+			label = f"startup {handler.__module__}.{handler.__name__}"
+			print(f"{label:<48} {(time.perf_counter() - begin) * 1000:>13.1f}")
+		await app.router.shutdown()
+
+	asyncio.run(run_handlers())
+
+
 def main() -> None:
+	parser = argparse.ArgumentParser(prog="python -m app")
+	parser.add_argument(
+		"--startup-report",
+		action="store_true",
+		help="Print an import-time breakdown and startup handler timings instead of serving",
+	)
+	parser.add_argument("--top", type=int, default=15, help="Rows per table in the startup report")
+	parser.add_argument(
+		"--production",
+		action="store_true",
+		default=os.getenv("SERVER_MODE", "").lower() == "production",
+		help="Serve with several worker processes and graceful draining (also SERVER_MODE=production)",
+	)
+	parser.add_argument("--workers", type=int, default=None, help="Worker processes in production mode (default: WEB_CONCURRENCY or the CPU count)")
+	parser.add_argument("--loop", choices=["auto", "uvloop", "asyncio"], default=os.getenv("SERVER_LOOP", "auto"))
+	parser.add_argument("--http", choices=["auto", "httptools", "h11"], default=os.getenv("SERVER_HTTP", "auto"))
+	parser.add_argument(
+		"--graceful-timeout",
+		type=float,
+		default=float(os.getenv("GRACEFUL_TIMEOUT", "30")),
+		help="Seconds in-flight requests get to finish after SIGTERM",
+	)
+	args = parser.parse_args()
+	if args.startup_report:
+		_startup_report(args.top)
+		return
+
 	port_str = os.getenv("PORT", "8000")
 	try:
 		port = int(port_str)
 	except ValueError:
 		port = 8000
+
+	if args.production:
+		from .server import run_production
+
+		workers = args.workers or int(os.getenv("WEB_CONCURRENCY") or os.cpu_count() or 1)
+		run_production(
+			host=os.getenv("HOST", "0.0.0.0"),
+			port=port,
+			workers=max(1, workers),
+			loop=args.loop,
+			http=args.http,
+			graceful_timeout=args.graceful_timeout,
+		)
+		return
+
 	uvicorn.run(
 		"app.main:app",
 		host="0.0.0.0",
@@ -19,5 +132,3 @@ def main() -> None:
 
 if __name__ == "__main__":
 	main()
-
-
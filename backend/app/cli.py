@@ -0,0 +1,104 @@
+"""Maintenance commands for the portfolio backend.
+
+Run from ``backend/`` with the same environment as the server, e.g.::
+
+	python -m app.cli externalize-images
+"""
+import argparse
+
+
+def _migrate(args: argparse.Namespace) -> None:
+	from .routers.blog import Db, init_table
+
+	init_table()
+	if not Db.schema_ready:
+		raise SystemExit("DATABASE_URL not configured")
+	print("Blog schema is up to date")
+
+
+def _externalize_images(args: argparse.Namespace) -> None:
+	from .routers.blog import externalize_existing_images
+
+	changed = externalize_existing_images(batch_size=args.batch_size)
+	print(f"Rewrote {changed} post(s)")
+
+
+def _render_posts(args: argparse.Namespace) -> None:
+	from .routers.blog import render_existing_posts
+
+	rendered = render_existing_posts(batch_size=args.batch_size, everything=args.all)
+	print(f"Rendered {rendered} post(s)")
+
+
+def _snapshot(args: argparse.Namespace) -> None:
+	import asyncio
+
+	from .routers.blog import sync_snapshot
+
+	manifest = asyncio.run(sync_snapshot(full=True))
+	if manifest is None:
+		raise SystemExit("BLOG_SNAPSHOT_DIR not configured")
+	print(f"Wrote snapshot of {manifest['total']} post(s) in {len(manifest['pages'])} page(s)")
+
+
+def _parse_resumes(args: argparse.Namespace) -> None:
+	import json
+	from dataclasses import asdict
+	from pathlib import Path
+
+	from .services.pdf_extract import PdfExtractor, laparams_from_env
+
+	paths = []
+	for target in map(Path, args.paths):
+		paths.extend(sorted(target.glob("*.pdf")) if target.is_dir() else [target])
+	with PdfExtractor(max_workers=args.workers, laparams=laparams_from_env(), pages_per_task=args.pages_per_task) as extractor:
+		for path, parsed in extractor.parse_many(paths):
+			print(json.dumps({"file": str(path), **asdict(parsed)}, ensure_ascii=False))
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(prog="python -m app.cli")
+	commands = parser.add_subparsers(dest="command", required=True)
+
+	migrate = commands.add_parser(
+		"migrate",
+		help="Create the blog table and any missing columns and indexes (see BLOG_MIGRATE)",
+	)
+	migrate.set_defaults(func=_migrate)
+
+	externalize = commands.add_parser(
+		"externalize-images",
+		help="Move inline data-URL images in existing posts into the blob store",
+	)
+	externalize.add_argument("--batch-size", type=int, default=50)
+	externalize.set_defaults(func=_externalize_images)
+
+	render_posts = commands.add_parser(
+		"render-posts",
+		help="Backfill rendered HTML, excerpts and reading stats for stored posts",
+	)
+	render_posts.add_argument("--batch-size", type=int, default=200)
+	render_posts.add_argument("--all", action="store_true", help="Re-render every post, not only unrendered ones")
+	render_posts.set_defaults(func=_render_posts)
+
+	snapshot = commands.add_parser(
+		"snapshot",
+		help="Rebuild the static blog snapshot in BLOG_SNAPSHOT_DIR from scratch",
+	)
+	snapshot.set_defaults(func=_snapshot)
+
+	parse_resumes = commands.add_parser(
+		"parse-resumes",
+		help="Parse PDFs (files or directories of *.pdf) in parallel and print one JSON line per file",
+	)
+	parse_resumes.add_argument("paths", nargs="+")
+	parse_resumes.add_argument("--workers", type=int, default=None)
+	parse_resumes.add_argument("--pages-per-task", type=int, default=2)
+	parse_resumes.set_defaults(func=_parse_resumes)
+
+	args = parser.parse_args()
+	args.func(args)
+
+
+if __name__ == "__main__":
+	main()
@@ -1,22 +1,39 @@
+import importlib
+import os
 from pathlib import Path
 from typing import List
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
-from .models import ContactMessage, Project
-from .routers.projects import router as projects_router
-from .routers.contact import router as contact_router
-from .routers.github import router as github_router
-from .routers.blog import router as blog_router
-from .routers.resume import router as resume_router
-from .routers.uploads import router as uploads_router
+from .services.capacity import threadpool_size
+from .services.fast_json import FastJSONResponse
+from .services.lifecycle import Lifecycle
+from .services.metrics import REGISTRY, MetricsMiddleware
+from .services.static_site import StaticSite
+
+
+# API routers, each mounted at /api/<name>; a disabled router's module is never imported
+ROUTERS = ("projects", "contact", "github", "blog", "resume", "uploads")
+
+
+def enabled_routers() -> List[str]:
+	"""Routers named in API_ROUTERS (comma-separated), or all of them when unset."""
+	raw = os.getenv("API_ROUTERS", "").strip()
+	if not raw or raw == "all":
+		return list(ROUTERS)
+	names = [name.strip() for name in raw.split(",") if name.strip()]
+	unknown = sorted(set(names) - set(ROUTERS))
+	if unknown:
+		raise RuntimeError(f"Unknown router(s) in API_ROUTERS: {', '.join(unknown)}")
+	return [name for name in ROUTERS if name in names]
 
 
 def create_app() -> FastAPI:
-	app = FastAPI(title="Portfolio API", version="1.0.0")
+	# Endpoints without a hand-serialized body still go through jsonable_encoder; render the result with pydantic-core
+	app = FastAPI(title="Portfolio API", version="1.0.0", default_response_class=FastJSONResponse)
 
 	# Configure CORS for development; adjust origins for production as needed
 	app.add_middleware(
@@ -25,43 +42,63 @@ def create_app() -> FastAPI:
 		allow_credentials=True,
 		allow_methods=["*"],
 		allow_headers=["*"],
+		expose_headers=["X-Next-Cursor"],
 	)
 
+	# Outermost, so latency includes the other middleware
+	app.add_middleware(MetricsMiddleware)
+
 	# API Routers
-	app.include_router(projects_router, prefix="/api/projects", tags=["projects"])
-	app.include_router(contact_router, prefix="/api/contact", tags=["contact"])
-	app.include_router(github_router, prefix="/api/github", tags=["github"])
-	app.include_router(blog_router, prefix="/api/blog", tags=["blog"])
-	app.include_router(resume_router, prefix="/api/resume", tags=["resume"])
-	app.include_router(uploads_router, prefix="/api/uploads", tags=["uploads"])
-
-	# Health check
+	for name in enabled_routers():
+		module = importlib.import_module(f".routers.{name}", __package__)
+		app.include_router(module.router, prefix=f"/api/{name}", tags=[name])
+
+	# Size this worker's threadpool (sync endpoints, run_in_threadpool) from THREADPOOL_SIZE or the DB budget
+	@app.on_event("startup")
+	async def size_threadpool() -> None:
+		size = threadpool_size()
+		if size is not None:
+			import anyio.to_thread
+
+			anyio.to_thread.current_default_thread_limiter().total_tokens = size
+
+	# Health check; 503 while draining so load balancers stop routing here before the process exits
 	@app.get("/api/health")
-	def health() -> dict:
-		return {"status": "ok"}
+	def health() -> JSONResponse:
+		if Lifecycle.draining:
+			return JSONResponse({"status": "draining"}, status_code=503)
+		return JSONResponse({"status": "ok"})
+
+	# Prometheus scrape endpoint; set METRICS_TOKEN to require "Authorization: Bearer <token>"
+	@app.get("/api/metrics", include_in_schema=False)
+	def metrics(request: Request) -> PlainTextResponse:
+		token = os.getenv("METRICS_TOKEN")
+		if token and request.headers.get("authorization") != f"Bearer {token}":
+			raise HTTPException(status_code=401, detail="Unauthorized")
+		return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 	# Static file serving for production (frontend build)
-	# Serve built assets under /assets and fallback all routes to index.html
+	# Built files are indexed and precompressed once at startup; unknown paths fall back to index.html
 	frontend_dist = (Path(__file__).resolve().parents[2] / "frontend" / "dist").resolve()
 	if frontend_dist.exists():
-		assets_dir = frontend_dist / "assets"
-		if assets_dir.exists():
-			app.mount("/assets", StaticFiles(directory=str(assets_dir)), name="assets")
+		site = StaticSite(frontend_dist)
 
-		@app.get("/")
-		def index_root():
-			index_file = frontend_dist / "index.html"
-			if not index_file.exists():
-				raise HTTPException(status_code=404, detail="index.html not found")
-			return FileResponse(str(index_file))
+		@app.on_event("startup")
+		async def build_static_site() -> None:
+			await run_in_threadpool(site.build)
 
 		# SPA fallback for client-side routes like /contact, /projects, etc.
-		@app.get("/{full_path:path}")
-		def spa_fallback(full_path: str):  # type: ignore[unused-argument]
-			index_file = frontend_dist / "index.html"
-			if not index_file.exists():
-				raise HTTPException(status_code=404, detail="index.html not found")
-			return FileResponse(str(index_file))
+		@app.api_route("/{full_path:path}", methods=["GET", "HEAD"])
+		async def static_or_spa(request: Request, full_path: str):
+			asset = site.get(full_path)
+			if asset is None:
+				if full_path.startswith("assets/"):
+					# A missing hashed asset must not be answered with HTML
+					raise HTTPException(status_code=404, detail="Not Found")
+				asset = site.index
+				if asset is None:
+					raise HTTPException(status_code=404, detail="index.html not found")
+			return await site.respond(request, asset)
 
 	return app
 
@@ -1,6 +1,7 @@
+from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel, EmailStr, HttpUrl
+from pydantic import BaseModel, EmailStr, Field, HttpUrl
 
 
 class Project(BaseModel):
@@ -14,9 +15,10 @@ class Project(BaseModel):
 
 
 class ContactMessage(BaseModel):
-	name: str
-	email: EmailStr
-	subject: str
+	# Limits match the contact_messages columns, so a valid message always fits
+	name: str = Field(max_length=200)
+	email: EmailStr = Field(max_length=320)
+	subject: str = Field(max_length=300)
 	message: str
 
 
@@ -26,6 +28,37 @@ class BlogPost(BaseModel):
     summary: str
     content: str
     created_at: str
+    # Rendered from content on write; None until a pre-existing row is backfilled
+    html: Optional[str] = None
+    excerpt: Optional[str] = None
+    word_count: Optional[int] = None
+    reading_minutes: Optional[int] = None
+
+
+class BlogPostSummary(BaseModel):
+    slug: str
+    title: str
+    summary: str
+    created_at: str
+    excerpt: Optional[str] = None
+    word_count: Optional[int] = None
+    reading_minutes: Optional[int] = None
+
+
+class BlogSearchHit(BaseModel):
+    slug: str
+    title: str
+    summary: str
+    tags: List[str] = []
+    created_at: str
+    rank: float
+    # Escaped plain text with matches in <mark>; safe to render as HTML
+    snippet: Optional[str] = None
+
+
+class BlogSearchPage(BaseModel):
+    results: List[BlogSearchHit]
+    next_offset: Optional[int] = None
 
 
 class BlogPostCreate(BaseModel):
@@ -40,3 +73,16 @@ class BlogPostUpdate(BaseModel):
     content: Optional[str] = None
 
 
+class BlogPostImport(BaseModel):
+    """One post in a bulk import; ``slug`` is used as given and defaults to the slugified title."""
+    slug: Optional[str] = None
+    title: str
+    summary: str
+    content: str
+    tags: Optional[List[str]] = None
+    created_at: Optional[datetime] = None
+
+
+class BlogImportResult(BaseModel):
+    ok: bool
+    count: int
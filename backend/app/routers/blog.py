@@ -1,41 +1,277 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import List, Optional
+import asyncio
+import base64
+import hashlib
+import html
+import json
+import logging
+import mimetypes
+import threading
+import uuid
+import zlib
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Callable, List, Optional, Sequence, Tuple, TypeVar
 
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from sqlalchemy import MetaData, Table, Column, String, Text, Boolean, TIMESTAMP, text, select, func, create_engine
-from sqlalchemy.dialects.postgresql import JSONB
+from fastapi import APIRouter, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
+from pydantic import BaseModel, ValidationError
+from pydantic_core import to_json
+from sqlalchemy import MetaData, Table, Column, Computed, Index, Integer, String, Text, Boolean, TIMESTAMP, text, select, func, inspect, literal, tuple_, create_engine
+from sqlalchemy.schema import CreateColumn
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import IntegrityError
 
-from ..models import BlogPost, BlogPostCreate, BlogPostUpdate
+from ..models import BlogImportResult, BlogPost, BlogPostCreate, BlogPostImport, BlogPostSummary, BlogPostUpdate, BlogSearchHit, BlogSearchPage
+from ..services.blog_snapshot import BlogSnapshot
+from ..services.blob_store import BLOB_NAME_RE, IMMUTABLE_CACHE_CONTROL, LocalBlobStore, externalize_data_uris, get_blob_store
+from ..services.cache import TTLCache
+from ..services.capacity import pool_sizes, worker_count
+from ..services.change_feed import ChangeFeed, encode_event
+from ..services.lifecycle import Lifecycle, on_drain
+from ..services.fast_json import dump_row, dump_rows, json_response
+from ..services.metrics import instrument_engine
+from ..services.ndjson import encode_ndjson, iter_ndjson
+from ..services.post_render import RenderPool, render_pool_from_env
 
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
+T = TypeVar("T")
+
 
 class Db:
     engine = None
+    async_engine = None
     table: Optional[Table] = None
+    # Set once init_table has run (or BLOG_MIGRATE=off says the schema is managed elsewhere)
+    schema_ready = False
+    schema_lock = threading.Lock()
+
+
+class Cache:
+    """Per-process read-through caches for blog reads.
+
+    ``posts`` maps slug -> (etag, BlogPost JSON); ``lists`` maps (limit, cursor) ->
+    (etag, summaries JSON, next_cursor). Bodies are cached serialized, so a hit
+    is returned without touching Pydantic. Writes in this process invalidate them
+    directly; writes from other workers (and the CLI) arrive as change-feed
+    events and invalidate them through ``_on_change``. The caches are only used
+    while that can't miss a write; see ``_caches_live``.
+    """
+    posts: Optional[TTLCache] = None
+    lists: Optional[TTLCache] = None
+
+
+def _database_url() -> str:
+    import os
+    dsn = os.getenv("DATABASE_URL") or os.getenv("POSTGRES_URL")
+    if not dsn:
+        raise RuntimeError("DATABASE_URL not configured")
+    # Use psycopg (binary) driver; psycopg 3 serves both the sync and async engines
+    if dsn.startswith("postgres://"):
+        dsn = dsn.replace("postgres://", "postgresql+psycopg://", 1)
+    elif dsn.startswith("postgresql://"):
+        dsn = dsn.replace("postgresql://", "postgresql+psycopg://", 1)
+    return dsn
+
+
+def _pool_options(for_async: bool = False) -> dict:
+    """Pool sizing from DB_POOL_SIZE/DB_MAX_OVERFLOW, or this worker's share of DB_CONNECTION_BUDGET.
+
+    With a budget, the share is split across the engines this worker opens and
+    the pools are capped (no overflow). When BLOG_DB_ASYNC is on, requests use
+    the async engine, so it gets most of the share and the sync engine
+    (migrations, contact writes) a quarter of it; see ``capacity.pool_sizes``.
+    """
+    import os
+    timeout = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    sizes = pool_sizes(2 if _async_enabled() else 1)
+    if sizes is None:
+        return {
+            "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+            "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+            "pool_timeout": timeout,
+        }
+    return {"pool_size": sizes[-1] if for_async else sizes[0], "max_overflow": 0, "pool_timeout": timeout}
+
+
+def _async_enabled() -> bool:
+    import os
+    return os.getenv("BLOG_DB_ASYNC", "false").lower() in {"1", "true", "yes"}
+
+
+def _migrate_mode() -> str:
+    """When init_table runs: ``startup``, ``lazy`` (before the first query) or ``off``."""
+    import os
+    mode = os.getenv("BLOG_MIGRATE", "lazy").lower()
+    if mode not in {"startup", "lazy", "off"}:
+        raise RuntimeError(f"BLOG_MIGRATE must be startup, lazy or off, not {mode!r}")
+    return mode
+
+
+def _ensure_schema() -> None:
+    if Db.schema_ready:
+        return
+    if _migrate_mode() == "off":
+        Db.schema_ready = True
+        return
+    with Db.schema_lock:
+        if not Db.schema_ready:
+            init_table()
 
 
 def _get_engine():
     if Db.engine is None:
-        import os
-        dsn = os.getenv("DATABASE_URL") or os.getenv("POSTGRES_URL")
-        if not dsn:
-            raise RuntimeError("DATABASE_URL not configured")
-        # Use psycopg (binary) driver
-        if dsn.startswith("postgres://"):
-            dsn = dsn.replace("postgres://", "postgresql+psycopg://", 1)
-        elif dsn.startswith("postgresql://"):
-            dsn = dsn.replace("postgresql://", "postgresql+psycopg://", 1)
-        Db.engine = create_engine(dsn, pool_pre_ping=True, future=True)
+        Db.engine = create_engine(_database_url(), pool_pre_ping=True, future=True, **_pool_options())
+        instrument_engine(Db.engine, "blog")
     return Db.engine
 
 
+def _get_async_engine():
+    if Db.async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+        Db.async_engine = create_async_engine(_database_url(), pool_pre_ping=True, **_pool_options(for_async=True))
+        instrument_engine(Db.async_engine, "blog_async")
+    return Db.async_engine
+
+
+async def _stream(query, batch_size: int) -> AsyncIterator[Sequence[Any]]:
+    """Yield row mappings for ``query`` in batches from a server-side cursor.
+
+    Only one batch is buffered at a time regardless of the result size. Under the
+    sync engine each fetch runs in the threadpool; under the async engine the
+    cursor is read with ``AsyncConnection.stream``.
+    """
+    query = query.execution_options(yield_per=batch_size)
+    if not Db.schema_ready:
+        await run_in_threadpool(_ensure_schema)
+    if _async_enabled():
+        async with _get_async_engine().connect() as conn:
+            result = await conn.stream(query)
+            async for partition in result.mappings().partitions():
+                yield partition
+        return
+
+    conn = await run_in_threadpool(_get_engine().connect)
+    try:
+        result = (await run_in_threadpool(conn.execute, query)).mappings()
+        while True:
+            partition = await run_in_threadpool(result.fetchmany, batch_size)
+            if not partition:
+                break
+            yield partition
+    finally:
+        await run_in_threadpool(conn.close)
+
+
+async def _run(fn: Callable[[Connection], T], begin: bool = False) -> T:
+    """Run ``fn(conn)`` on the configured engine, inside a transaction if ``begin``.
+
+    With BLOG_DB_ASYNC enabled the function runs on an AsyncEngine connection via
+    ``run_sync``, so the DB round-trip awaits on the event loop instead of holding
+    a threadpool thread. Otherwise it runs on the sync engine in the threadpool.
+    """
+    if not Db.schema_ready:
+        await run_in_threadpool(_ensure_schema)
+    if _async_enabled():
+        engine = _get_async_engine()
+        async with (engine.begin() if begin else engine.connect()) as conn:
+            return await conn.run_sync(fn)
+
+    def call() -> T:
+        engine = _get_engine()
+        with (engine.begin() if begin else engine.connect()) as conn:
+            return fn(conn)
+
+    return await run_in_threadpool(call)
+
+
+def _get_caches() -> Tuple[TTLCache, TTLCache]:
+    if Cache.posts is None or Cache.lists is None:
+        import os
+        size = int(os.getenv("BLOG_CACHE_SIZE", "256"))
+        ttl = float(os.getenv("BLOG_CACHE_TTL", "60"))
+        Cache.posts = TTLCache(maxsize=size, ttl=ttl)
+        Cache.lists = TTLCache(maxsize=size, ttl=ttl)
+    return Cache.posts, Cache.lists
+
+
+def _invalidate(slug: Optional[str] = None, everything: bool = False) -> None:
+    """Drop cached reads affected by a write.
+
+    Any write can change list pages; only the written slug's detail entry is
+    dropped unless ``everything`` is set (restore replaces the whole table).
+    """
+    posts, lists = _get_caches()
+    lists.clear()
+    if everything:
+        posts.clear()
+    elif slug is not None:
+        posts.pop(slug)
+
+
+def _on_change(event: dict) -> None:
+    """Change-feed handler: drop cached reads a write in any process affected."""
+    op = event.get("op")
+    if op in ("create", "update", "delete") and event.get("slug"):
+        _invalidate(event["slug"])
+    elif op == "upsert" and event.get("slugs"):
+        posts, lists = _get_caches()
+        lists.clear()
+        for slug in event["slugs"]:
+            posts.pop(slug)
+    else:
+        # reset, resync (notifications may have been missed) or anything unknown
+        _invalidate(everything=True)
+
+
+def _caches_live() -> bool:
+    """Whether cached reads are safe: every write from every process reaches ``_on_change``.
+
+    On Postgres that means the change feed holds its LISTEN connection; while it
+    is (re)connecting, reads bypass the caches and the reconnect's ``resync``
+    empties them. Without Postgres only this process writes, so the caches are
+    safe with a single worker only.
+    """
+    if Feeds.default is None and Lifecycle.draining:
+        return False
+    feed = _get_feed()
+    feed.start()
+    return feed.connected or (feed.dsn is None and worker_count() == 1)
+
+
+def _iso(value: Optional[datetime]) -> str:
+    return value.isoformat() if value else ""
+
+
+def _etag(*parts: str) -> str:
+    return '"' + hashlib.sha1("\x1f".join(parts).encode()).hexdigest() + '"'
+
+
+def _not_modified(request: Request, etag: str) -> Optional[Response]:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return None
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if etag in candidates or "*" in candidates:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+    return None
+
+
+# Text search configuration used by the generated search_vector column and all queries against it
+SEARCH_CONFIG = "english"
+
+
 def _get_table() -> Table:
     if Db.table is None:
+        # Only this table needs the Postgres dialect types; keep them off the import path
+        from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+
         metadata = MetaData()
         Db.table = Table(
             "blog_posts",
@@ -48,12 +284,69 @@ def _get_table() -> Table:
             Column("published", Boolean, server_default=text("true")),
             Column("created_at", TIMESTAMP(timezone=True), server_default=text("now()")),
             Column("updated_at", TIMESTAMP(timezone=True), server_default=text("now()"), onupdate=text("now()")),
+            # Derived from content on every write (see _render); NULL until backfilled with render-posts
+            Column("html", Text, nullable=True),
+            Column("excerpt", Text, nullable=True),
+            Column("word_count", Integer, nullable=True),
+            Column("reading_minutes", Integer, nullable=True),
+            Column(
+                "search_vector",
+                TSVECTOR,
+                Computed(
+                    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+                    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(summary, '')), 'B') || "
+                    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(content, '')), 'C')",
+                    persisted=True,
+                ),
+            ),
         )
+        # Backs the keyset pagination in list_posts: ORDER BY created_at DESC, slug DESC
+        Index("ix_blog_posts_created_at_slug", Db.table.c.created_at.desc(), Db.table.c.slug.desc())
+        # Backs incremental exports: WHERE updated_at > :since ORDER BY updated_at, slug
+        Index("ix_blog_posts_updated_at_slug", Db.table.c.updated_at, Db.table.c.slug)
+        # Backs /search: full-text match on search_vector and tag containment (tags @> '["x"]')
+        Index("ix_blog_posts_search_vector", Db.table.c.search_vector, postgresql_using="gin")
+        Index("ix_blog_posts_tags", Db.table.c.tags, postgresql_using="gin", postgresql_ops={"tags": "jsonb_path_ops"})
     return Db.table
 
 
+def _data_columns(table: Table) -> List[Column]:
+    """Columns that hold post data, i.e. everything except generated columns."""
+    return [c for c in table.columns if c.computed is None]
+
+
+def _add_missing_columns(conn: Connection, table: Table) -> None:
+    # create_all never alters an existing table, so add columns introduced since it was created
+    existing = {c["name"] for c in inspect(conn).get_columns(table.name)}
+    for column in table.columns:
+        if column.name not in existing:
+            ddl = CreateColumn(column).compile(dialect=conn.dialect)
+            conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN IF NOT EXISTS {ddl}"))
+
+
+@router.on_event("startup")
+async def check_connection_budget() -> None:
+    # Fail the worker's startup, not its first query, when DB_CONNECTION_BUDGET can't cover it
+    _pool_options()
+
+
 @router.on_event("startup")
+async def start_change_feed() -> None:
+    # Listen from the start so this worker's read caches are invalidated by every write
+    import os
+    if os.getenv("DATABASE_URL") or os.getenv("POSTGRES_URL"):
+        _get_feed().start()
+
+
+@router.on_event("startup")
+async def migrate_on_startup() -> None:
+    # The default (lazy) leaves startup free of DB round-trips; see _ensure_schema
+    if _migrate_mode() == "startup" and not Db.schema_ready:
+        await run_in_threadpool(_ensure_schema)
+
+
 def init_table() -> None:
+    """Create the blog table, missing columns and indexes; also ``python -m app.cli migrate``."""
     import os
     try:
         engine = _get_engine()
@@ -63,6 +356,10 @@ def init_table() -> None:
     table = _get_table()
     with engine.begin() as conn:
         table.metadata.create_all(conn)
+        _add_missing_columns(conn, table)
+        # create_all only adds indexes for newly created tables; backfill them on existing ones
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
         if (os.getenv("SEED_BLOG", "false").lower() in {"1", "true", "yes"}):
             count = conn.execute(select(func.count()).select_from(table)).scalar_one()
             if count == 0:
@@ -80,6 +377,153 @@ def init_table() -> None:
                         "content": "Notes on design trade‑offs, checkpoints, and dashboarding.",
                     },
                 ]))
+    Db.schema_ready = True
+    if _async_enabled():
+        # Requests use the async engine; don't keep the bootstrap pool's connections open
+        engine.dispose()
+
+
+@router.on_event("shutdown")
+async def close_engines() -> None:
+    if Feeds.default is not None:
+        # Ends open SSE/WebSocket streams so the server can finish shutting down
+        await Feeds.default.close()
+        Feeds.default = None
+    task = Snapshots.task
+    if task is not None and not task.done():
+        # Let a pending snapshot pick up the last writes before the engines go away
+        await asyncio.wait([task], timeout=30)
+    if Db.async_engine is not None:
+        await Db.async_engine.dispose()
+    if Db.engine is not None:
+        Db.engine.dispose()
+    if Renderers.pool is not None:
+        Renderers.pool.shutdown()
+        Renderers.pool = None
+
+
+class Snapshots:
+    """Static JSON snapshot of the blog, refreshed in the background after writes.
+
+    Enabled by BLOG_SNAPSHOT_DIR. ``dirty`` is set by every write; ``task`` syncs
+    until it is clear, so a burst of writes costs one or two syncs, not one each.
+    """
+    default: Optional[BlogSnapshot] = None
+    task: Optional["asyncio.Task[None]"] = None
+    dirty = False
+
+
+def _get_snapshot() -> Optional[BlogSnapshot]:
+    if Snapshots.default is None:
+        import os
+        from pathlib import Path
+        root = os.getenv("BLOG_SNAPSHOT_DIR")
+        if not root:
+            return None
+        path = Path(root)
+        if not path.is_absolute():
+            path = Path(__file__).resolve().parents[2] / path
+        Snapshots.default = BlogSnapshot(
+            path,
+            page_size=int(os.getenv("BLOG_SNAPSHOT_PAGE_SIZE", "20")),
+            keep_seconds=float(os.getenv("BLOG_SNAPSHOT_KEEP_SECONDS", "3600")),
+        )
+    return Snapshots.default
+
+
+async def sync_snapshot(full: bool = False) -> Optional[dict]:
+    """Bring the snapshot in line with the table; returns the new manifest.
+
+    Summaries for every post are read in one query without ``content``; full rows
+    are read only for posts that are new or changed since the last manifest (all
+    of them when ``full``). ``python -m app.cli snapshot`` runs this with ``full``.
+    """
+    snapshot = _get_snapshot()
+    if snapshot is None:
+        return None
+    table = _get_table()
+    lock = snapshot.locked()
+    await run_in_threadpool(lock.__enter__)
+    try:
+        # Summaries are read under the lock too, so the last manifest written reflects the newest read
+        summaries = await _run(lambda conn: conn.execute(select(
+            table.c.slug, table.c.title, table.c.summary, table.c.created_at, table.c.updated_at,
+            table.c.excerpt, table.c.word_count, table.c.reading_minutes,
+        )).mappings().all())
+        stale = await run_in_threadpool(snapshot.stale_slugs, summaries, full)
+        written: dict = {}
+        for start in range(0, len(stale), 200):
+            query = select(*_data_columns(table)).where(table.c.slug.in_(stale[start:start + 200]))
+            rows = await _run(lambda conn: conn.execute(query).mappings().all())
+            written.update(await run_in_threadpool(snapshot.write_posts, rows))
+        return await run_in_threadpool(snapshot.finish, summaries, written)
+    finally:
+        await run_in_threadpool(lock.__exit__, None, None, None)
+
+
+async def _snapshot_loop() -> None:
+    while Snapshots.dirty:
+        Snapshots.dirty = False
+        try:
+            await sync_snapshot()
+        except Exception:
+            # The API itself is unaffected; the next write retries the sync
+            logger.exception("blog snapshot sync failed")
+
+
+def _schedule_snapshot() -> None:
+    if _get_snapshot() is None:
+        return
+    Snapshots.dirty = True
+    if Snapshots.task is None or Snapshots.task.done():
+        Snapshots.task = asyncio.create_task(_snapshot_loop())
+
+
+# Postgres NOTIFY channel carrying blog change events between processes
+CHANGE_CHANNEL = "blog_changes"
+
+
+class Feeds:
+    default: Optional[ChangeFeed] = None
+
+
+def _get_feed() -> ChangeFeed:
+    if Feeds.default is None:
+        import os
+        if Lifecycle.draining:
+            # The drain hook closed the feed; don't open a new listener on the way out
+            raise HTTPException(status_code=503, detail="Server is shutting down")
+        try:
+            # psycopg takes a libpq URL, without SQLAlchemy's driver suffix
+            dsn: Optional[str] = _database_url().replace("postgresql+psycopg://", "postgresql://", 1)
+        except RuntimeError:
+            dsn = None
+        Feeds.default = ChangeFeed(dsn, CHANGE_CHANNEL, buffer_size=int(os.getenv("BLOG_FEED_BUFFER", "100")))
+        Feeds.default.handlers.append(_on_change)
+    return Feeds.default
+
+
+@on_drain
+async def _close_feed() -> None:
+    # Server is stopping: end open SSE/WebSocket streams so draining doesn't wait on them
+    feed, Feeds.default = Feeds.default, None
+    if feed is not None:
+        await feed.close()
+
+
+def _notify(conn: Connection, event: dict) -> None:
+    """Queue ``event`` for every process's change feed; Postgres delivers it on commit."""
+    if conn.dialect.name == "postgresql":
+        conn.execute(select(func.pg_notify(CHANGE_CHANNEL, encode_event(event))))
+
+
+def _after_write(event: dict) -> None:
+    """Post-commit work shared by all write handlers."""
+    _schedule_snapshot()
+    feed = Feeds.default
+    if feed is not None and feed.dsn is None:
+        # No LISTEN connection (not Postgres): deliver to this process's subscribers directly
+        feed.publish(event)
 
 
 def _slugify(title: str) -> str:
@@ -89,78 +533,567 @@ def _slugify(title: str) -> str:
     return s
 
 
-@router.get("/", response_model=List[BlogPost])
-def list_posts() -> List[BlogPost]:
-    engine = _get_engine()
+def _externalize_images(content: str) -> str:
+    return externalize_data_uris(content, get_blob_store())
+
+
+class Renderers:
+    pool: Optional[RenderPool] = None
+
+
+def _get_render_pool() -> RenderPool:
+    if Renderers.pool is None:
+        Renderers.pool = render_pool_from_env()
+    return Renderers.pool
+
+
+async def _add_rendered(rows: List[dict]) -> None:
+    """Fill html/excerpt/word_count/reading_minutes on rows that carry ``content``."""
+    if rows:
+        rendered = await _get_render_pool().render_many([row["content"] for row in rows])
+        for row, values in zip(rows, rendered):
+            row.update(values)
+
+
+def _encode_cursor(created_at: Optional[datetime], slug: str) -> str:
+    raw = json.dumps([created_at.isoformat() if created_at else None, slug])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, slug = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), str(slug)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@router.get("/", response_model=List[BlogPostSummary])
+async def list_posts(
+    request: Request,
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header"),
+) -> Response:
+    """List post summaries newest first, keyset-paginated on (created_at, slug).
+
+    ``content`` is never selected. When more rows remain, the cursor for the next
+    page is returned in the ``X-Next-Cursor`` header.
+    """
+    _, lists = _get_caches()
+    live = _caches_live()
+    key = (limit, cursor)
+    cached = lists.get(key) if live else None
+    if cached is None:
+        generation = lists.generation
+        table = _get_table()
+        query = (
+            select(
+                table.c.slug, table.c.title, table.c.summary, table.c.created_at, table.c.updated_at,
+                table.c.excerpt, table.c.word_count, table.c.reading_minutes,
+            )
+            .order_by(table.c.created_at.desc(), table.c.slug.desc())
+            .limit(limit + 1)
+        )
+        if cursor:
+            query = query.where(tuple_(table.c.created_at, table.c.slug) < tuple_(*_decode_cursor(cursor)))
+        rows = await _run(lambda conn: conn.execute(query).mappings().all())
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = _encode_cursor(rows[-1]["created_at"], rows[-1]["slug"])
+        etag = _etag(
+            next_cursor or "",
+            *(f"{row['slug']}@{row['updated_at'].isoformat() if row['updated_at'] else ''}" for row in rows),
+        )
+        body = dump_rows(BlogPostSummary, ({**row, "created_at": _iso(row["created_at"])} for row in rows))
+        cached = (etag, body, next_cursor)
+        if live:
+            lists.set(key, cached, generation=generation)
+    etag, body, next_cursor = cached
+    not_modified = _not_modified(request, etag)
+    if not_modified is not None:
+        return not_modified
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return json_response(body, headers)
+
+
+@router.get("/backup", response_model=list[BlogPost])
+async def backup_posts() -> Response:
     table = _get_table()
-    with engine.connect() as conn:
-        rows = conn.execute(table.select().order_by(table.c.created_at.desc())).mappings().all()
-        return [BlogPost(**{**row, "created_at": row["created_at"].isoformat() if row["created_at"] else ""}) for row in rows]
+    query = select(*_data_columns(table)).order_by(table.c.created_at.desc())
+    rows = await _run(lambda conn: conn.execute(query).mappings().all())
+    return json_response(dump_rows(BlogPost, ({**row, "created_at": _iso(row["created_at"])} for row in rows)))
 
 
-@router.get("/{slug}", response_model=BlogPost)
-def get_post(slug: str) -> BlogPost:
-    engine = _get_engine()
+def _export_row(row) -> dict:
+    return {
+        "slug": row["slug"],
+        "title": row["title"],
+        "summary": row["summary"],
+        "content": row["content"],
+        "tags": row["tags"],
+        "created_at": row["created_at"].isoformat() if row["created_at"] else None,
+        "updated_at": row["updated_at"].isoformat() if row["updated_at"] else None,
+    }
+
+
+@router.get("/export")
+async def export_posts(
+    since: Optional[datetime] = Query(None, description="Only posts updated strictly after this timestamp"),
+    gzip: bool = Query(False, description="Return a .ndjson.gz file"),
+    batch_size: int = Query(200, ge=1, le=5000),
+) -> StreamingResponse:
+    """Stream every post as NDJSON, oldest change first, in constant memory.
+
+    Each line is a RestoreItem plus ``updated_at``, so the output can be fed
+    straight back into ``/restore/stream``. For incremental backups pass the
+    largest ``updated_at`` seen so far as ``since``.
+    """
     table = _get_table()
-    with engine.connect() as conn:
-        row = conn.execute(table.select().where(table.c.slug == slug)).mappings().first()
-        if not row:
-            raise HTTPException(status_code=404, detail="Post not found")
-        return BlogPost(**{**row, "created_at": row["created_at"].isoformat() if row["created_at"] else ""})
+    query = select(*_data_columns(table)).order_by(table.c.updated_at, table.c.slug)
+    if since is not None:
+        query = query.where(table.c.updated_at > since)
+
+    async def batches() -> AsyncIterator[List[dict]]:
+        async for partition in _stream(query, batch_size):
+            yield [_export_row(row) for row in partition]
+
+    filename = "blog-export.ndjson.gz" if gzip else "blog-export.ndjson"
+    return StreamingResponse(
+        encode_ndjson(batches(), compressed=gzip),
+        media_type="application/gzip" if gzip else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+# ts_headline match delimiters; never present in stored content (stripped before highlighting)
+_MARK_START = "\x02"
+_MARK_STOP = "\x03"
+
+
+def _safe_snippet(snippet: Optional[str]) -> Optional[str]:
+    """HTML-escape a headline and turn the match delimiters into ``<mark>`` tags."""
+    if snippet is None:
+        return None
+    return html.escape(snippet, quote=False).replace(_MARK_START, "<mark>").replace(_MARK_STOP, "</mark>")
+
+
+@router.get("/search", response_model=BlogSearchPage)
+async def search_posts(
+    q: Optional[str] = Query(None, description="Web-search style query, e.g. 'kafka -spark \"exactly once\"'"),
+    tag: List[str] = Query([], description="Only posts carrying all of these tags"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=10000),
+) -> Response:
+    """Rank posts against ``q`` and/or filter them by tag, with highlighted snippets.
+
+    Matching uses the GIN-indexed ``search_vector`` (title > summary > content
+    weighting) and the GIN index on ``tags``. Snippets are computed only for the
+    page being returned. Without ``q``, tag matches are returned newest first.
+    ``snippet`` is plain text from the post, HTML-escaped, with matches wrapped
+    in ``<mark>``; it is safe to insert as HTML.
+    """
+    table = _get_table()
+    q = (q or "").strip()
+    if not q and not tag:
+        raise HTTPException(status_code=400, detail="Provide q and/or tag")
+
+    if q:
+        tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+        rank = func.ts_rank_cd(table.c.search_vector, tsquery)
+        matches = select(table.c.slug, rank.label("rank")).where(table.c.search_vector.op("@@")(tsquery))
+        order = (rank.desc(), table.c.created_at.desc(), table.c.slug)
+    else:
+        matches = select(table.c.slug, literal(0.0).label("rank"))
+        order = (table.c.created_at.desc(), table.c.slug)
+    if tag:
+        matches = matches.where(table.c.tags.contains(tag))
+    page = matches.order_by(*order).limit(limit + 1).offset(offset).subquery()
+
+    # Headline over the content with tags removed, matches delimited by control characters that
+    # are stripped from the input; _safe_snippet escapes the rest and turns them into <mark>
+    plain = func.regexp_replace(func.translate(table.c.content, _MARK_START + _MARK_STOP, ""), "<[^>]*>", " ", "g")
+    snippet = (
+        func.ts_headline(
+            SEARCH_CONFIG,
+            plain,
+            tsquery,
+            f"StartSel={_MARK_START}, StopSel={_MARK_STOP}, MaxWords=35, MinWords=15, MaxFragments=2",
+        )
+        if q
+        else literal(None)
+    )
+    query = (
+        select(table.c.slug, table.c.title, table.c.summary, table.c.tags, table.c.created_at, page.c.rank, snippet.label("snippet"))
+        .join(page, page.c.slug == table.c.slug)
+        .order_by(page.c.rank.desc(), table.c.created_at.desc(), table.c.slug)
+    )
+    rows = await _run(lambda conn: conn.execute(query).mappings().all())
+    hits = dump_rows(
+        BlogSearchHit,
+        (
+            {**row, "tags": row["tags"] or [], "created_at": _iso(row["created_at"]), "snippet": _safe_snippet(row["snippet"])}
+            for row in rows[:limit]
+        ),
+    )
+    next_offset = offset + limit if len(rows) > limit else None
+    # Splice the serialized hits into the BlogSearchPage envelope
+    return json_response(b'{"results":' + hits + b',"next_offset":' + to_json(next_offset) + b"}")
+
+
+def _feed_heartbeat() -> float:
+    import os
+    return float(os.getenv("BLOG_FEED_HEARTBEAT", "15"))
+
+
+@router.get("/changes")
+async def stream_changes() -> StreamingResponse:
+    """Server-sent events for post changes: ``create``/``update``/``delete`` with
+    ``slug``, ``upsert`` with ``slugs``, and ``reset`` (refetch everything).
+
+    ``resync`` means events were missed (slow reader or listener reconnect) and
+    the client should refetch. A comment line is sent every BLOG_FEED_HEARTBEAT
+    seconds to keep proxies from closing an idle stream.
+    """
+    feed = _get_feed()
+    heartbeat = _feed_heartbeat()
+
+    async def events() -> AsyncIterator[str]:
+        # Subscribe inside the generator so a client that never starts reading leaves nothing behind
+        subscription = feed.subscribe()
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if event["op"] == "closed":
+                    return
+                yield f"id: {event.get('id', '')}\nevent: {event['op']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            feed.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/changes/ws")
+async def websocket_changes(websocket: WebSocket) -> None:
+    """The /changes feed over a WebSocket, one JSON event per message."""
+    if Lifecycle.draining:
+        await websocket.close(code=1001)
+        return
+    feed = _get_feed()
+    heartbeat = _feed_heartbeat()
+    await websocket.accept()
+    subscription = feed.subscribe()
+
+    async def wait_for_close() -> None:
+        # Clients don't send anything; this only notices the socket closing
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+
+    closed = asyncio.create_task(wait_for_close())
+    try:
+        while not closed.done():
+            getter = asyncio.ensure_future(subscription.get())
+            done, _ = await asyncio.wait({getter, closed}, timeout=heartbeat, return_when=asyncio.FIRST_COMPLETED)
+            if getter not in done:
+                getter.cancel()
+                if not closed.done():
+                    await websocket.send_json({"op": "ping"})
+                continue
+            event = getter.result()
+            if event["op"] == "closed":
+                await websocket.close(code=1001)
+                return
+            await websocket.send_json(event)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        closed.cancel()
+        feed.unsubscribe(subscription)
+
+
+def _post_body(row) -> Tuple[str, bytes]:
+    etag = _etag(row["slug"], row["updated_at"].isoformat() if row["updated_at"] else "")
+    return etag, dump_row(BlogPost, {**row, "created_at": _iso(row["created_at"])})
+
+
+async def _fetch_post(slug: str) -> Tuple[str, bytes]:
+    """Return ``(etag, post JSON)`` for a slug, served from the cache when possible."""
+    posts, _ = _get_caches()
+    live = _caches_live()
+    cached = posts.get(slug) if live else None
+    if cached is not None:
+        return cached
+    generation = posts.generation
+    table = _get_table()
+    query = select(*_data_columns(table)).where(table.c.slug == slug)
+    row = await _run(lambda conn: conn.execute(query).mappings().first())
+    if not row:
+        raise HTTPException(status_code=404, detail="Post not found")
+    entry = _post_body(row)
+    if live:
+        posts.set(slug, entry, generation=generation)
+    return entry
+
+
+def _insert(conn: Connection):
+    """The dialect's ``insert`` construct, which supports ON CONFLICT."""
+    if conn.dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+    return insert
+
+
+@router.get("/{slug}", response_model=BlogPost)
+async def get_post(slug: str, request: Request) -> Response:
+    etag, body = await _fetch_post(slug)
+    not_modified = _not_modified(request, etag)
+    if not_modified is not None:
+        return not_modified
+    return json_response(body, {"ETag": etag, "Cache-Control": "no-cache"})
 
 
 @router.post("/", response_model=BlogPost)
-def create_post(payload: BlogPostCreate) -> BlogPost:
-    engine = _get_engine()
+async def create_post(payload: BlogPostCreate) -> Response:
     table = _get_table()
     slug = _slugify(payload.title)
-    with engine.begin() as conn:
-        exists = conn.execute(table.select().where(table.c.slug == slug)).first()
-        if exists:
-            raise HTTPException(status_code=400, detail="Slug already exists")
-        conn.execute(table.insert().values(
-            slug=slug,
-            title=payload.title,
-            summary=payload.summary,
-            content=payload.content,
-        ))
-    return get_post(slug)
+    # Hashing and storing pasted images is blocking I/O; keep it off the event loop
+    content = await run_in_threadpool(_externalize_images, payload.content)
+    rendered = await _get_render_pool().render(content)
+
+    def write(conn: Connection):
+        # One statement: the primary key decides slug collisions, so concurrent creates can't both succeed
+        stmt = (
+            _insert(conn)(table)
+            .values(slug=slug, title=payload.title, summary=payload.summary, content=content, **rendered)
+            .on_conflict_do_nothing(index_elements=[table.c.slug])
+            .returning(*_data_columns(table))
+        )
+        row = conn.execute(stmt).mappings().first()
+        if row is not None:
+            _notify(conn, event)
+        return row
+
+    event = {"op": "create", "slug": slug}
+    row = await _run(write, begin=True)
+    if row is None:
+        raise HTTPException(status_code=400, detail="Slug already exists")
+    _invalidate(slug)
+    _after_write(event)
+    return json_response(_post_body(row)[1])
 
 
 @router.put("/{slug}", response_model=BlogPost)
-def update_post(slug: str, payload: BlogPostUpdate) -> BlogPost:
-    engine = _get_engine()
+async def update_post(slug: str, payload: BlogPostUpdate) -> Response:
     table = _get_table()
-    with engine.begin() as conn:
-        row = conn.execute(table.select().where(table.c.slug == slug)).first()
-        if not row:
-            raise HTTPException(status_code=404, detail="Post not found")
-        update_values = {}
-        if payload.title is not None:
-            update_values["title"] = payload.title
-        if payload.summary is not None:
-            update_values["summary"] = payload.summary
-        if payload.content is not None:
-            update_values["content"] = payload.content
-        if update_values:
-            conn.execute(table.update().where(table.c.slug == slug).values(**update_values))
-    return get_post(slug)
+    update_values = {}
+    if payload.title is not None:
+        update_values["title"] = payload.title
+    if payload.summary is not None:
+        update_values["summary"] = payload.summary
+    if payload.content is not None:
+        update_values["content"] = await run_in_threadpool(_externalize_images, payload.content)
+        update_values.update(await _get_render_pool().render(update_values["content"]))
+
+    if not update_values:
+        return json_response((await _fetch_post(slug))[1])
+
+    def write(conn: Connection):
+        stmt = (
+            table.update()
+            .where(table.c.slug == slug)
+            .values(**update_values)
+            .returning(*_data_columns(table))
+        )
+        row = conn.execute(stmt).mappings().first()
+        if row is not None:
+            _notify(conn, event)
+        return row
+
+    event = {"op": "update", "slug": slug}
+    row = await _run(write, begin=True)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Post not found")
+    _invalidate(slug)
+    _after_write(event)
+    return json_response(_post_body(row)[1])
 
 
 @router.delete("/{slug}", response_model=dict)
-def delete_post(slug: str) -> dict:
-    engine = _get_engine()
+async def delete_post(slug: str) -> dict:
     table = _get_table()
-    with engine.begin() as conn:
+
+    def write(conn: Connection) -> None:
         result = conn.execute(table.delete().where(table.c.slug == slug))
         if getattr(result, 'rowcount', 0) == 0:
             raise HTTPException(status_code=404, detail="Post not found")
+        _notify(conn, event)
+
+    event = {"op": "delete", "slug": slug}
+    await _run(write, begin=True)
+    _invalidate(slug)
+    _after_write(event)
     return {"ok": True}
 
 
-@router.get("/backup", response_model=list[BlogPost])
-def backup_posts() -> list[BlogPost]:
-    return list_posts()
+def _import_row(item: BlogPostImport) -> dict:
+    # A given slug is kept verbatim so re-importing an export updates the same rows
+    slug = item.slug or _slugify(item.title)
+    if not slug:
+        raise HTTPException(status_code=400, detail=f"Cannot derive a slug for {item.title!r}")
+    row = {
+        "slug": slug,
+        "title": item.title,
+        "summary": item.summary,
+        "content": _externalize_images(item.content),
+        "tags": item.tags,
+    }
+    if item.created_at is not None:
+        row["created_at"] = item.created_at
+    return row
+
+
+@router.post("/batch", response_model=BlogImportResult)
+async def upsert_posts(payload: List[BlogPostImport]) -> BlogImportResult:
+    """Insert or replace many posts at once, e.g. an import from another platform.
+
+    Posts are matched on slug; an existing post gets the new title, summary,
+    content and tags (and ``created_at`` when given). Rows go to the database as
+    one executemany of ``INSERT ... ON CONFLICT DO UPDATE`` in one transaction.
+    When a slug repeats within the batch, the last item wins.
+    """
+    import os
+    limit = int(os.getenv("BLOG_BATCH_MAX", "1000"))
+    if len(payload) > limit:
+        raise HTTPException(status_code=400, detail=f"At most {limit} posts per batch")
+    table = _get_table()
+    rows = await run_in_threadpool(lambda: list({row["slug"]: row for row in map(_import_row, payload)}.values()))
+    await _add_rendered(rows)
+
+    def write(conn: Connection) -> None:
+        insert = _insert(conn)
+        # executemany needs one parameter shape; rows without created_at keep the column default / stored value
+        for dated in (True, False):
+            group = [row for row in rows if ("created_at" in row) == dated]
+            if not group:
+                continue
+            stmt = insert(table)
+            updates = {name: stmt.excluded[name] for name in group[0] if name != "slug"}
+            updates["updated_at"] = func.now()
+            conn.execute(stmt.on_conflict_do_update(index_elements=[table.c.slug], set_=updates), group)
+        _notify(conn, event)
+
+    event = {"op": "upsert", "slugs": [row["slug"] for row in rows]}
+    if rows:
+        await _run(write, begin=True)
+        _invalidate(everything=True)
+        _after_write(event)
+    return BlogImportResult(ok=True, count=len(rows))
+
+
+@router.get("/blobs/{name}", response_class=FileResponse)
+async def get_blob(name: str) -> FileResponse:
+    """Serve an image extracted from post content when the local blob store is in use."""
+    store = get_blob_store()
+    if not isinstance(store, LocalBlobStore) or not BLOB_NAME_RE.match(name):
+        raise HTTPException(status_code=404, detail="Blob not found")
+    path = store.path(name)
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="Blob not found")
+    return FileResponse(
+        path=str(path),
+        media_type=mimetypes.guess_type(name)[0] or "application/octet-stream",
+        headers={
+            "Cache-Control": IMMUTABLE_CACHE_CONTROL,
+            # Blobs are user-supplied (e.g. SVG); never let one run as a document on this origin
+            "Content-Security-Policy": "default-src 'none'; style-src 'unsafe-inline'; sandbox",
+            "X-Content-Type-Options": "nosniff",
+        },
+    )
+
+
+def externalize_existing_images(batch_size: int = 50) -> int:
+    """One-off migration: move inline data-URL images in stored posts to the blob store.
+
+    Rows are read through a server-side cursor and each changed post is updated
+    in its own transaction. The content changes, so ``updated_at`` is bumped like
+    any edit (ETags, incremental exports and the snapshot pick the new content
+    up) and running servers are notified. Returns the number of posts rewritten.
+    """
+    engine = _get_engine()
+    table = _get_table()
+    store = get_blob_store()
+    query = (
+        select(table.c.slug, table.c.content)
+        .where(table.c.content.contains("data:image/"))
+        .execution_options(yield_per=batch_size)
+    )
+    changed = 0
+    with engine.connect() as reader:
+        for row in reader.execute(query):
+            content = externalize_data_uris(row.content, store)
+            if content == row.content:
+                continue
+            rendered = _get_render_pool().render_many_sync([content])[0]
+            with engine.begin() as conn:
+                conn.execute(
+                    table.update()
+                    .where(table.c.slug == row.slug)
+                    .values(content=content, updated_at=func.now(), **rendered)
+                )
+                _notify(conn, {"op": "update", "slug": row.slug})
+            changed += 1
+    return changed
+
+
+def render_existing_posts(batch_size: int = 200, everything: bool = False) -> int:
+    """Backfill html/excerpt/word_count/reading_minutes for stored posts.
+
+    Only rows never rendered (``html IS NULL``) unless ``everything``, e.g. after
+    a renderer change. Rows are read through a server-side cursor, rendered a
+    batch at a time on the render pool, and each batch is written as one
+    executemany UPDATE. The served JSON changes, so ``updated_at`` is bumped
+    (ETags, incremental exports and the snapshot's stale check see the new HTML)
+    and running servers are notified per batch. Returns the number of posts
+    rendered.
+    """
+    from sqlalchemy import bindparam
+
+    engine = _get_engine()
+    table = _get_table()
+    pool = _get_render_pool()
+    query = select(table.c.slug, table.c.content).execution_options(yield_per=batch_size)
+    if not everything:
+        query = query.where(table.c.html.is_(None))
+    update = (
+        table.update()
+        .where(table.c.slug == bindparam("b_slug"))
+        .values(updated_at=func.now(), **{name: bindparam(name) for name in ("html", "excerpt", "word_count", "reading_minutes")})
+    )
+    done = 0
+    with engine.connect() as reader:
+        for partition in reader.execute(query).partitions():
+            rendered = pool.render_many_sync([row.content for row in partition])
+            with engine.begin() as conn:
+                conn.execute(update, [{"b_slug": row.slug, **values} for row, values in zip(partition, rendered)])
+                _notify(conn, {"op": "upsert", "slugs": [row.slug for row in partition]})
+            done += len(partition)
+    pool.shutdown()
+    return done
 
 
 class RestoreItem(BaseModel):
@@ -168,22 +1101,151 @@ class RestoreItem(BaseModel):
     title: str
     summary: str
     content: str
+    tags: Optional[List[str]] = None
     created_at: Optional[str] = None
 
 
+def _restore_row(item: RestoreItem, now: datetime) -> dict:
+    # Every row carries every column so executemany can batch them as one statement
+    return {
+        "slug": item.slug,
+        "title": item.title,
+        "summary": item.summary,
+        "content": item.content,
+        "tags": item.tags,
+        "created_at": datetime.fromisoformat(item.created_at) if item.created_at else now,
+        "updated_at": now,
+    }
+
+
 @router.post("/restore", response_model=dict)
-def restore_posts(payload: list[RestoreItem]) -> dict:
-    engine = _get_engine()
+async def restore_posts(payload: list[RestoreItem]) -> dict:
     table = _get_table()
-    with engine.begin() as conn:
+    now = datetime.now(timezone.utc)
+    try:
+        rows = [_restore_row(p, now) for p in payload]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid created_at: {e}")
+    await _add_rendered(rows)
+
+    def write(conn: Connection) -> None:
         conn.execute(table.delete())
-        for p in payload:
-            conn.execute(table.insert().values(
-                slug=p.slug,
-                title=p.title,
-                summary=p.summary,
-                content=p.content,
-            ))
+        if rows:
+            conn.execute(table.insert(), rows)
+        _notify(conn, {"op": "reset"})
+
+    await _run(write, begin=True)
+    _invalidate(everything=True)
+    _after_write({"op": "reset"})
     return {"ok": True, "count": len(payload)}
 
 
+class RestoreJob(BaseModel):
+    id: str
+    status: str = "running"
+    bytes_received: int = 0
+    rows_staged: int = 0
+    batches: int = 0
+    error: Optional[str] = None
+    started_at: str
+    finished_at: Optional[str] = None
+
+
+class Restores:
+    """Recent streaming restore jobs, newest last, for progress polling."""
+    jobs: "OrderedDict[str, RestoreJob]" = OrderedDict()
+    keep = 20
+
+
+def _new_restore_job() -> RestoreJob:
+    job = RestoreJob(id=uuid.uuid4().hex[:12], started_at=datetime.now(timezone.utc).isoformat())
+    Restores.jobs[job.id] = job
+    while len(Restores.jobs) > Restores.keep:
+        Restores.jobs.popitem(last=False)
+    return job
+
+
+def _finish_restore_job(job: RestoreJob, status: str, error: Optional[str] = None) -> None:
+    job.status = status
+    job.error = error
+    job.finished_at = datetime.now(timezone.utc).isoformat()
+
+
+@router.post("/restore/stream", response_model=RestoreJob)
+async def restore_posts_stream(
+    request: Request,
+    batch_size: int = Query(500, ge=1, le=10000),
+) -> RestoreJob:
+    """Replace all posts from an NDJSON body (one RestoreItem per line).
+
+    Send ``Content-Encoding: gzip`` for compressed archives. Rows are loaded in
+    batches into an unlogged staging table, so memory is bounded by one batch,
+    then swapped into ``blog_posts`` in a single transaction; readers see either
+    the old posts or the new ones. Progress is visible at ``/restore/jobs``.
+    """
+    table = _get_table()
+    job = _new_restore_job()
+    staging_name = f"{table.name}_restore_{job.id}"
+    staging = Table(staging_name, MetaData(), *(Column(c.name, c.type) for c in _data_columns(table)))
+    compressed = "gzip" in request.headers.get("content-encoding", "").lower()
+    now = datetime.now(timezone.utc)
+
+    async def body() -> AsyncIterator[bytes]:
+        async for chunk in request.stream():
+            job.bytes_received += len(chunk)
+            yield chunk
+
+    async def flush(batch: List[dict]) -> None:
+        await _add_rendered(batch)
+        await _run(lambda conn: conn.execute(staging.insert(), batch), begin=True)
+        job.rows_staged += len(batch)
+        job.batches += 1
+
+    def swap(conn: Connection) -> None:
+        columns = [c.name for c in _data_columns(table)]
+        conn.execute(table.delete())
+        conn.execute(table.insert().from_select(columns, select(*(staging.c[name] for name in columns))))
+        _notify(conn, {"op": "reset"})
+
+    await _run(lambda conn: conn.execute(text(
+        f"CREATE UNLOGGED TABLE {staging_name} (LIKE {table.name} INCLUDING DEFAULTS)"
+    )), begin=True)
+    try:
+        batch: List[dict] = []
+        async for obj in iter_ndjson(body(), compressed=compressed):
+            batch.append(_restore_row(RestoreItem.model_validate(obj), now))
+            if len(batch) >= batch_size:
+                await flush(batch)
+                batch = []
+        if batch:
+            await flush(batch)
+        await _run(swap, begin=True)
+    except (ValidationError, ValueError, zlib.error, EOFError) as e:
+        # zlib.error: corrupt gzip body; EOFError: truncated one
+        _finish_restore_job(job, "failed", str(e))
+        raise HTTPException(status_code=400, detail=f"Invalid archive after {job.rows_staged} rows: {e}")
+    except IntegrityError as e:
+        _finish_restore_job(job, "failed", str(e.orig))
+        raise HTTPException(status_code=400, detail="Archive contains duplicate slugs")
+    except BaseException as e:
+        _finish_restore_job(job, "failed", repr(e))
+        raise
+    finally:
+        await _run(lambda conn: conn.execute(text(f"DROP TABLE IF EXISTS {staging_name}")), begin=True)
+    _invalidate(everything=True)
+    _after_write({"op": "reset"})
+    _finish_restore_job(job, "done")
+    return job
+
+
+@router.get("/restore/jobs", response_model=List[RestoreJob])
+async def list_restore_jobs() -> List[RestoreJob]:
+    return list(reversed(Restores.jobs.values()))
+
+
+@router.get("/restore/jobs/{job_id}", response_model=RestoreJob)
+async def get_restore_job(job_id: str) -> RestoreJob:
+    job = Restores.jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Restore job not found")
+    return job
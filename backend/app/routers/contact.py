@@ -1,27 +1,216 @@
-from typing import List
+import asyncio
+import logging
+import math
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
 
-from fastapi import APIRouter, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import MetaData, Table, Column, Integer, String, Text, TIMESTAMP, create_engine
+from sqlalchemy.exc import InterfaceError, OperationalError
 
 from ..models import ContactMessage
+from ..services.metrics import instrument_engine
+from ..services.rate_limit import TokenBuckets
 
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 
-# Demo in-memory message store. Replace with email or DB in production.
-MESSAGES: List[ContactMessage] = []
+class Pipeline:
+	"""Bounded queue between the contact endpoint and a single storage worker.
 
+	Submissions are validated, throttled per client IP and queued; the worker
+	writes them to the database in batches and then calls ``notify`` once per
+	stored batch (e.g. to send one email for all of them). ``notify`` is unset,
+	i.e. a no-op, by default. A full queue rejects new submissions with 429
+	instead of growing without bound.
+	"""
+	queue: Optional["asyncio.Queue[Dict[str, Any]]"] = None
+	notify: Optional[Callable[[List[Dict[str, Any]]], None]] = None
+	worker: Optional["asyncio.Task[None]"] = None
+	buckets: Optional[TokenBuckets] = None
+	engine = None
+	table: Optional[Table] = None
+	table_ready = False
 
-def _handle_contact_message(message: ContactMessage) -> None:
-	# Placeholder for sending an email/notification or persisting the message
-	# In production, integrate with an email service or database here.
-	return None
 
+def _setting(name: str, default: str) -> float:
+	return float(os.getenv(name, default))
 
-@router.post("/", status_code=201)
-def submit_contact(message: ContactMessage, background_tasks: BackgroundTasks) -> dict:
-	MESSAGES.append(message)
-	background_tasks.add_task(_handle_contact_message, message)
-	return {"ok": True}
+
+def _get_buckets() -> TokenBuckets:
+	if Pipeline.buckets is None:
+		Pipeline.buckets = TokenBuckets(
+			rate=_setting("CONTACT_RATE_PER_MIN", "5") / 60.0,
+			burst=_setting("CONTACT_BURST", "3"),
+		)
+	return Pipeline.buckets
+
+
+def _get_engine():
+	"""The blog's Postgres engine when DATABASE_URL is set, else a local SQLite file."""
+	if Pipeline.engine is None:
+		from .blog import _get_engine as _blog_engine
+
+		try:
+			Pipeline.engine = _blog_engine()
+		except RuntimeError:
+			backend_root = Path(__file__).resolve().parents[2]
+			path = Path(os.getenv("CONTACT_SQLITE_PATH") or (backend_root / "data" / "contact.sqlite3"))
+			path.parent.mkdir(parents=True, exist_ok=True)
+			Pipeline.engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False}, future=True)
+			instrument_engine(Pipeline.engine, "contact")
+	return Pipeline.engine
+
+
+def _get_table() -> Table:
+	if Pipeline.table is None:
+		Pipeline.table = Table(
+			"contact_messages",
+			MetaData(),
+			Column("id", Integer, primary_key=True, autoincrement=True),
+			Column("name", String(200), nullable=False),
+			Column("email", String(320), nullable=False),
+			Column("subject", String(300), nullable=False),
+			Column("message", Text, nullable=False),
+			Column("client_ip", String(64), nullable=True),
+			Column("created_at", TIMESTAMP(timezone=True), nullable=False),
+		)
+	return Pipeline.table
+
+
+def _insert(rows: List[Dict[str, Any]]) -> None:
+	table = _get_table()
+	with _get_engine().begin() as conn:
+		if not Pipeline.table_ready:
+			table.metadata.create_all(conn)
+			Pipeline.table_ready = True
+		# One executemany per batch
+		conn.execute(table.insert(), rows)
+
+
+async def _store(rows: List[Dict[str, Any]]) -> None:
+	"""Insert ``rows``, retrying while the database is unreachable; any other error is raised."""
+	delay = 0.5
+	while True:
+		try:
+			await run_in_threadpool(_insert, rows)
+			return
+		except (OperationalError, InterfaceError):
+			# Connection trouble: keep the batch and retry; meanwhile the queue fills and the endpoint sheds load
+			logger.warning("storing %d contact message(s) failed; retrying in %.1fs", len(rows), delay, exc_info=True)
+			await asyncio.sleep(delay)
+			delay = min(delay * 2, 30.0)
 
 
+async def _store_each(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+	"""Store rows one at a time after a batch failed with an error retrying won't fix; returns those stored."""
+	stored = []
+	for row in rows:
+		try:
+			await _store([row])
+			stored.append(row)
+		except Exception:
+			logger.exception("dropping contact message from %s", row.get("email"))
+	return stored
+
+
+async def _notify(rows: List[Dict[str, Any]]) -> None:
+	"""One notification for a batch of stored messages, through ``Pipeline.notify`` when set."""
+	notify = Pipeline.notify
+	if notify is None or not rows:
+		return
+	try:
+		await run_in_threadpool(notify, rows)
+	except Exception:
+		# Messages are already stored; a failed notification must not lose or re-insert them
+		logger.exception("notifying about %d contact message(s) failed", len(rows))
+
+
+async def _drain(queue: "asyncio.Queue[Dict[str, Any]]") -> None:
+	batch_size = int(_setting("CONTACT_BATCH_SIZE", "100"))
+	batch_wait = _setting("CONTACT_BATCH_WAIT", "0.5")
+	loop = asyncio.get_running_loop()
+	while True:
+		batch = [await queue.get()]
+		deadline = loop.time() + batch_wait
+		while len(batch) < batch_size:
+			if not queue.empty():
+				batch.append(queue.get_nowait())
+				continue
+			remaining = deadline - loop.time()
+			if remaining <= 0:
+				break
+			try:
+				batch.append(await asyncio.wait_for(queue.get(), remaining))
+			except asyncio.TimeoutError:
+				break
+		try:
+			try:
+				await _store(batch)
+				stored = batch
+			except Exception:
+				# Bad data (e.g. DataError, IntegrityError) would fail every retry; isolate the rows at fault
+				logger.exception("storing a batch of %d contact message(s) failed", len(batch))
+				stored = await _store_each(batch)
+			await _notify(stored)
+		finally:
+			for _ in batch:
+				queue.task_done()
+
+
+@router.on_event("startup")
+async def start_worker() -> None:
+	if Pipeline.worker is not None and not Pipeline.worker.done():
+		# Router startup handlers can fire more than once for one app
+		return
+	Pipeline.queue = asyncio.Queue(maxsize=int(_setting("CONTACT_QUEUE_SIZE", "1000")))
+	Pipeline.worker = asyncio.create_task(_drain(Pipeline.queue))
+
+
+@router.on_event("shutdown")
+async def stop_worker() -> None:
+	queue, worker = Pipeline.queue, Pipeline.worker
+	Pipeline.queue = None
+	if queue is None or worker is None:
+		return
+	try:
+		# Give queued messages a chance to reach the database before exiting
+		await asyncio.wait_for(queue.join(), _setting("CONTACT_DRAIN_TIMEOUT", "10"))
+	except asyncio.TimeoutError:
+		pass
+	worker.cancel()
+	try:
+		await worker
+	except asyncio.CancelledError:
+		pass
+	Pipeline.worker = None
+
+
+@router.post("/", status_code=202)
+async def submit_contact(message: ContactMessage, request: Request) -> dict:
+	"""Accept a contact message for storage.
+
+	Returns 202 once the message is queued; it is written to the database by
+	the background worker within CONTACT_BATCH_WAIT seconds. Clients over
+	their per-IP rate, or arriving while the queue is full, get 429 with a
+	Retry-After header.
+	"""
+	client_ip = request.client.host if request.client else None
+	wait = _get_buckets().take(client_ip or "unknown")
+	if wait > 0:
+		raise HTTPException(status_code=429, detail="Too many messages", headers={"Retry-After": str(math.ceil(wait))})
+	queue = Pipeline.queue
+	if queue is None:
+		raise HTTPException(status_code=503, detail="Contact queue not running")
+	row = {**message.model_dump(), "client_ip": client_ip, "created_at": datetime.now(timezone.utc)}
+	try:
+		queue.put_nowait(row)
+	except asyncio.QueueFull:
+		raise HTTPException(status_code=429, detail="Too many pending messages", headers={"Retry-After": "5"})
+	return {"ok": True}
@@ -1,8 +1,21 @@
+from __future__ import annotations
+
+import asyncio
 import os
-from typing import Any, Dict, List, Optional
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from fastapi import APIRouter, HTTPException, Query, Response
+from pydantic_core import to_json
+
+from ..services.cache import TTLCache
+from ..services.fast_json import json_response
+from ..services.metrics import httpx_event_hooks
 
-import httpx
-from fastapi import APIRouter, HTTPException, Query
+if TYPE_CHECKING:
+	import httpx
 
 
 router = APIRouter()
@@ -10,6 +23,40 @@ router = APIRouter()
 
 GITHUB_API = "https://api.github.com"
 
+CacheKey = Tuple[str, int, int]
+
+
+@dataclass
+class CachedRepos:
+	repos: List[Dict[str, Any]]
+	etag: Optional[str]
+	fetched_at: float
+	last_page: int
+	# ``repos`` serialized once per fetch; /repos returns it as-is
+	body: bytes
+
+
+class Http:
+	"""Process-wide GitHub client and response cache.
+
+	``client`` is opened on first use and closed on shutdown; tests can assign an
+	``httpx.AsyncClient(transport=httpx.MockTransport(...))`` before the first
+	request. ``inflight`` holds the single upstream request per cache key that
+	concurrent callers share.
+	"""
+	client: Optional[httpx.AsyncClient] = None
+	cache: TTLCache = TTLCache(
+		maxsize=int(os.getenv("GITHUB_CACHE_SIZE", "256")),
+		ttl=float(os.getenv("GITHUB_STALE_TTL", "86400")),
+	)
+	inflight: Dict[CacheKey, "asyncio.Task[CachedRepos]"] = {}
+	# Most recent X-RateLimit-* values seen on any upstream response
+	rate_limit: Dict[str, Optional[int]] = {"limit": None, "remaining": None, "used": None, "reset": None}
+
+
+def _fresh_ttl() -> float:
+	return float(os.getenv("GITHUB_CACHE_TTL", "300"))
+
 
 def _headers() -> Dict[str, str]:
 	headers = {"Accept": "application/vnd.github+json"}
@@ -20,37 +67,185 @@ def _headers() -> Dict[str, str]:
 	return headers
 
 
-@router.get("/repos")
+def _get_client() -> httpx.AsyncClient:
+	if Http.client is None:
+		# Created (and httpx imported) on the first GitHub call rather than at startup
+		import httpx
+
+		Http.client = httpx.AsyncClient(
+			base_url=GITHUB_API,
+			timeout=15.0,
+			limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+			event_hooks=httpx_event_hooks("github"),
+		)
+	return Http.client
+
+
+@router.on_event("shutdown")
+async def close_client() -> None:
+	client, Http.client = Http.client, None
+	if client is not None:
+		await client.aclose()
+
+
+def _normalize(r: Dict[str, Any]) -> Dict[str, Any]:
+	# Normalize the subset we need
+	return {
+		"id": r.get("id"),
+		"name": r.get("name"),
+		"full_name": r.get("full_name"),
+		"html_url": r.get("html_url"),
+		"description": r.get("description"),
+		"language": r.get("language"),
+		"stargazers_count": r.get("stargazers_count"),
+		"forks_count": r.get("forks_count"),
+		"updated_at": r.get("updated_at"),
+		"topics": r.get("topics", []),
+	}
+
+
+def _record_rate_limit(resp: httpx.Response) -> None:
+	for name in Http.rate_limit:
+		value = resp.headers.get(f"x-ratelimit-{name}")
+		if value is not None and value.isdigit():
+			Http.rate_limit[name] = int(value)
+
+
+def _last_page(resp: httpx.Response, page: int) -> int:
+	last = resp.links.get("last", {}).get("url")
+	if last:
+		value = parse_qs(urlsplit(last).query).get("page", [""])[0]
+		if value.isdigit():
+			return int(value)
+	# GitHub omits rel="last" on the last page itself
+	return page
+
+
+async def _fetch(key: CacheKey, cached: Optional[CachedRepos]) -> CachedRepos:
+	username, per_page, page = key
+	headers = _headers()
+	if cached is not None and cached.etag:
+		# Conditional requests answered with 304 don't count against the rate limit
+		headers["If-None-Match"] = cached.etag
+	params = {"sort": "updated", "per_page": per_page, "page": page, "type": "owner"}
+	resp = await _get_client().get(f"/users/{username}/repos", headers=headers, params=params)
+	_record_rate_limit(resp)
+	if resp.status_code == 304 and cached is not None:
+		entry = CachedRepos(
+			repos=cached.repos,
+			etag=cached.etag,
+			fetched_at=time.monotonic(),
+			last_page=cached.last_page,
+			body=cached.body,
+		)
+	elif resp.status_code == 200:
+		repos = [_normalize(r) for r in resp.json()]
+		entry = CachedRepos(
+			repos=repos,
+			etag=resp.headers.get("etag"),
+			fetched_at=time.monotonic(),
+			last_page=_last_page(resp, page),
+			body=to_json(repos),
+		)
+	else:
+		raise HTTPException(status_code=resp.status_code, detail=resp.text)
+	Http.cache.set(key, entry)
+	return entry
+
+
+def _refresh(key: CacheKey, cached: Optional[CachedRepos]) -> "asyncio.Task[CachedRepos]":
+	"""Start (or join) the one upstream fetch for ``key``."""
+	task = Http.inflight.get(key)
+	if task is None:
+		task = asyncio.ensure_future(_fetch(key, cached))
+		Http.inflight[key] = task
+
+		def done(t: "asyncio.Task[CachedRepos]") -> None:
+			Http.inflight.pop(key, None)
+			if not t.cancelled():
+				# Mark background failures as retrieved; the stale entry keeps being served
+				t.exception()
+
+		task.add_done_callback(done)
+	return task
+
+
+async def _get_page(username: str, per_page: int, page: int) -> CachedRepos:
+	key: CacheKey = (username.lower(), per_page, page)
+	cached: Optional[CachedRepos] = Http.cache.get(key)
+	if cached is not None:
+		if time.monotonic() - cached.fetched_at >= _fresh_ttl():
+			_refresh(key, cached)
+		return cached
+	# Shield so a client disconnect doesn't cancel the fetch other callers are awaiting
+	return await asyncio.shield(_refresh(key, None))
+
+
+@router.get("/repos", response_model=List[Dict[str, Any]])
 async def list_repos(
 	username: str = Query(..., description="GitHub username"),
 	per_page: int = Query(12, ge=1, le=100),
 	page: int = Query(1, ge=1),
-) -> List[Dict[str, Any]]:
-	url = f"{GITHUB_API}/users/{username}/repos"
-	params = {"sort": "updated", "per_page": per_page, "page": page, "type": "owner"}
-	async with httpx.AsyncClient(timeout=15.0) as client:
-		resp = await client.get(url, headers=_headers(), params=params)
-		if resp.status_code != 200:
-			raise HTTPException(status_code=resp.status_code, detail=resp.text)
-		repos = resp.json()
-
-		# Normalize the subset we need
-		result: List[Dict[str, Any]] = []
-		for r in repos:
-			result.append(
-				{
-					"id": r.get("id"),
-					"name": r.get("name"),
-					"full_name": r.get("full_name"),
-					"html_url": r.get("html_url"),
-					"description": r.get("description"),
-					"language": r.get("language"),
-					"stargazers_count": r.get("stargazers_count"),
-					"forks_count": r.get("forks_count"),
-					"updated_at": r.get("updated_at"),
-					"topics": r.get("topics", []),
-				}
-			)
-		return result
+) -> Response:
+	"""Proxy a page of a user's repos with caching.
+
+	Fresh entries (GITHUB_CACHE_TTL) are served without contacting GitHub.
+	Stale entries are served immediately while one background request
+	revalidates them with If-None-Match. Concurrent misses for the same key
+	share a single upstream call.
+	"""
+	return json_response((await _get_page(username, per_page, page)).body)
+
+
+SORT_KEYS = {
+	"updated": lambda r: r.get("updated_at") or "",
+	"stars": lambda r: r.get("stargazers_count") or 0,
+	"name": lambda r: (r.get("name") or "").lower(),
+}
+
+
+@router.get("/repos/all", response_model=Dict[str, Any])
+async def list_all_repos(
+	username: str = Query(..., description="GitHub username"),
+	min_stars: int = Query(0, ge=0),
+	topic: List[str] = Query([], description="Only repos carrying all of these topics"),
+	language: Optional[str] = Query(None),
+	pin: List[str] = Query([], description="Repo names to put first, in this order"),
+	sort: str = Query("updated", pattern="^(updated|stars|name)$"),
+	limit: Optional[int] = Query(None, ge=1, le=1000),
+) -> Response:
+	"""Every repo of ``username``, filtered and sorted server-side.
+
+	Page 1 is fetched first to learn the page count from the Link header; the
+	remaining pages are fetched concurrently, at most GITHUB_FANOUT at a time
+	and up to GITHUB_MAX_PAGES pages of 100. Each page goes through the same
+	cache as ``/repos``. ``rate_limit`` is the budget GitHub last reported.
+	"""
+	first = await _get_page(username, 100, 1)
+	last_page = min(first.last_page, int(os.getenv("GITHUB_MAX_PAGES", "10")))
+	semaphore = asyncio.Semaphore(int(os.getenv("GITHUB_FANOUT", "4")))
+
+	async def fetch(page: int) -> CachedRepos:
+		async with semaphore:
+			return await _get_page(username, 100, page)
 
+	rest = await asyncio.gather(*(fetch(page) for page in range(2, last_page + 1)))
+	repos = [r for entry in (first, *rest) for r in entry.repos]
 
+	topics = {t.lower() for t in topic}
+	lang = language.lower() if language else None
+	repos = [
+		r for r in repos
+		if (r.get("stargazers_count") or 0) >= min_stars
+		and (lang is None or (r.get("language") or "").lower() == lang)
+		and topics.issubset(t.lower() for t in r.get("topics") or [])
+	]
+	repos.sort(key=SORT_KEYS[sort], reverse=sort != "name")
+	if pin:
+		order = {name.lower(): i for i, name in enumerate(pin)}
+		# Stable sort keeps the requested ordering among non-pinned repos
+		repos.sort(key=lambda r: order.get((r.get("name") or "").lower(), len(order)))
+	total = len(repos)
+	if limit is not None:
+		repos = repos[:limit]
+	return json_response(to_json({"total": total, "repos": repos, "rate_limit": Http.rate_limit}))
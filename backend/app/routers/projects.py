@@ -1,48 +1,49 @@
+import os
+from pathlib import Path
 from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import Response
 
 from ..models import Project
+from ..services.project_catalog import CatalogFile
 
 
 router = APIRouter()
 
 
-# Demo in-memory projects. Replace with DB or file in production.
-PROJECTS: List[Project] = [
-	Project(
-		id=1,
-		title="Portfolio Website",
-		description="This site showcasing my work using FastAPI and React.",
-		tags=["FastAPI", "React", "Vite", "Tailwind"],
-		github_url="https://github.com/example/portfolio",
-		live_url=None,
-		image_url=None,
-	),
-	Project(
-		id=2,
-		title="Data Dashboard",
-		description="Interactive analytics dashboard with charts and filters.",
-		tags=["TypeScript", "D3", "API"],
-		github_url="https://github.com/example/dashboard",
-		live_url=None,
-		image_url=None,
-	),
-]
+class Catalogs:
+	default: Optional[CatalogFile] = None
 
 
-@router.get("/", response_model=List[Project])
-def list_projects(tag: Optional[str] = None) -> List[Project]:
-	if tag:
-		return [project for project in PROJECTS if tag in project.tags]
-	return PROJECTS
+def _get_catalog_file() -> CatalogFile:
+	"""Projects come from PROJECTS_FILE (JSON or YAML), by default backend/projects.json."""
+	if Catalogs.default is None:
+		backend_root = Path(__file__).resolve().parents[2]
+		path = Path(os.getenv("PROJECTS_FILE") or (backend_root / "projects.json"))
+		if not path.is_absolute():
+			path = backend_root / path
+		Catalogs.default = CatalogFile(path, check_interval=float(os.getenv("PROJECTS_RELOAD_INTERVAL", "1")))
+	return Catalogs.default
 
 
-@router.get("/{project_id}", response_model=Project)
-def get_project(project_id: int) -> Project:
-	for project in PROJECTS:
-		if project.id == project_id:
-			return project
-	raise HTTPException(status_code=404, detail="Project not found")
+@router.on_event("startup")
+def load_catalog() -> None:
+	_get_catalog_file().reload()
+
+
+@router.get("/", response_model=List[Project])
+def list_projects(
+	tag: List[str] = Query([], description="Filter by tag; repeat for several"),
+	match: str = Query("all", pattern="^(all|any)$", description="Require all tags or any of them"),
+) -> Response:
+	body = _get_catalog_file().current().query(tag, match_all=match == "all")
+	return Response(content=body, media_type="application/json")
 
 
+@router.get("/{project_id}", response_model=Project)
+def get_project(project_id: int) -> Response:
+	body = _get_catalog_file().current().by_id.get(project_id)
+	if body is None:
+		raise HTTPException(status_code=404, detail="Project not found")
+	return Response(content=body, media_type="application/json")
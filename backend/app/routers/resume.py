@@ -1,14 +1,22 @@
+import asyncio
 import os
 from pathlib import Path
+from typing import Optional
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, Response
 
-from ..services.resume_parser import extract_resume_text, parse_resume_text
+from ..services.resume_cache import get_resume_cache
+from ..services.static_site import REVALIDATE_CACHE_CONTROL, file_response
 
 router = APIRouter()
 
 
+class Warmup:
+    task: Optional["asyncio.Task[None]"] = None
+
+
 def _get_resume_path() -> Path:
     """Resolve resume path with env override and multiple fallbacks.
 
@@ -39,30 +47,47 @@ def _get_resume_path() -> Path:
     return candidates[0] if candidates else (project_root / default_name)
 
 
-@router.get("/", response_class=FileResponse)
-def get_resume() -> FileResponse:
+@router.api_route("/", methods=["GET", "HEAD"], response_class=FileResponse)
+async def get_resume(request: Request) -> Response:
+	"""The resume PDF, with Range support so PDF viewers can load it page by page."""
 	resume_path = _get_resume_path()
 	if not resume_path.exists():
 		raise HTTPException(status_code=404, detail="Resume PDF not found")
-	return FileResponse(
-		path=str(resume_path),
-		media_type="application/pdf",
-		filename="Libin_Guo_Resume.pdf",
+	return await file_response(
+		request,
+		resume_path,
+		"application/pdf",
+		headers={
+			"Content-Disposition": 'attachment; filename="Libin_Guo_Resume.pdf"',
+			"Cache-Control": REVALIDATE_CACHE_CONTROL,
+		},
 	)
 
 
+async def _warm_parsed_resume() -> None:
+	resume_path = _get_resume_path()
+	if resume_path.exists():
+		try:
+			await run_in_threadpool(get_resume_cache().refresh, resume_path)
+		except Exception:
+			# A bad PDF shouldn't break startup; /parsed will surface the error on demand
+			pass
+
+
+@router.on_event("startup")
+async def start_resume_warmup() -> None:
+	# Parse in the background so startup isn't blocked on pdfminer
+	Warmup.task = asyncio.create_task(_warm_parsed_resume())
+
+
 @router.get("/parsed")
-def get_parsed_resume() -> dict:
+async def get_parsed_resume() -> dict:
+	"""Parsed resume sections, served from memory while resume.pdf is unchanged."""
 	resume_path = _get_resume_path()
+	cache = get_resume_cache()
+	parsed = cache.lookup(resume_path)
+	if parsed is not None:
+		return parsed
 	if not resume_path.exists():
 		raise HTTPException(status_code=404, detail="Resume PDF not found")
-	text = extract_resume_text(resume_path)
-	parsed = parse_resume_text(text)
-	return {
-		"summary": parsed.summary,
-		"skills": parsed.skills,
-		"education": parsed.education,
-		"experience_snippets": parsed.experience_snippets,
-	}
-
-
+	return await run_in_threadpool(cache.refresh, resume_path)
@@ -1,16 +1,25 @@
+import math
 import os
+import threading
 import time
 import uuid
-from typing import Optional
+from typing import Any, List, Optional, Tuple
 
-import boto3
-from botocore.client import Config
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 router = APIRouter()
 
+# Every key this router signs lives under this prefix; part/complete requests for other keys are refused
+KEY_PREFIX = "images/"
+
+# S3 limits: parts are 5 MiB..5 GiB (the last may be smaller), at most 10,000 per upload
+MIN_PART_SIZE = 5 * 1024 * 1024
+MAX_PART_SIZE = 5 * 1024 * 1024 * 1024
+MAX_PARTS = 10_000
+MAX_OBJECT_SIZE = 5 * 1024 ** 4
+
 
 class PresignRequest(BaseModel):
     filename: str
@@ -23,44 +32,278 @@ class PresignResponse(BaseModel):
     key: str
 
 
+class BatchPresignRequest(BaseModel):
+    files: List[PresignRequest] = Field(min_length=1)
+
+
+class BatchPresignResponse(BaseModel):
+    items: List[PresignResponse]
+
+
+class MultipartCreateRequest(BaseModel):
+    filename: str
+    contentType: str
+    size: int = Field(gt=0, le=MAX_OBJECT_SIZE)
+
+
+class PartUrl(BaseModel):
+    partNumber: int
+    uploadUrl: str
+
+
+class MultipartCreateResponse(BaseModel):
+    key: str
+    uploadId: str
+    partSize: int
+    partCount: int
+    publicUrl: str
+    # URLs for the first parts; fetch the rest from /multipart/parts
+    parts: List[PartUrl]
+
+
+class MultipartPartsRequest(BaseModel):
+    key: str
+    uploadId: str
+    partNumbers: List[int] = Field(min_length=1)
+
+
+class MultipartPartsResponse(BaseModel):
+    parts: List[PartUrl]
+
+
+class CompletedPart(BaseModel):
+    partNumber: int = Field(ge=1, le=MAX_PARTS)
+    etag: str
+
+
+class MultipartCompleteRequest(BaseModel):
+    key: str
+    uploadId: str
+    parts: List[CompletedPart] = Field(min_length=1)
+
+
+class MultipartCompleteResponse(BaseModel):
+    key: str
+    publicUrl: str
+
+
+class MultipartAbortRequest(BaseModel):
+    key: str
+    uploadId: str
+
+
+class S3Clients:
+    """Process-wide S3 client, rebuilt when the configured credentials change.
+
+    ``fingerprint`` covers the credential and region env vars and the shared
+    credentials file's mtime, so a rotated key (env or file) gets a new client
+    on the next call. Credentials from an instance/task role are refreshed by
+    botocore itself and need no rebuild.
+    """
+    client: Any = None
+    region: Optional[str] = None
+    fingerprint: Optional[Tuple[Any, ...]] = None
+    lock = threading.Lock()
+
+
+def _credentials_fingerprint(region: str) -> Tuple[Any, ...]:
+    credentials_file = os.getenv("AWS_SHARED_CREDENTIALS_FILE") or os.path.expanduser("~/.aws/credentials")
+    try:
+        file_mtime = os.stat(credentials_file).st_mtime_ns
+    except OSError:
+        file_mtime = None
+    return (
+        region,
+        os.getenv("AWS_ACCESS_KEY_ID"),
+        os.getenv("AWS_SECRET_ACCESS_KEY"),
+        os.getenv("AWS_SESSION_TOKEN"),
+        os.getenv("AWS_PROFILE"),
+        file_mtime,
+    )
+
+
 def _s3_client():
     region = os.getenv("AWS_REGION") or os.getenv("AWS_DEFAULT_REGION")
     if not region:
         raise HTTPException(status_code=500, detail="AWS_REGION not configured")
-    session = boto3.session.Session(
-        aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
-        aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
-        region_name=region,
-    )
-    return session.client("s3", config=Config(signature_version="s3v4")), region
+    fingerprint = _credentials_fingerprint(region)
+    if S3Clients.fingerprint == fingerprint:
+        return S3Clients.client, S3Clients.region
 
+    with S3Clients.lock:
+        if S3Clients.fingerprint != fingerprint:
+            # boto3 takes a noticeable share of cold start; load it on the first S3 call
+            import boto3
+            from botocore.client import Config
 
-@router.post("/presign", response_model=PresignResponse)
-def presign(req: PresignRequest) -> PresignResponse:
+            session = boto3.session.Session(
+                aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
+                aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
+                aws_session_token=os.getenv("AWS_SESSION_TOKEN"),
+                region_name=region,
+            )
+            S3Clients.client = session.client("s3", config=Config(signature_version="s3v4"))
+            S3Clients.region = region
+            S3Clients.fingerprint = fingerprint
+        return S3Clients.client, S3Clients.region
+
+
+def _public_url(bucket: str, region: str, key: str) -> str:
+    public_base = os.getenv("S3_PUBLIC_BASE")
+    if public_base:
+        return f"{public_base.rstrip('/')}/{key}"
+    return f"https://{bucket}.s3.{region}.amazonaws.com/{key}"
+
+
+def _bucket() -> str:
     bucket = os.getenv("S3_BUCKET")
     if not bucket:
         raise HTTPException(status_code=500, detail="S3_BUCKET not configured")
-    client, region = _s3_client()
+    return bucket
+
+
+def _expires_in() -> int:
+    return int(os.getenv("UPLOADS_URL_EXPIRES", "3600"))
+
+
+def _new_key(filename: str) -> str:
     # key: images/yyyy/mm/uuid-filename
     ts = time.gmtime()
-    safe_name = req.filename.replace("/", "-")
-    key = f"images/{ts.tm_year:04d}/{ts.tm_mon:02d}/{uuid.uuid4().hex}-{safe_name}"
+    safe_name = filename.replace("/", "-")
+    return f"{KEY_PREFIX}{ts.tm_year:04d}/{ts.tm_mon:02d}/{uuid.uuid4().hex}-{safe_name}"
 
-    try:
-        upload_url = client.generate_presigned_url(
-            "put_object",
-            Params={"Bucket": bucket, "Key": key, "ContentType": req.contentType},
-            ExpiresIn=3600,
+
+def _check_key(key: str) -> None:
+    if not key.startswith(KEY_PREFIX) or ".." in key:
+        raise HTTPException(status_code=400, detail="Key was not issued by this service")
+
+
+def _presign_put(client, bucket: str, region: str, req: PresignRequest) -> PresignResponse:
+    key = _new_key(req.filename)
+    upload_url = client.generate_presigned_url(
+        "put_object",
+        Params={"Bucket": bucket, "Key": key, "ContentType": req.contentType},
+        ExpiresIn=_expires_in(),
+    )
+    return PresignResponse(uploadUrl=upload_url, publicUrl=_public_url(bucket, region, key), key=key)
+
+
+def _part_urls(client, bucket: str, key: str, upload_id: str, part_numbers: List[int]) -> List[PartUrl]:
+    expires_in = _expires_in()
+    return [
+        PartUrl(
+            partNumber=number,
+            uploadUrl=client.generate_presigned_url(
+                "upload_part",
+                Params={"Bucket": bucket, "Key": key, "UploadId": upload_id, "PartNumber": number},
+                ExpiresIn=expires_in,
+            ),
         )
+        for number in part_numbers
+    ]
+
+
+def _part_size(size: int) -> int:
+    """UPLOADS_PART_SIZE, raised if needed so ``size`` fits in MAX_PARTS parts."""
+    configured = int(os.getenv("UPLOADS_PART_SIZE", str(8 * 1024 * 1024)))
+    return min(max(configured, MIN_PART_SIZE, math.ceil(size / MAX_PARTS)), MAX_PART_SIZE)
+
+
+def _max_urls_per_request() -> int:
+    return int(os.getenv("UPLOADS_MAX_BATCH", "100"))
+
+
+@router.post("/presign", response_model=PresignResponse)
+def presign(req: PresignRequest) -> PresignResponse:
+    bucket = _bucket()
+    client, region = _s3_client()
+    try:
+        return _presign_put(client, bucket, region, req)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to presign: {e}")
 
-    public_base = os.getenv("S3_PUBLIC_BASE")
-    if public_base:
-        public_url = f"{public_base.rstrip('/')}/{key}"
-    else:
-        public_url = f"https://{bucket}.s3.{region}.amazonaws.com/{key}"
 
-    return PresignResponse(uploadUrl=upload_url, publicUrl=public_url, key=key)
+@router.post("/presign/batch", response_model=BatchPresignResponse)
+def presign_batch(req: BatchPresignRequest) -> BatchPresignResponse:
+    """Presign a PUT URL for each file; items are returned in request order."""
+    if len(req.files) > _max_urls_per_request():
+        raise HTTPException(status_code=400, detail=f"At most {_max_urls_per_request()} files per request")
+    bucket = _bucket()
+    client, region = _s3_client()
+    try:
+        return BatchPresignResponse(items=[_presign_put(client, bucket, region, file) for file in req.files])
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to presign: {e}")
+
+
+@router.post("/multipart", response_model=MultipartCreateResponse)
+def create_multipart(req: MultipartCreateRequest) -> MultipartCreateResponse:
+    """Start a multipart upload sized for ``size`` bytes and presign its first parts.
+
+    The client PUTs each part to its URL, keeps the ETag response header of each,
+    and finishes with /multipart/complete (or /multipart/abort).
+    """
+    bucket = _bucket()
+    client, region = _s3_client()
+    key = _new_key(req.filename)
+    part_size = _part_size(req.size)
+    part_count = math.ceil(req.size / part_size)
+    try:
+        upload = client.create_multipart_upload(Bucket=bucket, Key=key, ContentType=req.contentType)
+        first = list(range(1, min(part_count, _max_urls_per_request()) + 1))
+        parts = _part_urls(client, bucket, key, upload["UploadId"], first)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to start multipart upload: {e}")
+    return MultipartCreateResponse(
+        key=key,
+        uploadId=upload["UploadId"],
+        partSize=part_size,
+        partCount=part_count,
+        publicUrl=_public_url(bucket, region, key),
+        parts=parts,
+    )
+
 
+@router.post("/multipart/parts", response_model=MultipartPartsResponse)
+def presign_parts(req: MultipartPartsRequest) -> MultipartPartsResponse:
+    _check_key(req.key)
+    if len(req.partNumbers) > _max_urls_per_request():
+        raise HTTPException(status_code=400, detail=f"At most {_max_urls_per_request()} parts per request")
+    if any(not 1 <= number <= MAX_PARTS for number in req.partNumbers):
+        raise HTTPException(status_code=400, detail=f"Part numbers must be between 1 and {MAX_PARTS}")
+    bucket = _bucket()
+    client, _ = _s3_client()
+    try:
+        return MultipartPartsResponse(parts=_part_urls(client, bucket, req.key, req.uploadId, req.partNumbers))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to presign: {e}")
+
+
+@router.post("/multipart/complete", response_model=MultipartCompleteResponse)
+def complete_multipart(req: MultipartCompleteRequest) -> MultipartCompleteResponse:
+    _check_key(req.key)
+    bucket = _bucket()
+    client, region = _s3_client()
+    # S3 requires ascending part numbers; clients may finish parts out of order
+    parts = sorted({part.partNumber: part for part in req.parts}.values(), key=lambda part: part.partNumber)
+    try:
+        client.complete_multipart_upload(
+            Bucket=bucket,
+            Key=req.key,
+            UploadId=req.uploadId,
+            MultipartUpload={"Parts": [{"PartNumber": part.partNumber, "ETag": part.etag} for part in parts]},
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to complete multipart upload: {e}")
+    return MultipartCompleteResponse(key=req.key, publicUrl=_public_url(bucket, region, req.key))
 
+
+@router.post("/multipart/abort", status_code=204)
+def abort_multipart(req: MultipartAbortRequest) -> None:
+    _check_key(req.key)
+    bucket = _bucket()
+    client, _ = _s3_client()
+    try:
+        client.abort_multipart_upload(Bucket=bucket, Key=req.key, UploadId=req.uploadId)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to abort multipart upload: {e}")
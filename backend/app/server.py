@@ -0,0 +1,93 @@
+"""Production server: uvicorn with pre-spawned workers and graceful draining.
+
+Started by ``python -m app --production``. The supervisor binds the socket
+once and starts ``workers`` processes that all accept from it; SIGTERM or
+SIGINT is forwarded to every worker, which stops accepting connections, ends
+long-lived streams through the drain hooks, and gives in-flight requests up to
+``graceful_timeout`` seconds before the app's shutdown handlers run.
+"""
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import logging
+import os
+from types import FrameType
+from typing import Optional
+
+import uvicorn
+from uvicorn.supervisors import Multiprocess
+
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class AppServer(uvicorn.Server):
+	"""uvicorn.Server that starts the app's drain hooks as soon as an exit signal arrives."""
+
+	_loop: Optional[asyncio.AbstractEventLoop] = None
+	_drain_started = False
+
+	async def serve(self, sockets=None) -> None:  # type: ignore[no-untyped-def]
+		self._loop = asyncio.get_running_loop()
+		await super().serve(sockets)
+
+	def handle_exit(self, sig: int, frame: Optional[FrameType]) -> None:
+		super().handle_exit(sig, frame)
+		if self._loop is not None and not self._drain_started:
+			from .services.lifecycle import start_draining
+
+			self._drain_started = True
+			self._loop.call_soon_threadsafe(start_draining)
+
+
+def resolve_loop(name: str) -> str:
+	"""``uvloop``/``asyncio``; ``auto`` picks uvloop when installed. Explicit uvloop must be installed."""
+	if name == "auto":
+		return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+	if name == "uvloop" and not importlib.util.find_spec("uvloop"):
+		raise SystemExit("SERVER_LOOP=uvloop but uvloop is not installed")
+	return name
+
+
+def resolve_http(name: str) -> str:
+	"""``httptools``/``h11``; ``auto`` picks httptools when installed. Explicit httptools must be installed."""
+	if name == "auto":
+		return "httptools" if importlib.util.find_spec("httptools") else "h11"
+	if name == "httptools" and not importlib.util.find_spec("httptools"):
+		raise SystemExit("SERVER_HTTP=httptools but httptools is not installed")
+	return name
+
+
+def run_production(
+	host: str,
+	port: int,
+	workers: int,
+	loop: str = "auto",
+	http: str = "auto",
+	graceful_timeout: float = 30.0,
+) -> None:
+	# Workers read this to size their DB pool and threadpool (services.capacity); set before they spawn
+	os.environ["WEB_CONCURRENCY"] = str(workers)
+	config = uvicorn.Config(
+		"app.main:app",
+		host=host,
+		port=port,
+		workers=workers,
+		loop=resolve_loop(loop),
+		http=resolve_http(http),
+		proxy_headers=True,
+		timeout_keep_alive=int(os.getenv("KEEPALIVE_TIMEOUT", "5")),
+		timeout_graceful_shutdown=graceful_timeout,
+		access_log=os.getenv("ACCESS_LOG", "true").lower() in {"1", "true", "yes"},
+	)
+	server = AppServer(config=config)
+	logger.info(
+		"Production mode: %d worker(s), loop=%s, http=%s, graceful timeout %.0fs",
+		workers, config.loop, config.http, graceful_timeout,
+	)
+	if workers > 1:
+		sock = config.bind_socket()
+		Multiprocess(config, target=server.run, sockets=[sock]).run()
+	else:
+		server.run()
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import mimetypes
+import os
+import re
+import tempfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Optional
+
+
+# data:image/png;base64,AAAA... as produced by FileReader.readAsDataURL in the editor
+DATA_URI_RE = re.compile(r"data:(image/[A-Za-z0-9.+-]+);base64,([A-Za-z0-9+/]+={0,2})")
+
+# Content-addressed blob names: sha256 hex digest plus a file extension
+BLOB_NAME_RE = re.compile(r"^[0-9a-f]{64}\.[a-z0-9]{1,8}$")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class BlobStore(ABC):
+	"""Write-once storage for content-addressed blobs.
+
+	Names are derived from the blob's sha256, so a name always refers to the
+	same bytes and existing blobs never need to be rewritten.
+	"""
+
+	@abstractmethod
+	def exists(self, name: str) -> bool:
+		...
+
+	@abstractmethod
+	def put(self, name: str, data: bytes, content_type: str) -> None:
+		...
+
+	@abstractmethod
+	def url(self, name: str) -> str:
+		...
+
+
+class LocalBlobStore(BlobStore):
+	"""Blobs as files in a directory, served by the blog router under /api/blog/blobs."""
+
+	def __init__(self, root: Path, public_base: str) -> None:
+		self.root = root
+		self.public_base = public_base.rstrip("/")
+
+	def path(self, name: str) -> Path:
+		return self.root / name
+
+	def exists(self, name: str) -> bool:
+		return self.path(name).exists()
+
+	def put(self, name: str, data: bytes, content_type: str) -> None:
+		self.root.mkdir(parents=True, exist_ok=True)
+		# Write to a temp file and rename so readers never see a partial blob
+		fd, tmp = tempfile.mkstemp(dir=self.root, prefix=".tmp-")
+		try:
+			with os.fdopen(fd, "wb") as f:
+				f.write(data)
+			os.replace(tmp, self.path(name))
+		except BaseException:
+			Path(tmp).unlink(missing_ok=True)
+			raise
+
+	def url(self, name: str) -> str:
+		return f"{self.public_base}/{name}"
+
+
+class S3BlobStore(BlobStore):
+	"""Blobs in the uploads S3 bucket under ``prefix``, with immutable cache headers."""
+
+	def __init__(self, bucket: str, prefix: str = "blobs/") -> None:
+		from ..routers.uploads import _s3_client
+
+		self.bucket = bucket
+		self.prefix = prefix
+		self.region = _s3_client()[1]
+
+	@property
+	def client(self):
+		from ..routers.uploads import _s3_client
+
+		# The shared client, so a credential rotation reaches the blob store too
+		return _s3_client()[0]
+
+	def exists(self, name: str) -> bool:
+		from botocore.exceptions import ClientError
+
+		try:
+			self.client.head_object(Bucket=self.bucket, Key=self.prefix + name)
+			return True
+		except ClientError:
+			return False
+
+	def put(self, name: str, data: bytes, content_type: str) -> None:
+		self.client.put_object(
+			Bucket=self.bucket,
+			Key=self.prefix + name,
+			Body=data,
+			ContentType=content_type,
+			CacheControl=IMMUTABLE_CACHE_CONTROL,
+		)
+
+	def url(self, name: str) -> str:
+		from ..routers.uploads import _public_url
+
+		return _public_url(self.bucket, self.region, self.prefix + name)
+
+
+class BlobStores:
+	default: Optional[BlobStore] = None
+
+
+def get_blob_store() -> BlobStore:
+	"""Return the process-wide blob store selected by BLOB_STORE (``local`` or ``s3``)."""
+	if BlobStores.default is None:
+		kind = os.getenv("BLOB_STORE", "local").lower()
+		if kind == "s3":
+			bucket = os.getenv("S3_BUCKET")
+			if not bucket:
+				raise RuntimeError("BLOB_STORE=s3 requires S3_BUCKET")
+			BlobStores.default = S3BlobStore(bucket, os.getenv("BLOB_S3_PREFIX", "blobs/"))
+		else:
+			backend_root = Path(__file__).resolve().parents[2]
+			root = Path(os.getenv("BLOB_DIR") or (backend_root / "blobs"))
+			BlobStores.default = LocalBlobStore(root, os.getenv("BLOB_PUBLIC_BASE", "/api/blog/blobs"))
+	return BlobStores.default
+
+
+def externalize_data_uris(content: str, store: BlobStore) -> str:
+	"""Move base64 ``data:image/*`` URIs in ``content`` into ``store`` and link to them.
+
+	Each distinct image is hashed and stored once; identical images across
+	posts share a blob. Malformed base64 is left in place untouched.
+	"""
+	if "data:image/" not in content:
+		return content
+	urls: Dict[str, str] = {}
+
+	def replace(match: "re.Match[str]") -> str:
+		content_type, payload = match.group(1), match.group(2)
+		try:
+			data = base64.b64decode(payload, validate=True)
+		except (binascii.Error, ValueError):
+			return match.group(0)
+		digest = hashlib.sha256(data).hexdigest()
+		if digest not in urls:
+			ext = (mimetypes.guess_extension(content_type) or ".bin").lstrip(".")
+			name = f"{digest}.{ext}"
+			if not store.exists(name):
+				store.put(name, data, content_type)
+			urls[digest] = store.url(name)
+		return urls[digest]
+
+	return DATA_URI_RE.sub(replace, content)
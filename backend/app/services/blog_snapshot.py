@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence
+
+from pydantic_core import to_json
+
+from ..models import BlogPost, BlogPostSummary
+from .fast_json import dump_row, row_adapter, with_defaults
+
+try:
+	import fcntl
+except ImportError:  # Windows; syncs are then only serialized within one process
+	fcntl = None
+
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = "manifest.json"
+LOCK_FILE = ".lock"
+
+# Slugs restored from backups are not guaranteed to be URL/filename safe; those fall back to "post"
+SAFE_NAME_RE = re.compile(r"^[A-Za-z0-9_-]{1,100}$")
+
+
+def _iso(value: Optional[datetime]) -> str:
+	return value.isoformat() if value else ""
+
+
+def _content_hash(body: bytes) -> str:
+	return hashlib.sha256(body).hexdigest()[:16]
+
+
+class BlogSnapshot:
+	"""Static JSON copy of the blog, for serving reads from a CDN or GitHub Pages.
+
+	Layout under ``root``:
+
+	- ``posts/<slug>.<hash>.json``: one post, the same JSON as ``GET /api/blog/{slug}``
+	- ``index/page-<n>.<hash>.json``: ``{"posts": [...]}`` summaries, each with
+	  the ``file`` of its post, newest first within the page
+	- ``manifest.json``: the entry point, ``pages`` (newest page first) and a
+	  ``posts`` map of slug -> ``{"file", "updated_at"}``
+
+	Every file except the manifest is content-addressed and can be cached
+	forever. Pages are filled oldest-first, so a new post only changes the
+	newest page. ``sync`` rewrites only post files whose row changed and pages
+	whose content changed, then the manifest; files no longer referenced are
+	deleted once they are older than ``keep_seconds``, so clients holding the
+	previous manifest can still finish reading.
+	"""
+
+	def __init__(self, root: Path, page_size: int = 20, keep_seconds: float = 3600.0) -> None:
+		self.root = root
+		self.page_size = page_size
+		self.keep_seconds = keep_seconds
+
+	def manifest(self) -> Dict[str, Any]:
+		try:
+			return json.loads((self.root / MANIFEST).read_bytes())
+		except (OSError, ValueError):
+			return {}
+
+	@contextmanager
+	def locked(self) -> Iterator[None]:
+		"""Hold the snapshot's lock file for one sync, from ``stale_slugs`` to ``finish``.
+
+		Every worker process and the CLI sync the same directory; without the lock
+		one of them can replace the manifest between another's ``stale_slugs`` and
+		``finish``, leaving posts with neither a new nor a previous file. Blocks.
+		"""
+		self.root.mkdir(parents=True, exist_ok=True)
+		with open(self.root / LOCK_FILE, "a+b") as f:
+			if fcntl is not None:
+				fcntl.flock(f, fcntl.LOCK_EX)
+			try:
+				yield
+			finally:
+				if fcntl is not None:
+					fcntl.flock(f, fcntl.LOCK_UN)
+
+	def stale_slugs(self, summaries: Sequence[Mapping[str, Any]], full: bool = False) -> List[str]:
+		"""Slugs whose post file must be (re)written: new, updated, or missing on disk."""
+		known = {} if full else self.manifest().get("posts", {})
+		stale = []
+		for row in summaries:
+			entry = known.get(row["slug"])
+			if entry is None or entry.get("updated_at") != _iso(row["updated_at"]) or not (self.root / entry["file"]).exists():
+				stale.append(row["slug"])
+		return stale
+
+	def _write(self, relative: str, body: bytes, overwrite: bool = False) -> bool:
+		path = self.root / relative
+		if path.exists() and not overwrite:
+			# Content-addressed: an existing file already has these bytes
+			return False
+		path.parent.mkdir(parents=True, exist_ok=True)
+		# Write to a temp file and rename so readers never see a partial file
+		fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+		try:
+			with os.fdopen(fd, "wb") as f:
+				f.write(body)
+			os.replace(tmp, path)
+		except BaseException:
+			Path(tmp).unlink(missing_ok=True)
+			raise
+		return True
+
+	def write_posts(self, rows: Iterable[Mapping[str, Any]]) -> Dict[str, str]:
+		"""Write post files for full rows; returns slug -> file path relative to ``root``."""
+		files = {}
+		for row in rows:
+			body = dump_row(BlogPost, {**row, "created_at": _iso(row["created_at"])})
+			name = row["slug"] if SAFE_NAME_RE.match(row["slug"]) else "post"
+			files[row["slug"]] = self._write_hashed(f"posts/{name}", body)
+		return files
+
+	def _write_hashed(self, stem: str, body: bytes) -> str:
+		relative = f"{stem}.{_content_hash(body)}.json"
+		self._write(relative, body)
+		return relative
+
+	def finish(self, summaries: Sequence[Mapping[str, Any]], written: Mapping[str, str]) -> Dict[str, Any]:
+		"""Write index pages and the manifest for ``summaries``, then prune old files.
+
+		``written`` holds post files from this sync; other posts keep the file the
+		previous manifest points at.
+		"""
+		known = self.manifest().get("posts", {})
+		files = {}
+		for row in summaries:
+			file = written.get(row["slug"]) or known.get(row["slug"], {}).get("file")
+			if file is None:
+				# Only possible when a sync ran without the lock; the post is stale on the next sync
+				logger.warning("blog snapshot has no file for %r; leaving it out of this manifest", row["slug"])
+				continue
+			files[row["slug"]] = file
+		ordered = sorted((row for row in summaries if row["slug"] in files), key=lambda row: (_iso(row["created_at"]), row["slug"]))
+		adapter = row_adapter(BlogPostSummary, many=True)
+		pages = []
+		for number, start in enumerate(range(0, len(ordered), self.page_size), start=1):
+			chunk = list(reversed(ordered[start:start + self.page_size]))
+			posts = adapter.dump_python([with_defaults(BlogPostSummary, {**row, "created_at": _iso(row["created_at"])}) for row in chunk], mode="json")
+			for post, row in zip(posts, chunk):
+				post["file"] = files[row["slug"]]
+			pages.append(self._write_hashed(f"index/page-{number}", to_json({"posts": posts})))
+		pages.reverse()
+
+		manifest = {
+			"version": 1,
+			"generated_at": datetime.now().astimezone().isoformat(),
+			"page_size": self.page_size,
+			"total": len(ordered),
+			"pages": pages,
+			"posts": {row["slug"]: {"file": files[row["slug"]], "updated_at": _iso(row["updated_at"])} for row in ordered},
+		}
+		# Written last: the manifest only ever points at files that already exist
+		self._write(MANIFEST, to_json(manifest), overwrite=True)
+		self.prune({*pages, *files.values()})
+		return manifest
+
+	def prune(self, referenced: Iterable[str]) -> int:
+		keep = set(referenced)
+		cutoff = time.time() - self.keep_seconds
+		removed = 0
+		for folder in ("posts", "index"):
+			for path in (self.root / folder).glob("*.json"):
+				relative = f"{folder}/{path.name}"
+				if relative not in keep and path.stat().st_mtime < cutoff:
+					path.unlink(missing_ok=True)
+					removed += 1
+		return removed
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Generic, Hashable, Optional, Tuple, TypeVar
+
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+	"""Thread-safe, size-bounded LRU cache whose entries expire after ``ttl`` seconds.
+
+	Every invalidation bumps ``generation``. A reader that captured the generation
+	before going to the backing store passes it to ``set`` so that a value read
+	before a concurrent write cannot be cached after that write invalidated it.
+	"""
+
+	def __init__(self, maxsize: int = 256, ttl: float = 60.0) -> None:
+		self.maxsize = maxsize
+		self.ttl = ttl
+		self.generation = 0
+		self._data: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+		self._lock = threading.Lock()
+
+	def get(self, key: Hashable) -> Optional[V]:
+		with self._lock:
+			item = self._data.get(key)
+			if item is None:
+				return None
+			expires_at, value = item
+			if expires_at <= time.monotonic():
+				del self._data[key]
+				return None
+			self._data.move_to_end(key)
+			return value
+
+	def set(self, key: Hashable, value: V, generation: Optional[int] = None) -> None:
+		with self._lock:
+			if generation is not None and generation != self.generation:
+				return
+			self._data[key] = (time.monotonic() + self.ttl, value)
+			self._data.move_to_end(key)
+			while len(self._data) > self.maxsize:
+				self._data.popitem(last=False)
+
+	def pop(self, key: Hashable) -> None:
+		with self._lock:
+			self.generation += 1
+			self._data.pop(key, None)
+
+	def clear(self) -> None:
+		with self._lock:
+			self.generation += 1
+			self._data.clear()
+
+	def __len__(self) -> int:
+		return len(self._data)
+
+	def __contains__(self, key: Any) -> bool:
+		return self.get(key) is not None
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import os
+from typing import List, Optional
+
+
+def worker_count() -> int:
+	"""Server processes sharing this instance; set by ``python -m app --production``."""
+	try:
+		return max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+	except ValueError:
+		return 1
+
+
+# Connections each worker holds outside its engine pools: the blog change-feed LISTEN connection
+LISTENER_CONNECTIONS = 1
+
+
+def connection_budget() -> Optional[int]:
+	"""DB_CONNECTION_BUDGET: the most Postgres connections this instance may hold across all workers."""
+	budget = os.getenv("DB_CONNECTION_BUDGET")
+	return int(budget) if budget else None
+
+
+def connections_per_worker() -> Optional[int]:
+	"""Connections this worker's engine pools may hold together, or None when no budget is set.
+
+	That is the worker's equal share of DB_CONNECTION_BUDGET less the
+	connections it holds outside the pools (``LISTENER_CONNECTIONS``).
+	"""
+	budget = connection_budget()
+	if budget is None:
+		return None
+	return budget // worker_count() - LISTENER_CONNECTIONS
+
+
+def pool_sizes(engines: int) -> Optional[List[int]]:
+	"""Split ``connections_per_worker`` across ``engines`` pools, which must not overflow.
+
+	With two engines the first (sync) gets a quarter and the second (async,
+	serving requests) the rest. Raises RuntimeError when the budget can't give
+	every worker at least one connection per pool plus its listener.
+	"""
+	budget, share = connection_budget(), connections_per_worker()
+	if budget is None or share is None:
+		return None
+	workers = worker_count()
+	if share < engines:
+		raise RuntimeError(
+			f"DB_CONNECTION_BUDGET={budget} is too small for {workers} worker(s): each needs at least "
+			f"{engines + LISTENER_CONNECTIONS} connections ({engines} pool(s) plus the change-feed listener)"
+		)
+	if engines == 1:
+		sizes = [share]
+	else:
+		first = max(1, share // 4)
+		sizes = [first, share - first]
+	per_worker = sum(sizes) + LISTENER_CONNECTIONS
+	if workers * per_worker > budget:
+		raise RuntimeError(f"{workers} worker(s) x {per_worker} connections exceeds DB_CONNECTION_BUDGET={budget}")
+	return sizes
+
+
+def threadpool_size() -> Optional[int]:
+	"""Threadpool tokens per worker: THREADPOOL_SIZE, else derived from the connection budget.
+
+	Sync endpoints hold a pooled connection per thread, so the pool's share plus
+	THREADPOOL_EXTRA threads for blocking work that doesn't touch the database
+	(files, PDF parsing, rendering) keeps threads from queueing on the pool.
+	"""
+	explicit = os.getenv("THREADPOOL_SIZE")
+	if explicit:
+		return max(1, int(explicit))
+	share = connections_per_worker()
+	if share is None:
+		return None
+	return share + int(os.getenv("THREADPOOL_EXTRA", "8"))
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import logging
+from typing import Any, Callable, Dict, List, Optional, Set
+
+
+logger = logging.getLogger(__name__)
+
+# pg_notify rejects payloads of 8000 bytes or more
+MAX_PAYLOAD_BYTES = 7900
+
+
+class Subscription:
+	"""One subscriber's bounded buffer of events.
+
+	When the buffer is full the backlog is dropped and replaced by a single
+	``{"op": "resync"}`` event, so a slow client costs at most ``maxsize``
+	events of memory and learns it must refetch instead of silently missing
+	changes.
+	"""
+
+	def __init__(self, maxsize: int) -> None:
+		self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=maxsize)
+		self.dropped = 0
+
+	def put(self, event: Dict[str, Any]) -> None:
+		try:
+			self.queue.put_nowait(event)
+		except asyncio.QueueFull:
+			self.dropped += self.queue.qsize()
+			while not self.queue.empty():
+				self.queue.get_nowait()
+			self.queue.put_nowait({"op": "resync", "id": event.get("id")})
+
+	def close(self) -> None:
+		"""Replace anything pending with the ``closed`` sentinel, which must always arrive."""
+		while not self.queue.empty():
+			self.queue.get_nowait()
+		self.queue.put_nowait({"op": "closed"})
+
+	async def get(self) -> Dict[str, Any]:
+		return await self.queue.get()
+
+
+class ChangeFeed:
+	"""Fans out change events from one Postgres LISTEN connection to in-process subscribers.
+
+	The listener connection is opened when the first subscriber arrives and is
+	kept (with reconnects) until ``close``; after a reconnect subscribers get a
+	``resync`` event because notifications sent meanwhile are lost. Without a
+	``dsn`` (e.g. SQLite in development) there is no listener and events only
+	arrive through ``publish`` from this process. A closed feed stays closed:
+	new subscribers get ``closed`` at once and no listener is started.
+
+	``handlers`` are called synchronously with every event, including the
+	``resync`` after a reconnect; ``connected`` is true while the listener holds
+	a LISTEN connection, i.e. while no notification can be missed.
+	"""
+
+	def __init__(self, dsn: Optional[str], channel: str, buffer_size: int = 100) -> None:
+		self.dsn = dsn
+		self.channel = channel
+		self.buffer_size = buffer_size
+		self.subscribers: Set[Subscription] = set()
+		self._ids = itertools.count(1)
+		self._listener: Optional["asyncio.Task[None]"] = None
+		self.closed = False
+		self.connected = False
+		self.handlers: List[Callable[[Dict[str, Any]], None]] = []
+
+	def start(self) -> None:
+		"""Open the listener (if there is a ``dsn`` and it isn't running); call from the event loop."""
+		if self.dsn and not self.closed and (self._listener is None or self._listener.done()):
+			self._listener = asyncio.create_task(self._listen())
+
+	def subscribe(self) -> Subscription:
+		subscription = Subscription(self.buffer_size)
+		if self.closed:
+			subscription.close()
+			return subscription
+		self.start()
+		self.subscribers.add(subscription)
+		return subscription
+
+	def unsubscribe(self, subscription: Subscription) -> None:
+		self.subscribers.discard(subscription)
+
+	def publish(self, event: Dict[str, Any]) -> None:
+		# Ids are per process and only tell a client whether it skipped anything locally
+		event = {**event, "id": next(self._ids)}
+		for handler in self.handlers:
+			try:
+				handler(event)
+			except Exception:
+				logger.exception("%s handler failed for %r", self.channel, event)
+		for subscription in list(self.subscribers):
+			subscription.put(event)
+
+	async def _listen(self) -> None:
+		import psycopg
+
+		delay = 0.5
+		connected_before = False
+		while True:
+			try:
+				async with await psycopg.AsyncConnection.connect(self.dsn, autocommit=True) as conn:
+					await conn.execute(f"LISTEN {self.channel}")
+					delay = 0.5
+					if connected_before:
+						self.publish({"op": "resync"})
+					connected_before = True
+					self.connected = True
+					async for notify in conn.notifies():
+						try:
+							self.publish(json.loads(notify.payload))
+						except ValueError:
+							logger.warning("ignoring malformed %s payload: %.200s", self.channel, notify.payload)
+			except asyncio.CancelledError:
+				self.connected = False
+				raise
+			except Exception:
+				self.connected = False
+				logger.warning("%s listener disconnected; retrying in %.1fs", self.channel, delay, exc_info=True)
+				await asyncio.sleep(delay)
+				delay = min(delay * 2, 30.0)
+				connected_before = True
+
+	async def close(self) -> None:
+		self.closed = True
+		listener, self._listener = self._listener, None
+		if listener is not None:
+			listener.cancel()
+			try:
+				await listener
+			except asyncio.CancelledError:
+				pass
+		for subscription in list(self.subscribers):
+			subscription.close()
+		self.subscribers.clear()
+
+
+def encode_event(event: Dict[str, Any]) -> str:
+	"""JSON payload for ``pg_notify``; large slug lists collapse to a ``reset``."""
+	payload = json.dumps(event, separators=(",", ":"))
+	if len(payload.encode()) > MAX_PAYLOAD_BYTES:
+		payload = json.dumps({"op": "reset"}, separators=(",", ":"))
+	return payload
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Type
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_json
+from typing_extensions import TypedDict
+
+
+class FastJSONResponse(JSONResponse):
+	"""JSONResponse rendered by pydantic-core instead of the stdlib json module.
+
+	Used as the app's default response class; output is the same compact UTF-8
+	JSON Starlette produces.
+	"""
+
+	def render(self, content: Any) -> bytes:
+		return to_json(content)
+
+
+class RawJSONResponse(Response):
+	"""A response whose body is already-serialized JSON bytes."""
+
+	media_type = "application/json"
+
+
+@lru_cache(maxsize=None)
+def _row_type(model: Type[BaseModel]) -> type:
+	# A TypedDict with the model's fields, so plain dicts serialize with the model's schema
+	fields = {name: field.annotation for name, field in model.model_fields.items()}
+	return TypedDict(f"{model.__name__}Row", fields)  # type: ignore[operator]
+
+
+@lru_cache(maxsize=None)
+def _defaults(model: Type[BaseModel]) -> Dict[str, Any]:
+	return {
+		name: field.get_default(call_default_factory=True)
+		for name, field in model.model_fields.items()
+		if not field.is_required()
+	}
+
+
+@lru_cache(maxsize=None)
+def _field_names(model: Type[BaseModel]) -> Tuple[str, ...]:
+	return tuple(model.model_fields)
+
+
+def with_defaults(model: Type[BaseModel], row: Mapping[str, Any]) -> Mapping[str, Any]:
+	"""``row`` with ``model``'s defaults for missing keys.
+
+	A TypedDict serializer leaves absent keys out, while the model would output
+	their defaults (e.g. ``null``); filling them keeps both paths' JSON identical.
+	The serializer also writes keys in the dict's order, so a filled row is
+	rebuilt in the model's field order; complete rows are passed through and
+	should already be in that order (the queries select columns that way).
+	"""
+	defaults = _defaults(model)
+	if defaults.keys() <= row.keys():
+		return row
+	return {
+		name: row[name] if name in row else defaults[name]
+		for name in _field_names(model)
+		if name in row or name in defaults
+	}
+
+
+@lru_cache(maxsize=None)
+def row_adapter(model: Type[BaseModel], many: bool = False) -> TypeAdapter:
+	"""TypeAdapter serializing dicts (or lists of dicts) shaped like ``model``.
+
+	Serialization runs entirely in pydantic-core without creating or validating
+	model instances; keys that are not fields of ``model`` are dropped. Rows
+	must carry every field; pass them through ``with_defaults`` (``dump_row``
+	and ``dump_rows`` do) when optional ones may be missing.
+	"""
+	row = _row_type(model)
+	return TypeAdapter(List[row] if many else row)  # type: ignore[valid-type]
+
+
+def dump_row(model: Type[BaseModel], row: Mapping[str, Any]) -> bytes:
+	return row_adapter(model).dump_json(with_defaults(model, row))
+
+
+def dump_rows(model: Type[BaseModel], rows: Iterable[Mapping[str, Any]]) -> bytes:
+	return row_adapter(model, many=True).dump_json([with_defaults(model, row) for row in rows])
+
+
+def json_response(body: bytes, headers: Optional[Mapping[str, str]] = None, status_code: int = 200) -> Response:
+	return RawJSONResponse(content=body, status_code=status_code, headers=dict(headers) if headers else None)
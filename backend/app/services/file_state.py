@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional, Tuple
+
+
+Fingerprint = Tuple[str, int, int]
+
+
+def fingerprint(path: Path) -> Optional[Fingerprint]:
+	"""Cheap change detector for ``path``: (path, mtime_ns, size), or None if missing."""
+	try:
+		st = path.stat()
+	except FileNotFoundError:
+		return None
+	return (str(path), st.st_mtime_ns, st.st_size)
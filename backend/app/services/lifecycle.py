@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, List
+
+
+DrainHook = Callable[[], Awaitable[None]]
+
+
+class Lifecycle:
+	"""Process-wide shutdown state.
+
+	``draining`` turns on as soon as the server is asked to stop, before it waits
+	for in-flight requests; ``hooks`` run at that moment so long-lived responses
+	(SSE, WebSockets) can end instead of holding the shutdown open.
+	"""
+	draining = False
+	hooks: List[DrainHook] = []
+
+
+def on_drain(hook: DrainHook) -> DrainHook:
+	Lifecycle.hooks.append(hook)
+	return hook
+
+
+async def _run_hooks() -> None:
+	await asyncio.gather(*(hook() for hook in list(Lifecycle.hooks)), return_exceptions=True)
+
+
+def start_draining() -> "asyncio.Future[None]":
+	"""Mark the process as draining and run the drain hooks; call from the event loop."""
+	Lifecycle.draining = True
+	return asyncio.ensure_future(_run_hooks())
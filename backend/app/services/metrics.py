@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+logger = logging.getLogger(__name__)
+
+Labels = Tuple[str, ...]
+
+# Prometheus client defaults, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+	return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+	parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+	if extra:
+		parts.append(extra)
+	return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+	if value == float("inf"):
+		return "+Inf"
+	return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric(ABC):
+	kind = ""
+
+	def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+		self.name = name
+		self.help = help
+		self.labelnames = tuple(labelnames)
+		self._lock = threading.Lock()
+
+	@abstractmethod
+	def samples(self) -> Iterator[str]:
+		...
+
+	def render(self) -> List[str]:
+		return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}", *self.samples()]
+
+
+class Counter(Metric):
+	kind = "counter"
+
+	def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+		super().__init__(name, help, labelnames)
+		self._values: Dict[Labels, float] = {}
+
+	def inc(self, *labels: str, amount: float = 1.0) -> None:
+		with self._lock:
+			self._values[labels] = self._values.get(labels, 0.0) + amount
+
+	def samples(self) -> Iterator[str]:
+		with self._lock:
+			items = list(self._values.items())
+		for labels, value in items:
+			yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Gauge(Counter):
+	kind = "gauge"
+
+	def dec(self, *labels: str, amount: float = 1.0) -> None:
+		self.inc(*labels, amount=-amount)
+
+
+class CallbackGauge(Metric):
+	"""A gauge whose values are read from ``collect()`` at scrape time."""
+
+	kind = "gauge"
+
+	def __init__(self, name: str, help: str, labelnames: Sequence[str], collect: Callable[[], Dict[Labels, float]]) -> None:
+		super().__init__(name, help, labelnames)
+		self.collect = collect
+
+	def samples(self) -> Iterator[str]:
+		for labels, value in self.collect().items():
+			yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Histogram(Metric):
+	kind = "histogram"
+
+	def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+		super().__init__(name, help, labelnames)
+		self.buckets = tuple(sorted(buckets))
+		# labels -> [per-bucket counts (non-cumulative, last is +Inf), sum]
+		self._values: Dict[Labels, Tuple[List[int], List[float]]] = {}
+
+	def observe(self, value: float, *labels: str) -> None:
+		index = bisect_left(self.buckets, value)
+		with self._lock:
+			entry = self._values.get(labels)
+			if entry is None:
+				entry = self._values[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+			entry[0][index] += 1
+			entry[1][0] += value
+
+	@contextmanager
+	def time(self, *labels: str) -> Iterator[None]:
+		start = time.perf_counter()
+		try:
+			yield
+		finally:
+			self.observe(time.perf_counter() - start, *labels)
+
+	def samples(self) -> Iterator[str]:
+		with self._lock:
+			items = [(labels, list(counts), total[0]) for labels, (counts, total) in self._values.items()]
+		for labels, counts, total in items:
+			cumulative = 0
+			for bound, count in zip((*self.buckets, float("inf")), counts):
+				cumulative += count
+				le = f'le="{_format_value(bound)}"'
+				yield f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}"
+			yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}"
+			yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}"
+
+
+class Registry:
+	def __init__(self) -> None:
+		self.metrics: List[Metric] = []
+
+	def register(self, metric: Metric) -> Any:
+		self.metrics.append(metric)
+		return metric
+
+	def render(self) -> str:
+		lines: List[str] = []
+		for metric in self.metrics:
+			lines.extend(metric.render())
+		return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.register(Counter(
+	"http_requests_total", "HTTP requests by route template and status.", ("method", "route", "status"),
+))
+HTTP_LATENCY = REGISTRY.register(Histogram(
+	"http_request_duration_seconds", "Time from request start to the last response byte.", ("method", "route"),
+))
+HTTP_IN_FLIGHT = REGISTRY.register(Gauge(
+	"http_requests_in_flight", "Requests currently being handled.", ("method",),
+))
+DB_QUERY_LATENCY = REGISTRY.register(Histogram(
+	"db_query_duration_seconds", "Statement execution time by engine and statement kind.", ("engine", "statement"),
+))
+DB_SLOW_QUERIES = REGISTRY.register(Counter(
+	"db_slow_queries_total", "Statements slower than METRICS_SLOW_QUERY_MS.", ("engine", "statement"),
+))
+UPSTREAM_LATENCY = REGISTRY.register(Histogram(
+	"upstream_request_duration_seconds", "Outbound HTTP time to response headers.", ("service", "status"),
+))
+RESUME_PARSE_LATENCY = REGISTRY.register(Histogram(
+	"resume_parse_duration_seconds", "pdfminer extraction plus section parsing of the resume PDF.",
+	buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+))
+
+
+class MetricsMiddleware:
+	"""Pure ASGI middleware recording request counts, latency and in-flight requests.
+
+	Requests are labelled with the matched route's path template (e.g.
+	``/api/blog/{slug}``) rather than the raw path, so label cardinality stays
+	bounded. Latency covers the whole response, including streamed bodies.
+	"""
+
+	def __init__(self, app: ASGIApp) -> None:
+		self.app = app
+
+	async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+		if scope["type"] != "http":
+			await self.app(scope, receive, send)
+			return
+		method = scope["method"]
+		start = time.perf_counter()
+		status = "500"
+
+		async def send_wrapper(message: Message) -> None:
+			nonlocal status
+			if message["type"] == "http.response.start":
+				status = str(message["status"])
+			await send(message)
+
+		HTTP_IN_FLIGHT.inc(method)
+		try:
+			await self.app(scope, receive, send_wrapper)
+		finally:
+			HTTP_IN_FLIGHT.dec(method)
+			# Routing misses have no route object
+			template = getattr(scope.get("route"), "path_format", None) or "unmatched"
+			HTTP_LATENCY.observe(time.perf_counter() - start, method, template)
+			HTTP_REQUESTS.inc(method, template, status)
+
+
+# --- SQLAlchemy -------------------------------------------------------------
+
+_ENGINES: Dict[str, Any] = {}
+
+
+def _slow_query_seconds() -> float:
+	return float(os.getenv("METRICS_SLOW_QUERY_MS", "200")) / 1000.0
+
+
+def instrument_engine(engine: Any, name: str) -> None:
+	"""Time every statement on ``engine`` and expose its pool in /api/metrics.
+
+	Accepts a sync Engine or an AsyncEngine (its ``sync_engine`` is hooked).
+	Statements slower than METRICS_SLOW_QUERY_MS are counted and logged.
+	"""
+	from sqlalchemy import event
+
+	sync_engine = getattr(engine, "sync_engine", engine)
+	_ENGINES[name] = sync_engine
+	threshold = _slow_query_seconds()
+
+	@event.listens_for(sync_engine, "before_cursor_execute")
+	def before(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
+		conn.info.setdefault("metrics_start", []).append(time.perf_counter())
+
+	@event.listens_for(sync_engine, "after_cursor_execute")
+	def after(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
+		stack = conn.info.get("metrics_start")
+		if not stack:
+			return
+		elapsed = time.perf_counter() - stack.pop()
+		kind = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "OTHER"
+		DB_QUERY_LATENCY.observe(elapsed, name, kind)
+		if elapsed >= threshold:
+			DB_SLOW_QUERIES.inc(name, kind)
+			logger.warning("slow query on %s (%.0f ms): %s", name, elapsed * 1000, " ".join(statement.split())[:500])
+
+	@event.listens_for(sync_engine, "handle_error")
+	def failed(context):  # type: ignore[no-untyped-def]
+		# Drop the start time of a statement that raised so the stack stays aligned
+		conn = context.connection
+		stack = conn.info.get("metrics_start") if conn is not None else None
+		if stack:
+			stack.pop()
+
+
+def _pool_stats() -> Dict[Labels, float]:
+	values: Dict[Labels, float] = {}
+	for name, engine in list(_ENGINES.items()):
+		pool = engine.pool
+		for stat in ("size", "checkedin", "checkedout", "overflow"):
+			method = getattr(pool, stat, None)
+			if callable(method):
+				values[(name, stat)] = float(method())
+	return values
+
+
+REGISTRY.register(CallbackGauge(
+	"db_pool_connections", "Connection pool state (size, checkedin, checkedout, overflow) per engine.",
+	("engine", "state"), _pool_stats,
+))
+
+
+# --- httpx ------------------------------------------------------------------
+
+def httpx_event_hooks(service: str) -> Dict[str, List[Callable[[Any], Any]]]:
+	"""``event_hooks`` for an ``httpx.AsyncClient`` that time each call to ``service``."""
+
+	async def on_request(request: Any) -> None:
+		request.extensions["metrics_start"] = time.perf_counter()
+
+	async def on_response(response: Any) -> None:
+		start: Optional[float] = response.request.extensions.get("metrics_start")
+		if start is not None:
+			UPSTREAM_LATENCY.observe(time.perf_counter() - start, service, str(response.status_code))
+
+	return {"request": [on_request], "response": [on_response]}
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import json
+import zlib
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Iterator, List
+
+
+# Cap on decompressed output per step so a small gzip body can't inflate unbounded in memory
+_MAX_INFLATE = 1 << 20
+
+
+async def iter_ndjson(chunks: AsyncIterable[bytes], compressed: bool = False) -> AsyncIterator[Any]:
+	"""Decode newline-delimited JSON from a byte stream, one object at a time.
+
+	Only the current partial line is buffered, so memory stays bounded by the
+	largest single record rather than the size of the stream. ``compressed``
+	accepts gzip or zlib framing, including several gzip members back to back
+	(e.g. concatenated exports); corrupt input raises ``zlib.error`` and a
+	truncated member ``EOFError``. Blank lines are skipped.
+	"""
+	inflater = zlib.decompressobj(wbits=47) if compressed else None
+
+	def inflate(data: bytes) -> Iterator[bytes]:
+		nonlocal inflater
+		if inflater is None:
+			yield data
+			return
+		while data:
+			yield inflater.decompress(data, _MAX_INFLATE)
+			data = inflater.unconsumed_tail
+			if not data and inflater.eof and inflater.unused_data:
+				# End of one member; whatever follows starts the next
+				data = inflater.unused_data
+				inflater = zlib.decompressobj(wbits=47)
+
+	pending: List[bytes] = []
+	async for chunk in chunks:
+		for piece in inflate(chunk):
+			if b"\n" not in piece:
+				pending.append(piece)
+				continue
+			head, *lines, tail = piece.split(b"\n")
+			pending.append(head)
+			for line in (b"".join(pending), *lines):
+				if line.strip():
+					yield json.loads(line)
+			pending = [tail]
+	if inflater is not None:
+		pending.append(inflater.flush())
+		if not inflater.eof:
+			raise EOFError("compressed stream ended before the end of its last member")
+	for line in b"".join(pending).split(b"\n"):
+		if line.strip():
+			yield json.loads(line)
+
+
+async def encode_ndjson(batches: AsyncIterable[Iterable[Any]], compressed: bool = False) -> AsyncIterator[bytes]:
+	"""Encode batches of JSON-serializable objects as NDJSON, one chunk per batch.
+
+	With ``compressed`` the output is a single gzip member written incrementally,
+	so only one batch is ever held in memory.
+	"""
+	deflater = zlib.compressobj(wbits=31) if compressed else None
+	async for batch in batches:
+		chunk = b"".join(json.dumps(obj, ensure_ascii=False).encode() + b"\n" for obj in batch)
+		if deflater is not None:
+			chunk = deflater.compress(chunk)
+		if chunk:
+			yield chunk
+	if deflater is not None:
+		yield deflater.flush()
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from io import StringIO
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from pdfminer.converter import TextConverter
+from pdfminer.layout import LAParams
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdftypes import resolve1
+
+from .resume_parser import ParsedResume, ResumeSectionParser
+
+
+def count_pages(pdf_path: Path) -> int:
+	with open(pdf_path, "rb") as f:
+		document = PDFDocument(PDFParser(f))
+		pages = resolve1(document.catalog.get("Pages"))
+		count = resolve1(pages.get("Count")) if isinstance(pages, dict) else None
+		if isinstance(count, int):
+			return count
+		# Malformed page tree: fall back to walking it
+		return sum(1 for _ in PDFPage.create_pages(document))
+
+
+def _extract_pages(pdf_path: str, first: int, last: int, laparams: Optional[LAParams]) -> List[str]:
+	# Runs in a worker process; returns one string per page so callers can stream them in order.
+	# The file is opened and its page tree walked once per run, not once per page; each page's
+	# text is what extract_text(page_numbers=[n]) returns for it
+	texts: List[str] = []
+	out = StringIO()
+	with open(pdf_path, "rb") as f:
+		document = PDFDocument(PDFParser(f))
+		resources = PDFResourceManager()
+		converter = TextConverter(resources, out, laparams=laparams or LAParams())
+		interpreter = PDFPageInterpreter(resources, converter)
+		for page in islice(PDFPage.create_pages(document), first, last):
+			interpreter.process_page(page)
+			texts.append(out.getvalue())
+			out.seek(0)
+			out.truncate()
+		converter.close()
+	return texts
+
+
+class PdfExtractor:
+	"""Page-parallel pdfminer text extraction on a process pool.
+
+	Pages are split into runs of ``pages_per_task`` and extracted in worker
+	processes; results are yielded page by page in document order as soon as
+	each run finishes, so parsing can start before the whole PDF is done.
+	Use as a context manager to own the pool's lifetime.
+	"""
+
+	def __init__(
+		self,
+		max_workers: Optional[int] = None,
+		laparams: Optional[LAParams] = None,
+		pages_per_task: int = 2,
+	) -> None:
+		self.max_workers = max_workers or os.cpu_count() or 1
+		self.laparams = laparams
+		self.pages_per_task = max(1, pages_per_task)
+		self._executor: Optional[ProcessPoolExecutor] = None
+
+	def __enter__(self) -> "PdfExtractor":
+		self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+		return self
+
+	def __exit__(self, *exc: object) -> None:
+		if self._executor is not None:
+			self._executor.shutdown(cancel_futures=True)
+			self._executor = None
+
+	def _submit(self, pdf_path: Path) -> List["Future[List[str]]"]:
+		if self._executor is None:
+			raise RuntimeError("PdfExtractor must be used as a context manager")
+		pages = count_pages(pdf_path)
+		return [
+			self._executor.submit(_extract_pages, str(pdf_path), first, min(first + self.pages_per_task, pages), self.laparams)
+			for first in range(0, pages, self.pages_per_task)
+		]
+
+	@staticmethod
+	def _drain(futures: Sequence["Future[List[str]]"]) -> Iterator[str]:
+		for future in futures:
+			yield from future.result()
+
+	def iter_pages(self, pdf_path: Path) -> Iterator[str]:
+		"""Yield the text of each page of ``pdf_path`` in order."""
+		return self._drain(self._submit(pdf_path))
+
+	def parse(self, pdf_path: Path) -> ParsedResume:
+		parser = ResumeSectionParser()
+		for page in self.iter_pages(pdf_path):
+			parser.feed(page)
+		return parser.result()
+
+	def parse_many(self, pdf_paths: Iterable[Path]) -> Iterator[Tuple[Path, ParsedResume]]:
+		"""Parse a batch of PDFs, yielding results in input order.
+
+		Every document's pages are queued up front, so workers stay busy across
+		document boundaries while earlier documents are being parsed.
+		"""
+		queued = [(path, self._submit(path)) for path in pdf_paths]
+		for path, futures in queued:
+			parser = ResumeSectionParser()
+			for page in self._drain(futures):
+				parser.feed(page)
+			yield path, parser.result()
+
+
+def laparams_from_env() -> Optional[LAParams]:
+	"""LAParams overrides from PDF_LAPARAMS, e.g. ``line_margin=0.3,boxes_flow=none``."""
+	spec = os.getenv("PDF_LAPARAMS")
+	if not spec:
+		return None
+	kwargs = {}
+	for item in spec.split(","):
+		name, _, value = item.partition("=")
+		name, value = name.strip(), value.strip()
+		if value.lower() == "none":
+			kwargs[name] = None
+		elif value.lower() in {"true", "false"}:
+			kwargs[name] = value.lower() == "true"
+		else:
+			kwargs[name] = float(value)
+	return LAParams(**kwargs)
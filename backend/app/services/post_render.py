@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+import html
+import math
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Sequence
+
+from fastapi.concurrency import run_in_threadpool
+
+
+# Average adult silent reading speed, words per minute
+READING_WPM = 230
+
+FENCE_RE = re.compile(r"```[^\n]*\n?(.*?)(?:\n?```|\Z)", re.DOTALL)
+# The editor's "Insert image" button emits <img src=... alt=... ...>; every other tag is escaped
+IMG_TAG_RE = re.compile(r"<img\b([^<>]*?)/?>", re.IGNORECASE)
+ATTR_RE = re.compile(r"""([a-zA-Z-]+)\s*=\s*(?:"([^"]*)"|'([^']*)')""")
+SAFE_SRC_RE = re.compile(r"^(https?://|/(?!/)|data:image/(png|jpeg|gif|webp);base64,)", re.IGNORECASE)
+CODE_RE = re.compile(r"`([^`\n]+)`")
+BOLD_RE = re.compile(r"\*\*(?=\S)(.+?)(?<=\S)\*\*", re.DOTALL)
+# Underscores inside words (snake_case) are not emphasis
+ITALIC_RE = re.compile(r"(?<![\w_])_(?=\S)(.+?)(?<=\S)_(?![\w_])", re.DOTALL)
+WORD_RE = re.compile(r"\w+(?:['’-]\w+)*")
+
+
+@dataclass
+class RenderedPost:
+	html: str
+	excerpt: str
+	word_count: int
+	reading_minutes: int
+
+
+def _img_tag(attrs: str) -> str:
+	# Attribute values arrive HTML-encoded; decode so they are escaped exactly once on output
+	values = {name.lower(): html.unescape(double or single) for name, double, single in ATTR_RE.findall(attrs)}
+	src = values.get("src", "").strip()
+	if not SAFE_SRC_RE.match(src):
+		return ""
+	alt = values.get("alt", "")
+	return f'<img src="{html.escape(src)}" alt="{html.escape(alt)}" loading="lazy" style="max-width:100%;height:auto;" />'
+
+
+def _render_inline(text: str) -> str:
+	"""Escape ``text`` and apply `code`, **bold** and _italic_; allowed images pass through sanitized."""
+	out: List[str] = []
+	position = 0
+	for match in IMG_TAG_RE.finditer(text):
+		out.append(_render_emphasis(text[position:match.start()]))
+		out.append(_img_tag(match.group(1)))
+		position = match.end()
+	out.append(_render_emphasis(text[position:]))
+	return "".join(out)
+
+
+def _render_emphasis(text: str) -> str:
+	# Code spans first, so markup inside them stays literal
+	parts = CODE_RE.split(text)
+	for i, part in enumerate(parts):
+		if i % 2:
+			parts[i] = f"<code>{html.escape(part)}</code>"
+		else:
+			escaped = html.escape(part)
+			escaped = BOLD_RE.sub(r"<strong>\1</strong>", escaped)
+			parts[i] = ITALIC_RE.sub(r"<em>\1</em>", escaped)
+	return "".join(parts)
+
+
+def _paragraphs(text: str) -> List[str]:
+	blocks = []
+	for block in re.split(r"\n\s*\n", text.strip("\n")):
+		# Lines left empty by a dropped tag are skipped rather than rendered as stray breaks
+		lines = [line for line in _render_inline(block.strip("\n")).split("\n") if line.strip()]
+		if lines:
+			blocks.append("<p>" + "<br />\n".join(lines) + "</p>")
+	return blocks
+
+
+def _plain_text(content: str) -> str:
+	text = IMG_TAG_RE.sub(" ", content)
+	text = re.sub(r"```[^\n]*", " ", text)
+	text = re.sub(r"\*\*|`|(?<![\w_])_|_(?![\w_])", "", text)
+	text = re.sub(r"</?[a-zA-Z][^<>]*>", " ", text)
+	return " ".join(text.split())
+
+
+def _excerpt(text: str, limit: int) -> str:
+	if len(text) <= limit:
+		return text
+	cut = text[:limit]
+	if " " in cut:
+		cut = cut.rsplit(" ", 1)[0]
+	return cut.rstrip(" ,;:.-") + "…"
+
+
+def render_post(content: str, excerpt_chars: int = 280) -> RenderedPost:
+	"""Render editor markup to sanitized HTML plus excerpt and reading stats.
+
+	Supports what the post editor's toolbar produces: ```fenced``` code blocks,
+	`code`, **bold**, _italic_ and ``<img>`` tags (http(s), site-relative or
+	raster data: sources only). All other text, including any other HTML, is
+	escaped. Blank lines separate paragraphs; single newlines become ``<br />``.
+	"""
+	blocks: List[str] = []
+	position = 0
+	for match in FENCE_RE.finditer(content):
+		blocks.extend(_paragraphs(content[position:match.start()]))
+		blocks.append(f"<pre><code>{html.escape(match.group(1))}</code></pre>")
+		position = match.end()
+	blocks.extend(_paragraphs(content[position:]))
+
+	text = _plain_text(content)
+	words = len(WORD_RE.findall(text))
+	return RenderedPost(
+		html="\n".join(blocks),
+		excerpt=_excerpt(text, excerpt_chars),
+		word_count=words,
+		reading_minutes=max(1, math.ceil(words / READING_WPM)) if words else 0,
+	)
+
+
+def _render_many(contents: Sequence[str], excerpt_chars: int) -> List[Dict[str, object]]:
+	# Runs in a worker process; plain dicts pickle cheaply and drop straight into row values
+	return [asdict(render_post(content, excerpt_chars)) for content in contents]
+
+
+class RenderPool:
+	"""Renders posts off the event loop.
+
+	Content shorter than ``inline_chars`` is rendered in the threadpool, where
+	the pickling round-trip would cost more than the render. Longer posts and
+	batches go to a process pool of ``max_workers``, created on first use so
+	processes that never render a large post never fork.
+	"""
+
+	def __init__(self, max_workers: int = 2, inline_chars: int = 20_000, excerpt_chars: int = 280) -> None:
+		self.max_workers = max_workers
+		self.inline_chars = inline_chars
+		self.excerpt_chars = excerpt_chars
+		self._executor: Optional[ProcessPoolExecutor] = None
+
+	def _get_executor(self) -> ProcessPoolExecutor:
+		if self._executor is None:
+			self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+		return self._executor
+
+	async def render(self, content: str) -> Dict[str, object]:
+		return (await self.render_many([content]))[0]
+
+	async def render_many(self, contents: Sequence[str], chunk_size: int = 50) -> List[Dict[str, object]]:
+		"""Row values (html, excerpt, word_count, reading_minutes) for each content, in order."""
+		if sum(len(content) for content in contents) < self.inline_chars:
+			return await run_in_threadpool(_render_many, contents, self.excerpt_chars)
+		loop = asyncio.get_running_loop()
+		executor = self._get_executor()
+		chunks = await asyncio.gather(*(
+			loop.run_in_executor(executor, _render_many, contents[start:start + chunk_size], self.excerpt_chars)
+			for start in range(0, len(contents), chunk_size)
+		))
+		return [values for chunk in chunks for values in chunk]
+
+	def render_many_sync(self, contents: Sequence[str], chunk_size: int = 50) -> List[Dict[str, object]]:
+		"""``render_many`` for scripts without an event loop (e.g. the backfill command)."""
+		if sum(len(content) for content in contents) < self.inline_chars:
+			return _render_many(contents, self.excerpt_chars)
+		executor = self._get_executor()
+		futures = [
+			executor.submit(_render_many, contents[start:start + chunk_size], self.excerpt_chars)
+			for start in range(0, len(contents), chunk_size)
+		]
+		return [values for future in futures for values in future.result()]
+
+	def shutdown(self) -> None:
+		if self._executor is not None:
+			self._executor.shutdown(cancel_futures=True)
+			self._executor = None
+
+
+def render_pool_from_env() -> RenderPool:
+	return RenderPool(
+		max_workers=int(os.getenv("BLOG_RENDER_WORKERS", "2")),
+		inline_chars=int(os.getenv("BLOG_RENDER_INLINE_CHARS", "20000")),
+		excerpt_chars=int(os.getenv("BLOG_EXCERPT_CHARS", "280")),
+	)
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+from pydantic import TypeAdapter
+
+from ..models import Project
+from .cache import TTLCache
+from .file_state import Fingerprint, fingerprint
+
+
+logger = logging.getLogger(__name__)
+
+_PROJECT_LIST = TypeAdapter(List[Project])
+
+
+def load_projects(path: Path) -> List[Project]:
+	"""Read and validate a project list from a ``.json`` or ``.yaml``/``.yml`` file."""
+	raw = path.read_text(encoding="utf-8")
+	if path.suffix.lower() in {".yaml", ".yml"}:
+		try:
+			import yaml  # Optional dependency, only needed for YAML catalogs
+		except ImportError as exc:
+			raise ValueError(f"{path}: YAML project catalogs need PyYAML (pip install PyYAML), or use a .json file") from exc
+
+		try:
+			data = yaml.safe_load(raw)
+		except yaml.YAMLError as exc:
+			raise ValueError(f"{path}: {exc}") from exc
+	else:
+		data = json.loads(raw)
+	projects = _PROJECT_LIST.validate_python(data or [])
+	ids = [p.id for p in projects]
+	if len(ids) != len(set(ids)):
+		raise ValueError(f"{path}: duplicate project ids")
+	return projects
+
+
+class ProjectCatalog:
+	"""An immutable snapshot of the projects with lookup indexes and serialized bodies.
+
+	``by_id`` maps id -> pre-serialized JSON body; ``by_tag`` is an inverted
+	index tag -> ids. List responses are serialized once per distinct query
+	and kept in ``responses``, so repeated reads are a dict lookup.
+	"""
+
+	def __init__(self, projects: Iterable[Project], cache_size: int = 256) -> None:
+		self.projects: List[Project] = list(projects)
+		# Catalog position of each id, to return query results in file order
+		self.position: Dict[int, int] = {p.id: i for i, p in enumerate(self.projects)}
+		self.by_id: Dict[int, bytes] = {p.id: p.model_dump_json().encode() for p in self.projects}
+		by_tag: Dict[str, set] = {}
+		for project in self.projects:
+			for tag in project.tags:
+				by_tag.setdefault(tag, set()).add(project.id)
+		self.by_tag: Dict[str, FrozenSet[int]] = {tag: frozenset(ids) for tag, ids in by_tag.items()}
+		self.responses: TTLCache[bytes] = TTLCache(maxsize=cache_size, ttl=float("inf"))
+		self.all_body = self._serialize(self.position)
+
+	def _serialize(self, ids: Iterable[int]) -> bytes:
+		# Splice the per-project bodies instead of re-serializing the models
+		ordered = sorted(ids, key=self.position.__getitem__)
+		return b"[" + b",".join(self.by_id[i] for i in ordered) + b"]"
+
+	def query(self, tags: Iterable[str], match_all: bool = True) -> bytes:
+		"""JSON list of projects carrying all (or, with ``match_all=False``, any) of ``tags``."""
+		wanted = frozenset(tags)
+		if not wanted:
+			return self.all_body
+		key = (match_all, wanted)
+		body = self.responses.get(key)
+		if body is None:
+			sets = [self.by_tag.get(tag, frozenset()) for tag in wanted]
+			ids = frozenset.intersection(*sets) if match_all else frozenset().union(*sets)
+			body = self._serialize(ids)
+			self.responses.set(key, body)
+		return body
+
+
+class CatalogFile:
+	"""A ProjectCatalog kept in sync with a file on disk.
+
+	The file is re-stat'ed at most every ``check_interval`` seconds; when its
+	mtime or size changes it is reloaded and the catalog swapped atomically.
+	A file that fails to load leaves the previous catalog in place.
+	"""
+
+	def __init__(self, path: Path, check_interval: float = 1.0) -> None:
+		self.path = path
+		self.check_interval = check_interval
+		self.catalog = ProjectCatalog([])
+		self.fingerprint: Optional[Fingerprint] = None
+		self.error: Optional[str] = None
+		self._checked_at = float("-inf")
+		self._lock = threading.Lock()
+
+	def current(self) -> ProjectCatalog:
+		now = time.monotonic()
+		if now - self._checked_at >= self.check_interval:
+			self.reload()
+		return self.catalog
+
+	def reload(self) -> None:
+		with self._lock:
+			self._checked_at = time.monotonic()
+			current = fingerprint(self.path)
+			if current == self.fingerprint:
+				return
+			if current is None:
+				self.catalog, self.fingerprint, self.error = ProjectCatalog([]), None, None
+				return
+			try:
+				projects = load_projects(self.path)
+			except (OSError, ValueError) as exc:
+				# Likely a half-written edit (or a missing YAML parser); keep serving the last good catalog
+				if str(exc) != self.error:
+					logger.warning("project catalog not loaded: %s", exc)
+				self.error = str(exc)
+				return
+			self.catalog, self.fingerprint, self.error = ProjectCatalog(projects), current, None
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Hashable, Tuple
+
+
+class TokenBuckets:
+	"""Per-key token buckets refilling at ``rate`` tokens/second up to ``burst``.
+
+	At most ``maxsize`` keys are tracked; the least recently seen key is
+	evicted first, which resets it to a full bucket. Not thread-safe: meant to
+	be used from the event loop.
+	"""
+
+	def __init__(self, rate: float, burst: float, maxsize: int = 10000) -> None:
+		self.rate = rate
+		self.burst = burst
+		self.maxsize = maxsize
+		self._buckets: "OrderedDict[Hashable, Tuple[float, float]]" = OrderedDict()
+
+	def take(self, key: Hashable, cost: float = 1.0) -> float:
+		"""Spend ``cost`` tokens for ``key``. Returns 0 if allowed, else seconds until it would be."""
+		now = time.monotonic()
+		tokens, stamp = self._buckets.pop(key, (self.burst, now))
+		tokens = min(self.burst, tokens + (now - stamp) * self.rate)
+		wait = 0.0
+		if tokens >= cost:
+			tokens -= cost
+		else:
+			wait = (cost - tokens) / self.rate if self.rate > 0 else float("inf")
+		self._buckets[key] = (tokens, now)
+		while len(self._buckets) > self.maxsize:
+			self._buckets.popitem(last=False)
+		return wait
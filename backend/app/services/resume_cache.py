@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from dataclasses import asdict
+from pathlib import Path
+from typing import Optional
+
+from .file_state import Fingerprint, fingerprint
+from .metrics import RESUME_PARSE_LATENCY
+from .resume_parser import extract_resume_text, parse_resume_text
+
+
+# Bump when parse_resume_text's output changes so stale results on disk are ignored
+CACHE_VERSION = 1
+
+class ParsedResumeCache:
+	"""Parsed resume held in memory and persisted to disk, keyed on the PDF.
+
+	The in-memory entry is valid while the file's path, mtime and size are
+	unchanged. When they change, the file's sha256 is checked against the disk
+	cache before re-running pdfminer, so touching or re-deploying an identical
+	PDF does not trigger a re-parse.
+	"""
+
+	def __init__(self, cache_dir: Path) -> None:
+		self.cache_dir = cache_dir
+		self.fingerprint: Optional[Fingerprint] = None
+		self.result: Optional[dict] = None
+		self._lock = threading.Lock()
+
+	def lookup(self, path: Path) -> Optional[dict]:
+		"""Return the cached result if it still matches ``path``, without any parsing."""
+		if self.fingerprint is not None and self.fingerprint == fingerprint(path):
+			return self.result
+		return None
+
+	def refresh(self, path: Path) -> dict:
+		"""Bring the cache up to date with ``path``, parsing only if needed. Blocking."""
+		with self._lock:
+			current = fingerprint(path)
+			if current is None:
+				raise FileNotFoundError(path)
+			if current == self.fingerprint and self.result is not None:
+				return self.result
+			data = path.read_bytes()
+			digest = hashlib.sha256(data).hexdigest()
+			disk_path = self.cache_dir / f"{digest}.v{CACHE_VERSION}.json"
+			result = self._load(disk_path)
+			if result is None:
+				with RESUME_PARSE_LATENCY.time():
+					parsed = parse_resume_text(extract_resume_text(path))
+				result = asdict(parsed)
+				self._store(disk_path, result)
+			self.fingerprint, self.result = current, result
+			return result
+
+	def _load(self, disk_path: Path) -> Optional[dict]:
+		try:
+			return json.loads(disk_path.read_text(encoding="utf-8"))
+		except (OSError, ValueError):
+			return None
+
+	def _store(self, disk_path: Path, result: dict) -> None:
+		try:
+			self.cache_dir.mkdir(parents=True, exist_ok=True)
+			fd, tmp = tempfile.mkstemp(dir=self.cache_dir, prefix=".tmp-")
+			with os.fdopen(fd, "w", encoding="utf-8") as f:
+				json.dump(result, f)
+			os.replace(tmp, disk_path)
+		except OSError:
+			# The disk copy only saves a re-parse after restart; memory still serves requests
+			pass
+
+
+class ResumeCaches:
+	default: Optional[ParsedResumeCache] = None
+
+
+def get_resume_cache() -> ParsedResumeCache:
+	if ResumeCaches.default is None:
+		backend_root = Path(__file__).resolve().parents[2]
+		cache_dir = Path(os.getenv("RESUME_CACHE_DIR") or (backend_root / ".cache" / "resume"))
+		ResumeCaches.default = ParsedResumeCache(cache_dir)
+	return ResumeCaches.default
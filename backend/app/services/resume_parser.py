@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import re
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Pattern, Sequence
 
-from pdfminer.high_level import extract_text
+if TYPE_CHECKING:
+	from pdfminer.layout import LAParams
 
 
 @dataclass
@@ -15,66 +17,162 @@ class ParsedResume:
 	experience_snippets: List[str]
 
 
-def extract_resume_text(pdf_path: Path) -> str:
-	return extract_text(str(pdf_path))
-
-
-def parse_resume_text(text: str) -> ParsedResume:
-	lines = [line.strip() for line in text.splitlines()]
-	lines = [ln for ln in lines if ln]
-
-	# Naive heuristic-based parsing
-	summary_lines: List[str] = []
-	skills: List[str] = []
-	education_lines: List[str] = []
-	experience_snippets: List[str] = []
-
-	section = None
-	for ln in lines:
-		upper_ln = ln.upper()
-		if any(h in upper_ln for h in ["SUMMARY", "PROFILE", "OBJECTIVE"]):
-			section = "summary"
-			continue
-		if any(h in upper_ln for h in ["SKILLS", "TECHNICAL SKILLS", "CORE SKILLS"]):
-			section = "skills"
-			continue
-		if any(h in upper_ln for h in ["EDUCATION"]):
-			section = "education"
-			continue
-		if any(h in upper_ln for h in ["EXPERIENCE", "WORK EXPERIENCE", "PROFESSIONAL EXPERIENCE"]):
-			section = "experience"
-			continue
-
-		if section == "summary":
-			summary_lines.append(ln)
-		elif section == "skills":
-			# Split by commas or bullets
-			for part in [p.strip("•- \t,;=") for p in ln.replace(";", ",").split(",")]:
-				if part:
-					skills.append(part)
-		elif section == "education":
-			education_lines.append(ln)
-		elif section == "experience":
-			# Keep short bullet-like lines
-			if len(ln) <= 200:
-				experience_snippets.append(ln)
-
-	summary = " ".join(summary_lines).strip() or None
-	education = " \n".join(education_lines).strip() or None
-	# De-duplicate skills, preserve order
-	seen = set()
-	unique_skills: List[str] = []
-	for s in skills:
-		key = s.lower()
-		if key not in seen:
-			seen.add(key)
-			unique_skills.append(s)
-
-	return ParsedResume(
-		summary=summary,
-		skills=unique_skills[:50],
-		education=education,
-		experience_snippets=experience_snippets[:50],
-	)
+def extract_resume_text(pdf_path: Path, laparams: Optional[LAParams] = None) -> str:
+	# pdfminer is imported on first use; it is only needed when a PDF is actually parsed
+	from pdfminer.high_level import extract_text
 
+	return extract_text(str(pdf_path), laparams=laparams)
 
+
+_SKILL_SEPARATORS = re.compile(r"[,;]")
+
+
+def _split_skills(line: str) -> Iterable[str]:
+	# Split by commas or semicolons, trimming bullets and stray punctuation
+	for part in _SKILL_SEPARATORS.split(line):
+		part = part.strip("•- \t,;=")
+		if part:
+			yield part
+
+
+@dataclass(frozen=True)
+class Section:
+	"""A resume section: header phrases plus how its body lines become items.
+
+	Without ``split`` each non-empty body line is one item; ``max_len`` drops
+	longer lines.
+	"""
+	name: str
+	headers: Sequence[str]
+	split: Optional[Callable[[str], Iterable[str]]] = None
+	max_len: Optional[int] = None
+
+
+@dataclass
+class SectionGrammar:
+	"""Resume section headers compiled once into a single matcher.
+
+	A line is a header for the first section (in declaration order) with any
+	header phrase appearing anywhere in it, compared after ``str.upper()``.
+	Every phrase goes into one regex alternation (without capture groups,
+	which would stop ``re`` from skipping ahead to candidate positions), and
+	the matched phrase maps to its section. Most lines contain no phrase and
+	are rejected by that one ``search``. When the first hit belongs to a later
+	section, the rest of the line is scanned with the alternation inside a
+	lookahead, which also finds phrases overlapping the hit, and the earliest
+	declared section wins.
+	"""
+	sections: Sequence[Section]
+	_matcher: Pattern[str] = field(init=False, repr=False)
+	_overlapping: Pattern[str] = field(init=False, repr=False)
+	_rank: Dict[str, int] = field(init=False, repr=False)
+	_by_name: Dict[str, Section] = field(init=False, repr=False)
+
+	def __post_init__(self) -> None:
+		rank: Dict[str, int] = {}
+		for index, section in enumerate(self.sections):
+			for header in section.headers:
+				rank.setdefault(header.upper(), index)
+		alternation = "|".join(map(re.escape, rank))
+		self._matcher = re.compile(alternation)
+		self._overlapping = re.compile(f"(?=({alternation}))")
+		self._rank = rank
+		self._by_name = {section.name: section for section in self.sections}
+
+	def section(self, name: str) -> Section:
+		return self._by_name[name]
+
+	def classify(self, upper_line: str) -> Optional[str]:
+		match = self._matcher.search(upper_line)
+		if match is None:
+			return None
+		best = self._rank[match.group()]
+		if best:
+			for later in self._overlapping.finditer(upper_line, match.start()):
+				best = min(best, self._rank[later.group(1)])
+				if not best:
+					break
+		return self.sections[best].name
+
+
+DEFAULT_GRAMMAR = SectionGrammar([
+	Section("summary", ["SUMMARY", "PROFILE", "OBJECTIVE"]),
+	Section("skills", ["SKILLS", "TECHNICAL SKILLS", "CORE SKILLS"], split=_split_skills),
+	Section("education", ["EDUCATION"]),
+	# Keep short bullet-like lines
+	Section("experience", ["EXPERIENCE", "WORK EXPERIENCE", "PROFESSIONAL EXPERIENCE"], max_len=200),
+])
+
+
+class ResumeSectionParser:
+	"""Streaming, single-pass resume section parser.
+
+	Text can be fed in arbitrary pieces (e.g. one PDF page at a time as pages
+	are extracted); a line split across pieces is joined before it is parsed.
+	Lines are handled in one pass: each is classified by the grammar's matcher
+	and, unless it is a header, becomes items of the current section.
+	"""
+
+	def __init__(self, grammar: SectionGrammar = DEFAULT_GRAMMAR) -> None:
+		self.grammar = grammar
+		self.section: Optional[str] = None
+		self.items: Dict[str, List[str]] = {section.name: [] for section in grammar.sections}
+		self._pending = ""
+
+	def feed(self, text: str) -> None:
+		text = self._pending + text
+		# Hold back a trailing piece that has no line terminator yet
+		tail = text.splitlines(keepends=True)[-1:]
+		if tail and tail[0].splitlines()[0] == tail[0]:
+			self._pending = tail[0]
+			text = text[: len(text) - len(tail[0])]
+		else:
+			self._pending = ""
+		self.feed_text(text)
+
+	def feed_text(self, text: str) -> None:
+		"""Parse a block of complete lines (the last terminator is optional)."""
+		grammar, items, classify = self.grammar, self.items, self.grammar.classify
+		section = grammar.section(self.section) if self.section else None
+		for line in text.splitlines():
+			line = line.strip()
+			if not line:
+				continue
+			header = classify(line.upper())
+			if header is not None:
+				self.section, section = header, grammar.section(header)
+				continue
+			if section is None or (section.max_len is not None and len(line) > section.max_len):
+				continue
+			if section.split is None:
+				items[section.name].append(line)
+			else:
+				items[section.name].extend(section.split(line))
+
+	def result(self) -> ParsedResume:
+		if self._pending:
+			self.feed_text(self._pending)
+			self._pending = ""
+		summary = " ".join(self.items.get("summary", ())).strip() or None
+		education = " \n".join(self.items.get("education", ())).strip() or None
+		# De-duplicate skills, preserve order
+		seen = set()
+		unique_skills: List[str] = []
+		for s in self.items.get("skills", ()):
+			key = s.lower()
+			if key not in seen:
+				seen.add(key)
+				unique_skills.append(s)
+
+		return ParsedResume(
+			summary=summary,
+			skills=unique_skills[:50],
+			education=education,
+			experience_snippets=self.items.get("experience", [])[:50],
+		)
+
+
+def parse_resume_text(text: str, grammar: SectionGrammar = DEFAULT_GRAMMAR) -> ParsedResume:
+	parser = ResumeSectionParser(grammar)
+	parser.feed_text(text)
+	return parser.result()
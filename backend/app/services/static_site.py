@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+from dataclasses import dataclass, field
+from email.utils import formatdate
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import FileResponse, Response
+
+from .blob_store import IMMUTABLE_CACHE_CONTROL
+
+try:
+	import brotli
+except ImportError:  # Optional; without it only gzip variants are built
+	brotli = None
+
+logger = logging.getLogger(__name__)
+
+# index.html and other unhashed files must be revalidated so deploys show up immediately
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# Media types worth compressing; images, fonts and PDFs are compressed already
+_COMPRESSIBLE_PREFIXES = ("text/", "application/javascript", "application/json", "application/xml", "image/svg+xml")
+# Below this size the encoding headers cost about as much as they save
+_MIN_COMPRESS_SIZE = 256
+# A variant is only kept if it is at least this much smaller than the original
+_MIN_SAVING = 0.1
+
+
+def _compressible(media_type: str) -> bool:
+	return media_type.startswith(_COMPRESSIBLE_PREFIXES) or media_type.endswith("+json")
+
+
+def _read_span(path: Path, start: int, length: int) -> bytes:
+	with open(path, "rb") as f:
+		f.seek(start)
+		return f.read(length)
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+	"""Parse a single ``bytes=`` range into an inclusive (start, end).
+
+	Returns None when the header should be ignored (other units, multiple
+	ranges, malformed), in which case the full body is served. Raises
+	ValueError when the range is well formed but not satisfiable.
+	"""
+	unit, _, spec = header.partition("=")
+	if unit.strip().lower() != "bytes" or "," in spec:
+		return None
+	first, sep, last = spec.strip().partition("-")
+	if not sep:
+		return None
+	if not first:
+		# Suffix range: the last N bytes
+		if not last.isdigit():
+			return None
+		if int(last) == 0 or size == 0:
+			raise ValueError(header)
+		return max(0, size - int(last)), size - 1
+	if not first.isdigit() or (last and not last.isdigit()):
+		return None
+	start = int(first)
+	if last and int(last) < start:
+		return None
+	if start >= size:
+		raise ValueError(header)
+	return start, min(int(last), size - 1) if last else size - 1
+
+
+def _if_range_ok(request: Request, etag: str, last_modified: str) -> bool:
+	# A stale If-Range means the client's partial copy is outdated; send the whole body
+	value = request.headers.get("if-range")
+	return value is None or value == etag or value == last_modified
+
+
+def _etag_matches(request: Request, etags: Tuple[str, ...]) -> bool:
+	value = request.headers.get("if-none-match")
+	if not value:
+		return False
+	if value.strip() == "*":
+		return True
+	candidates = {tag.strip().removeprefix("W/") for tag in value.split(",")}
+	return any(tag in candidates for tag in etags)
+
+
+async def file_response(
+	request: Request,
+	path: Path,
+	media_type: str,
+	headers: Optional[Mapping[str, str]] = None,
+	stat_result: Optional[os.stat_result] = None,
+	etag: Optional[str] = None,
+	body: Optional[bytes] = None,
+) -> Response:
+	"""Serve a file with ETag revalidation and single byte-range support.
+
+	``body`` serves the file from memory instead of disk. Without ``etag`` one
+	is derived from the file's mtime and size.
+	"""
+	st = stat_result or await run_in_threadpool(os.stat, path)
+	size = len(body) if body is not None else st.st_size
+	etag = etag or f'"{st.st_mtime_ns:x}-{size:x}"'
+	last_modified = formatdate(st.st_mtime, usegmt=True)
+	out = dict(headers or {})
+	out.update({"ETag": etag, "Last-Modified": last_modified, "Accept-Ranges": "bytes"})
+	if _etag_matches(request, (etag,)):
+		return Response(status_code=304, headers=out)
+
+	range_header = request.headers.get("range")
+	if range_header and _if_range_ok(request, etag, last_modified):
+		try:
+			span = parse_range(range_header, size)
+		except ValueError:
+			out["Content-Range"] = f"bytes */{size}"
+			return Response(status_code=416, headers=out)
+		if span is not None:
+			start, end = span
+			length = end - start + 1
+			chunk = body[start:end + 1] if body is not None else await run_in_threadpool(_read_span, path, start, length)
+			out["Content-Range"] = f"bytes {start}-{end}/{size}"
+			return Response(chunk, status_code=206, media_type=media_type, headers=out)
+
+	if body is not None:
+		return Response(body, media_type=media_type, headers=out)
+	return FileResponse(path, media_type=media_type, headers=out, stat_result=st)
+
+
+@dataclass
+class StaticAsset:
+	path: Path
+	media_type: str
+	stat: os.stat_result
+	digest: str
+	cache_control: str
+	# Identity bytes for files kept in memory; others are read from disk per request
+	body: Optional[bytes] = None
+	# Content-coding ("br", "gzip") -> precompressed body
+	encoded: Dict[str, bytes] = field(default_factory=dict)
+
+	def etag(self, coding: Optional[str] = None) -> str:
+		# Each representation needs its own strong validator
+		return f'"{self.digest}-{coding}"' if coding else f'"{self.digest}"'
+
+
+def negotiate(accept_encoding: str, available: Mapping[str, bytes]) -> Optional[str]:
+	"""Pick the best precompressed coding the client accepts, or None for identity."""
+	if not available or not accept_encoding:
+		return None
+	weights: Dict[str, float] = {}
+	for item in accept_encoding.split(","):
+		name, *params = item.strip().split(";")
+		q = 1.0
+		for param in params:
+			key, _, value = param.strip().partition("=")
+			if key.strip() == "q":
+				try:
+					q = float(value)
+				except ValueError:
+					q = 0.0
+		weights[name.strip().lower()] = q
+	best, best_q = None, 0.0
+	# Ties go to the first, i.e. smallest, coding
+	for coding in ("br", "gzip"):
+		if coding in available:
+			q = weights.get(coding, weights.get("*", 0.0))
+			if q > best_q:
+				best, best_q = coding, q
+	return best
+
+
+class StaticSite:
+	"""A built frontend (``frontend/dist``) indexed and precompressed once.
+
+	``build`` walks the directory, hashes every file for its ETag and keeps
+	gzip (and, with the ``brotli`` package installed, brotli) variants of the
+	compressible ones in memory. Content-hashed files under ``assets/`` are
+	served as immutable; everything else, including the in-memory
+	``index.html``, is revalidated with its ETag. Rebuilding the frontend
+	requires a restart to be picked up.
+	"""
+
+	def __init__(self, root: Path, index: str = "index.html") -> None:
+		self.root = root
+		self.index_name = index
+		self.assets: Dict[str, StaticAsset] = {}
+
+	@property
+	def index(self) -> Optional[StaticAsset]:
+		return self.assets.get(self.index_name)
+
+	def build(self) -> None:
+		if brotli is None:
+			logger.warning("brotli is not installed; serving %s with gzip variants only", self.root)
+		assets: Dict[str, StaticAsset] = {}
+		for path in sorted(self.root.rglob("*")):
+			if not path.is_file():
+				continue
+			rel = path.relative_to(self.root).as_posix()
+			assets[rel] = self._load(rel, path)
+		self.assets = assets
+
+	def _load(self, rel: str, path: Path) -> StaticAsset:
+		data = path.read_bytes()
+		media_type = mimetypes.guess_type(rel)[0] or "application/octet-stream"
+		immutable = rel.startswith("assets/")
+		asset = StaticAsset(
+			path=path,
+			media_type=media_type,
+			stat=path.stat(),
+			digest=hashlib.sha1(data).hexdigest(),
+			cache_control=IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL,
+		)
+		if _compressible(media_type) or rel == self.index_name:
+			asset.body = data
+			if len(data) >= _MIN_COMPRESS_SIZE:
+				variants = {"gzip": gzip.compress(data, compresslevel=9, mtime=0)}
+				if brotli is not None:
+					variants["br"] = brotli.compress(data, quality=11)
+				limit = len(data) * (1 - _MIN_SAVING)
+				asset.encoded = {coding: body for coding, body in variants.items() if len(body) <= limit}
+		return asset
+
+	def get(self, path: str) -> Optional[StaticAsset]:
+		return self.assets.get(path.lstrip("/"))
+
+	async def respond(self, request: Request, asset: StaticAsset) -> Response:
+		headers = {"Cache-Control": asset.cache_control}
+		if asset.encoded:
+			headers["Vary"] = "Accept-Encoding"
+		coding = negotiate(request.headers.get("accept-encoding", ""), asset.encoded)
+		if coding is None:
+			return await file_response(
+				request, asset.path, asset.media_type, headers,
+				stat_result=asset.stat, etag=asset.etag(), body=asset.body,
+			)
+		etag = asset.etag(coding)
+		headers["ETag"] = etag
+		if _etag_matches(request, (etag, asset.etag())):
+			return Response(status_code=304, headers=headers)
+		headers["Content-Encoding"] = coding
+		return Response(asset.encoded[coding], media_type=asset.media_type, headers=headers)
@@ -0,0 +1 @@
+"""Benchmarks for the portfolio backend. Run from ``backend/`` with ``python -m benchmarks.<name>``."""
@@ -0,0 +1,123 @@
+"""Per-request CPU cost of serializing blog list responses.
+
+Compares, for lists of 10/100/1000 post summaries built from row mappings:
+
+- ``legacy``: a validated BlogPostSummary per row, then FastAPI's
+  response_model validation, jsonable_encoder and JSONResponse (the path
+  list_posts used to take)
+- ``fast``: the row mappings serialized by a TypeAdapter over the model's
+  fields in one pydantic-core call (what list_posts does on a cache miss)
+- ``cached``: wrapping the already-serialized body (a cache hit)
+
+Bodies from all paths are checked to decode to the same JSON. Example:
+
+	cd backend
+	python -m benchmarks.blog_serialization --rounds 5
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.models import BlogPostSummary
+from app.services.fast_json import dump_rows, json_response
+
+
+def make_rows(count: int) -> List[Dict[str, Any]]:
+	start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+	return [
+		{
+			"slug": f"post-{i}",
+			"title": f"Post number {i}: notes on streaming pipelines",
+			"summary": "Kafka → Flink → Iceberg; checkpoints, backfills and the occasional surprise. " * 2,
+			"created_at": start + timedelta(hours=i),
+			"updated_at": start + timedelta(hours=i, minutes=5),
+			"excerpt": "Checkpoints, backfills and the occasional surprise on the way from Kafka to Iceberg.",
+			"word_count": 1200 + i,
+			"reading_minutes": 6,
+		}
+		for i in range(count)
+	]
+
+
+_FIELD = create_model_field(name="Response_list_posts", type_=List[BlogPostSummary], mode="serialization")
+
+
+def legacy(rows: List[Dict[str, Any]]) -> bytes:
+	posts = [
+		BlogPostSummary(
+			slug=row["slug"],
+			title=row["title"],
+			summary=row["summary"],
+			created_at=row["created_at"].isoformat() if row["created_at"] else "",
+			excerpt=row.get("excerpt"),
+			word_count=row.get("word_count"),
+			reading_minutes=row.get("reading_minutes"),
+		)
+		for row in rows
+	]
+	content = asyncio.run(serialize_response(field=_FIELD, response_content=posts))
+	return JSONResponse(content).body
+
+
+def fast(rows: List[Dict[str, Any]]) -> bytes:
+	body = dump_rows(BlogPostSummary, ({**row, "created_at": row["created_at"].isoformat() if row["created_at"] else ""} for row in rows))
+	return json_response(body).body
+
+
+def _cpu_per_call(fn: Callable[[], bytes], rounds: int) -> float:
+	# Repeat until each round takes long enough to time reliably, keep the best round
+	calls = 1
+	while True:
+		start = time.process_time()
+		for _ in range(calls):
+			fn()
+		elapsed = time.process_time() - start
+		if elapsed >= 0.2:
+			break
+		calls *= 2
+	best = elapsed / calls
+	for _ in range(rounds - 1):
+		start = time.process_time()
+		for _ in range(calls):
+			fn()
+		best = min(best, (time.process_time() - start) / calls)
+	return best
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+	parser.add_argument("--rounds", type=int, default=5)
+	args = parser.parse_args()
+
+	print(f"{'posts':>6}  {'legacy µs':>10}  {'fast µs':>9}  {'cached µs':>10}  {'speedup':>7}")
+	for size in args.sizes:
+		rows = make_rows(size)
+		body = fast(rows)
+		# Compare bytes, not parsed JSON, so key order has to match too
+		assert legacy(rows) == body, "fast path output differs"
+		# Rows not rendered yet lack the optional fields; both paths must still output them as null
+		for missing in (("excerpt", "word_count", "reading_minutes"), ("excerpt",)):
+			bare = [{key: value for key, value in row.items() if key not in missing} for row in rows]
+			assert legacy(bare) == fast(bare), f"fast path output differs for rows without {', '.join(missing)}"
+		# legacy wraps each call in asyncio.run; subtract that fixed overhead so only serialization is compared
+		loop_overhead = _cpu_per_call(lambda: asyncio.run(asyncio.sleep(0)) or b"", args.rounds)
+		t_legacy = max(_cpu_per_call(lambda: legacy(rows), args.rounds) - loop_overhead, 0.0)
+		t_fast = _cpu_per_call(lambda: fast(rows), args.rounds)
+		t_cached = _cpu_per_call(lambda: json_response(body).body, args.rounds)
+		print(
+			f"{size:>6}  {t_legacy * 1e6:>10.1f}  {t_fast * 1e6:>9.1f}  {t_cached * 1e6:>10.1f}  "
+			f"{t_legacy / t_fast if t_fast else float('inf'):>6.1f}x"
+		)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,406 @@
+"""Load test for the Portfolio API with latency percentiles and baseline checks.
+
+Drives ``create_app()`` either in process through httpx's ASGI transport
+(``--target asgi``, the default) or over TCP against a real uvicorn process
+started for the run (``--target uvicorn``). External dependencies are
+replaced with local stand-ins so results are reproducible:
+
+- blog: an in-memory SQLite table, or the Postgres in ``--database-url``
+  (its blog_posts table gets ``--posts`` rows prefixed ``bench-``)
+- GitHub: ``httpx.MockTransport`` serving ``--repos`` synthetic repos
+- resume: the bundled ``frontend/src/resume.pdf`` (or ``--resume-pdf``)
+- contact: a throwaway SQLite file with rate limiting relaxed
+- uploads: dummy AWS credentials (presigning never leaves the process)
+
+Each endpoint is hit ``--requests`` times at every ``--concurrency`` level.
+p50/p95/p99 latency and RPS are printed and written to ``--output``. With
+``--baseline``, the run fails (exit 1) when p95 grows or RPS drops by more
+than ``--threshold`` on any endpoint, or when any request fails. Example:
+
+	cd backend
+	python -m benchmarks.load --concurrency 1 32 --output bench.json
+	python -m benchmarks.load --concurrency 1 32 --baseline bench.json --threshold 0.25
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import httpx
+
+
+DEFAULT_PDF = Path(__file__).resolve().parents[2] / "frontend" / "src" / "resume.pdf"
+BENCH_USER = "bench-user"
+
+
+@dataclass
+class Scenario:
+	name: str
+	path: str
+	method: str = "GET"
+	json: Optional[Dict[str, Any]] = None
+	headers: Dict[str, str] = field(default_factory=dict)
+	ok: Sequence[int] = (200,)
+	postgres_only: bool = False
+
+
+SCENARIOS = [
+	Scenario("health", "/api/health"),
+	Scenario("projects", "/api/projects/?tag=React"),
+	Scenario("project", "/api/projects/1"),
+	Scenario("blog_list", "/api/blog/?limit=20"),
+	Scenario("blog_post", "/api/blog/bench-post-1"),
+	Scenario("blog_search", "/api/blog/search?q=pipeline", postgres_only=True),
+	Scenario("github_repos", f"/api/github/repos?username={BENCH_USER}"),
+	Scenario("github_all", f"/api/github/repos/all?username={BENCH_USER}&sort=stars"),
+	Scenario("resume_parsed", "/api/resume/parsed"),
+	Scenario("resume_range", "/api/resume/", headers={"Range": "bytes=0-65535"}, ok=(206,)),
+	Scenario(
+		"contact", "/api/contact/", method="POST",
+		json={"name": "Bench", "email": "bench@example.com", "subject": "Load", "message": "Hello"},
+		ok=(202,),
+	),
+	Scenario(
+		"presign", "/api/uploads/presign", method="POST",
+		json={"filename": "bench.png", "contentType": "image/png"},
+	),
+	Scenario(
+		"presign_batch", "/api/uploads/presign/batch", method="POST",
+		json={"files": [{"filename": f"bench-{i}.png", "contentType": "image/png"} for i in range(20)]},
+	),
+	Scenario("metrics", "/api/metrics"),
+]
+
+
+# --- stand-ins --------------------------------------------------------------
+
+def _github_transport(repo_count: int) -> httpx.MockTransport:
+	repos = [
+		{
+			"id": i,
+			"name": f"repo-{i}",
+			"full_name": f"{BENCH_USER}/repo-{i}",
+			"html_url": f"https://github.com/{BENCH_USER}/repo-{i}",
+			"description": f"Synthetic repository {i}",
+			"language": ("Python", "TypeScript", "Go")[i % 3],
+			"stargazers_count": (i * 37) % 500,
+			"forks_count": i % 20,
+			"updated_at": f"2024-01-{1 + i % 28:02d}T00:00:00Z",
+			"topics": ["bench", f"t{i % 5}"],
+		}
+		for i in range(repo_count)
+	]
+
+	def handler(request: httpx.Request) -> httpx.Response:
+		per_page = int(request.url.params.get("per_page", "30"))
+		page = int(request.url.params.get("page", "1"))
+		last = max(1, math.ceil(len(repos) / per_page))
+		headers = {"ETag": f'"bench-{page}-{per_page}"', "X-RateLimit-Remaining": "4999", "X-RateLimit-Limit": "5000"}
+		if request.headers.get("if-none-match") == headers["ETag"]:
+			return httpx.Response(304, headers=headers)
+		if page < last:
+			base = str(request.url.copy_with(params=None))
+			headers["Link"] = f'<{base}?per_page={per_page}&page={page + 1}>; rel="next", <{base}?per_page={per_page}&page={last}>; rel="last"'
+		return httpx.Response(200, json=repos[(page - 1) * per_page:page * per_page], headers=headers)
+
+	return httpx.MockTransport(handler)
+
+
+def _sqlite_blog_table():
+	# blog_posts without the Postgres-only types: JSON for JSONB, no search_vector
+	from sqlalchemy import JSON, TIMESTAMP, Boolean, Column, Integer, MetaData, String, Table, Text, text
+
+	now = lambda: datetime.now(timezone.utc)  # noqa: E731
+	return Table(
+		"blog_posts",
+		MetaData(),
+		Column("slug", String(200), primary_key=True),
+		Column("title", String(300), nullable=False),
+		Column("summary", String(1000), nullable=False),
+		Column("content", Text, nullable=False),
+		Column("tags", JSON, nullable=True),
+		Column("published", Boolean, server_default=text("1")),
+		Column("created_at", TIMESTAMP(timezone=True), default=now),
+		Column("updated_at", TIMESTAMP(timezone=True), default=now, onupdate=now),
+		Column("html", Text, nullable=True),
+		Column("excerpt", Text, nullable=True),
+		Column("word_count", Integer, nullable=True),
+		Column("reading_minutes", Integer, nullable=True),
+	)
+
+
+def _seed_blog(post_count: int) -> None:
+	from app.routers import blog
+
+	table = blog._get_table()
+	start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+	rows = [
+		{
+			"slug": f"bench-post-{i}",
+			"title": f"Benchmark post {i}: a streaming pipeline",
+			"summary": "Kafka, Flink and Iceberg notes used by benchmarks.load.",
+			"content": "A paragraph about exactly-once pipelines and checkpoints. " * 40,
+			"tags": ["bench", f"t{i % 5}"],
+			"created_at": start + timedelta(hours=i),
+			"updated_at": start + timedelta(hours=i),
+		}
+		for i in range(post_count)
+	]
+	with blog._get_engine().begin() as conn:
+		conn.execute(table.delete().where(table.c.slug.like("bench-%")))
+		conn.execute(table.insert(), rows)
+
+
+def configure(args: argparse.Namespace, workdir: Path):
+	"""Point every router at its stand-in and return a fresh app. Call before startup."""
+	os.environ.update({
+		"RESUME_FILE": str(Path(args.resume_pdf).resolve()),
+		"RESUME_CACHE_DIR": str(workdir / "resume-cache"),
+		"CONTACT_SQLITE_PATH": str(workdir / "contact.sqlite3"),
+		"CONTACT_BURST": "1000000000",
+		"CONTACT_RATE_PER_MIN": "1000000000",
+		"BLOB_DIR": str(workdir / "blobs"),
+		"AWS_REGION": "us-east-1",
+		"AWS_ACCESS_KEY_ID": "AKIABENCHMARK0000000",
+		"AWS_SECRET_ACCESS_KEY": "bench-secret",
+		"S3_BUCKET": "bench-bucket",
+	})
+	if args.database_url:
+		os.environ["DATABASE_URL"] = args.database_url
+	else:
+		os.environ.pop("DATABASE_URL", None)
+		os.environ.pop("POSTGRES_URL", None)
+
+	from sqlalchemy import create_engine
+	from sqlalchemy.pool import StaticPool
+
+	from app.main import create_app
+	from app.routers import blog, github
+	from app.services.metrics import instrument_engine
+
+	if not args.database_url:
+		blog.Db.engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False}, future=True)
+		blog.Db.table = _sqlite_blog_table()
+		blog.Db.table.metadata.create_all(blog.Db.engine)
+		blog.Db.schema_ready = True
+		instrument_engine(blog.Db.engine, "blog")
+	github.Http.client = httpx.AsyncClient(base_url=github.GITHUB_API, transport=_github_transport(args.repos))
+	return create_app()
+
+
+def _scenarios(args: argparse.Namespace) -> List[Scenario]:
+	selected = [s for s in SCENARIOS if args.database_url or not s.postgres_only]
+	if args.endpoints:
+		selected = [s for s in selected if s.name in args.endpoints]
+	return selected
+
+
+# --- driver -----------------------------------------------------------------
+
+def percentile(sorted_values: Sequence[float], p: float) -> float:
+	"""Nearest-rank percentile of an ascending sequence."""
+	if not sorted_values:
+		return float("nan")
+	return sorted_values[max(0, math.ceil(p / 100 * len(sorted_values)) - 1)]
+
+
+async def _drive(client: httpx.AsyncClient, scenario: Scenario, total: int, concurrency: int, warmup: int) -> Dict[str, Any]:
+	latencies: List[float] = []
+	errors: Dict[str, int] = {}
+	remaining = 0
+
+	async def worker() -> None:
+		nonlocal remaining
+		while remaining > 0:
+			remaining -= 1
+			start = time.perf_counter()
+			try:
+				resp = await client.request(scenario.method, scenario.path, json=scenario.json, headers=scenario.headers)
+				await resp.aread()
+				status = str(resp.status_code) if resp.status_code not in scenario.ok else None
+			except httpx.HTTPError as exc:
+				status = type(exc).__name__
+			latencies.append(time.perf_counter() - start)
+			if status is not None:
+				errors[status] = errors.get(status, 0) + 1
+
+	remaining = warmup
+	await asyncio.gather(*(worker() for _ in range(concurrency)))
+	latencies.clear()
+	errors.clear()
+	remaining = total
+	started = time.perf_counter()
+	await asyncio.gather(*(worker() for _ in range(concurrency)))
+	elapsed = time.perf_counter() - started
+	latencies.sort()
+	return {
+		"requests": total,
+		"concurrency": concurrency,
+		"rps": total / elapsed,
+		"p50_ms": percentile(latencies, 50) * 1000,
+		"p95_ms": percentile(latencies, 95) * 1000,
+		"p99_ms": percentile(latencies, 99) * 1000,
+		"max_ms": latencies[-1] * 1000,
+		"errors": errors,
+	}
+
+
+async def _run_all(client: httpx.AsyncClient, args: argparse.Namespace) -> Dict[str, Dict[str, Any]]:
+	results: Dict[str, Dict[str, Any]] = {}
+	for concurrency in args.concurrency:
+		for scenario in _scenarios(args):
+			key = f"{scenario.name}@{concurrency}"
+			results[key] = await _drive(client, scenario, args.requests, concurrency, args.warmup)
+			r = results[key]
+			print(
+				f"{key:<22} {r['rps']:>9.1f} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['p99_ms']:>9.2f}"
+				f"  {sum(r['errors'].values()) or ''}",
+				flush=True,
+			)
+	return results
+
+
+async def _run_asgi(args: argparse.Namespace, workdir: Path) -> Dict[str, Dict[str, Any]]:
+	app = configure(args, workdir)
+	# ASGITransport doesn't send lifespan events; run the app's startup/shutdown handlers directly
+	await app.router.startup()
+	try:
+		_seed_blog(args.posts)
+		transport = httpx.ASGITransport(app=app)
+		async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+			return await _run_all(client, args)
+	finally:
+		await app.router.shutdown()
+
+
+def _free_port() -> int:
+	with socket.socket() as s:
+		s.bind(("127.0.0.1", 0))
+		return s.getsockname()[1]
+
+
+async def _run_uvicorn(args: argparse.Namespace, workdir: Path) -> Dict[str, Dict[str, Any]]:
+	port = _free_port()
+	cmd = [sys.executable, "-m", "benchmarks.load", "--serve", str(port), "--workdir", str(workdir), *sys.argv[1:]]
+	server = subprocess.Popen(cmd, cwd=Path(__file__).resolve().parents[1])
+	base_url = f"http://127.0.0.1:{port}"
+	limits = httpx.Limits(max_connections=max(args.concurrency), max_keepalive_connections=max(args.concurrency))
+	try:
+		async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+			deadline = time.monotonic() + 60
+			while True:
+				if server.poll() is not None:
+					raise SystemExit("uvicorn exited during startup")
+				try:
+					if (await client.get("/api/health")).status_code == 200:
+						break
+				except httpx.TransportError:
+					pass
+				if time.monotonic() > deadline:
+					raise SystemExit("uvicorn did not become ready")
+				await asyncio.sleep(0.2)
+			return await _run_all(client, args)
+	finally:
+		server.terminate()
+		server.wait(timeout=30)
+
+
+def _serve(args: argparse.Namespace) -> None:
+	import uvicorn
+
+	from app.routers import blog
+
+	app = configure(args, Path(args.workdir))
+	# Create the table now (idempotent) so it can be seeded before serving
+	blog.init_table()
+	_seed_blog(args.posts)
+	uvicorn.run(app, host="127.0.0.1", port=args.serve, log_level="warning", access_log=False)
+
+
+# --- reporting --------------------------------------------------------------
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], threshold: float) -> List[str]:
+	"""Human-readable regressions of ``results`` against ``baseline``; empty if none."""
+	problems: List[str] = []
+	for key, current in results.items():
+		if current["errors"]:
+			problems.append(f"{key}: failed requests {current['errors']}")
+		base = baseline.get(key)
+		if base is None:
+			continue
+		if current["p95_ms"] > base["p95_ms"] * (1 + threshold):
+			problems.append(f"{key}: p95 {base['p95_ms']:.2f} -> {current['p95_ms']:.2f} ms")
+		if current["rps"] < base["rps"] * (1 - threshold):
+			problems.append(f"{key}: rps {base['rps']:.1f} -> {current['rps']:.1f}")
+	return problems
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--target", choices=["asgi", "uvicorn"], default="asgi")
+	parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16])
+	parser.add_argument("--requests", type=int, default=500, help="Timed requests per endpoint and concurrency level")
+	parser.add_argument("--warmup", type=int, default=50)
+	parser.add_argument("--endpoints", nargs="+", help="Only these scenarios: " + ", ".join(s.name for s in SCENARIOS))
+	parser.add_argument("--database-url", help="Benchmark against this Postgres instead of SQLite")
+	parser.add_argument("--posts", type=int, default=200)
+	parser.add_argument("--repos", type=int, default=250)
+	parser.add_argument("--resume-pdf", default=str(DEFAULT_PDF))
+	parser.add_argument("--output", help="Write results as JSON to this file")
+	parser.add_argument("--baseline", help="Compare against results previously written with --output")
+	parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative p95/RPS regression")
+	parser.add_argument("--serve", type=int, help=argparse.SUPPRESS)
+	parser.add_argument("--workdir", help=argparse.SUPPRESS)
+	args = parser.parse_args()
+
+	if args.serve:
+		_serve(args)
+		return
+
+	with tempfile.TemporaryDirectory(prefix="portfolio-bench-") as tmp:
+		print(f"target={args.target} db={'postgres' if args.database_url else 'sqlite'} requests={args.requests}")
+		print(f"{'endpoint@concurrency':<22} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}  errors")
+		runner = _run_uvicorn if args.target == "uvicorn" else _run_asgi
+		results = asyncio.run(runner(args, Path(tmp)))
+
+	report = {
+		"meta": {
+			"target": args.target,
+			"db": "postgres" if args.database_url else "sqlite",
+			"requests": args.requests,
+			"python": platform.python_version(),
+			"platform": platform.platform(),
+			"cpus": os.cpu_count(),
+			"created_at": datetime.now(timezone.utc).isoformat(),
+		},
+		"results": results,
+	}
+	if args.output:
+		Path(args.output).write_text(json.dumps(report, indent=2))
+
+	if args.baseline:
+		baseline = json.loads(Path(args.baseline).read_text())["results"]
+		problems = compare(results, baseline, args.threshold)
+		if problems:
+			print(f"\nRegressions beyond {args.threshold:.0%}:")
+			for problem in problems:
+				print(f"  {problem}")
+			raise SystemExit(1)
+		print(f"\nNo regressions beyond {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+	main()
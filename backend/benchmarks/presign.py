@@ -0,0 +1,91 @@
+"""CPU cost of presigning S3 upload URLs, entirely offline.
+
+Presigning is local HMAC work, so dummy credentials are enough. Compares:
+
+- ``per-call client``: a new boto3 Session and S3 client for every URL (what
+  /api/uploads/presign used to do)
+- ``cached client``: the process-wide client from ``uploads._s3_client``
+- ``batch``: one /presign/batch request for ``--batch`` files, per file
+- ``part urls``: multipart ``upload_part`` URLs, per part
+
+The last section rotates AWS_SECRET_ACCESS_KEY and checks the cached client
+is rebuilt. Example:
+
+	cd backend
+	python -m benchmarks.presign --batch 50
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from typing import Callable
+
+
+def _configure() -> None:
+	os.environ.update({
+		"AWS_REGION": "us-east-1",
+		"AWS_ACCESS_KEY_ID": "AKIABENCHMARK0000000",
+		"AWS_SECRET_ACCESS_KEY": "bench-secret-1",
+		"S3_BUCKET": "bench-bucket",
+	})
+	os.environ.pop("AWS_SESSION_TOKEN", None)
+
+
+def _per_call(fn: Callable[[], object], calls: int) -> float:
+	fn()
+	start = time.process_time()
+	for _ in range(calls):
+		fn()
+	return (time.process_time() - start) / calls
+
+
+def _legacy_presign() -> str:
+	import boto3
+	from botocore.client import Config
+
+	session = boto3.session.Session(
+		aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
+		aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
+		region_name=os.getenv("AWS_REGION"),
+	)
+	client = session.client("s3", config=Config(signature_version="s3v4"))
+	return client.generate_presigned_url(
+		"put_object",
+		Params={"Bucket": "bench-bucket", "Key": "images/bench.png", "ContentType": "image/png"},
+		ExpiresIn=3600,
+	)
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--calls", type=int, default=200)
+	parser.add_argument("--batch", type=int, default=50)
+	args = parser.parse_args()
+	_configure()
+
+	from app.routers import uploads
+
+	one = uploads.PresignRequest(filename="bench.png", contentType="image/png")
+	batch = uploads.BatchPresignRequest(files=[one] * args.batch)
+	parts = uploads.MultipartPartsRequest(key="images/bench.bin", uploadId="bench-upload", partNumbers=list(range(1, args.batch + 1)))
+
+	t_legacy = _per_call(_legacy_presign, max(args.calls // 10, 5))
+	t_cached = _per_call(lambda: uploads.presign(one), args.calls)
+	t_batch = _per_call(lambda: uploads.presign_batch(batch), max(args.calls // args.batch, 5)) / args.batch
+	t_parts = _per_call(lambda: uploads.presign_parts(parts), max(args.calls // args.batch, 5)) / args.batch
+
+	print(f"{'mode':<18} {'µs per URL':>11}")
+	for name, seconds in (("per-call client", t_legacy), ("cached client", t_cached), ("batch", t_batch), ("part urls", t_parts)):
+		print(f"{name:<18} {seconds * 1e6:>11.1f}")
+	print(f"cached client speedup: {t_legacy / t_cached:.1f}x")
+
+	client = uploads._s3_client()[0]
+	assert uploads._s3_client()[0] is client, "client was rebuilt without a credential change"
+	os.environ["AWS_SECRET_ACCESS_KEY"] = "bench-secret-2"
+	assert uploads._s3_client()[0] is not client, "client was not rebuilt after the secret changed"
+	print("credential rotation: client rebuilt")
+
+
+if __name__ == "__main__":
+	main()
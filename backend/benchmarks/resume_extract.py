@@ -0,0 +1,79 @@
+"""Compare serial resume extraction with the page-parallel PdfExtractor.
+
+Each mode runs in a fresh subprocess so peak RSS (parent + worker processes)
+is measured independently. Inputs are PDFs or directories of PDFs; with none,
+the bundled resume is parsed ``--copies`` times. Example:
+
+	cd backend
+	python -m benchmarks.resume_extract ~/resumes --workers 8
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+
+DEFAULT_PDF = Path(__file__).resolve().parents[2] / "frontend" / "src" / "resume.pdf"
+
+
+def _collect(targets: List[str], copies: int) -> List[Path]:
+	if not targets:
+		return [DEFAULT_PDF] * copies
+	paths: List[Path] = []
+	for target in map(Path, targets):
+		paths.extend(sorted(target.glob("*.pdf")) if target.is_dir() else [target])
+	return paths
+
+
+def _run(mode: str, paths: List[Path], workers: int, pages_per_task: int) -> dict:
+	from app.services.pdf_extract import PdfExtractor
+	from app.services.resume_parser import extract_resume_text, parse_resume_text
+
+	start = time.perf_counter()
+	if mode == "serial":
+		for path in paths:
+			parse_resume_text(extract_resume_text(path))
+	else:
+		with PdfExtractor(max_workers=workers, pages_per_task=pages_per_task) as extractor:
+			for _ in extractor.parse_many(paths):
+				pass
+	wall = time.perf_counter() - start
+	# ru_maxrss is KiB on Linux; children covers the pool's worker processes
+	self_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	child_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+	return {"mode": mode, "docs": len(paths), "wall_s": wall, "peak_rss_mib": self_rss / 1024, "peak_child_rss_mib": child_rss / 1024}
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("paths", nargs="*")
+	parser.add_argument("--copies", type=int, default=32)
+	parser.add_argument("--workers", type=int, default=None)
+	parser.add_argument("--pages-per-task", type=int, default=2)
+	parser.add_argument("--mode", choices=["serial", "parallel"], help=argparse.SUPPRESS)
+	args = parser.parse_args()
+
+	paths = _collect(args.paths, args.copies)
+	if args.mode:
+		print(json.dumps(_run(args.mode, paths, args.workers, args.pages_per_task)))
+		return
+
+	print(f"{len(paths)} document(s)")
+	print(f"{'mode':<9} {'wall s':>8} {'docs/s':>8} {'peak RSS MiB':>13} {'worker RSS MiB':>15}")
+	for mode in ("serial", "parallel"):
+		cmd = [sys.executable, "-m", "benchmarks.resume_extract", "--mode", mode, "--copies", str(args.copies), "--pages-per-task", str(args.pages_per_task)]
+		if args.workers:
+			cmd += ["--workers", str(args.workers)]
+		out = subprocess.run(cmd + args.paths, check=True, capture_output=True, text=True).stdout
+		r = json.loads(out.strip().splitlines()[-1])
+		print(f"{mode:<9} {r['wall_s']:>8.2f} {r['docs'] / r['wall_s']:>8.1f} {r['peak_rss_mib']:>13.1f} {r['peak_child_rss_mib']:>15.1f}")
+
+
+if __name__ == "__main__":
+	main()
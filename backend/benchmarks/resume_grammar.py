@@ -0,0 +1,164 @@
+"""Throughput and allocation benchmark for parse_resume_text on a synthetic corpus.
+
+Compares the compiled single-pass grammar with the previous implementation
+(kept below as ``legacy_parse_resume_text``) and checks both agree on every
+document. Example:
+
+	cd backend
+	python -m benchmarks.resume_grammar --docs 5000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+import tracemalloc
+from dataclasses import asdict
+from typing import Callable, List
+
+from app.services.resume_parser import ParsedResume, parse_resume_text
+
+
+def legacy_parse_resume_text(text: str) -> ParsedResume:
+	lines = [line.strip() for line in text.splitlines()]
+	lines = [ln for ln in lines if ln]
+
+	summary_lines: List[str] = []
+	skills: List[str] = []
+	education_lines: List[str] = []
+	experience_snippets: List[str] = []
+
+	section = None
+	for ln in lines:
+		upper_ln = ln.upper()
+		if any(h in upper_ln for h in ["SUMMARY", "PROFILE", "OBJECTIVE"]):
+			section = "summary"
+			continue
+		if any(h in upper_ln for h in ["SKILLS", "TECHNICAL SKILLS", "CORE SKILLS"]):
+			section = "skills"
+			continue
+		if any(h in upper_ln for h in ["EDUCATION"]):
+			section = "education"
+			continue
+		if any(h in upper_ln for h in ["EXPERIENCE", "WORK EXPERIENCE", "PROFESSIONAL EXPERIENCE"]):
+			section = "experience"
+			continue
+
+		if section == "summary":
+			summary_lines.append(ln)
+		elif section == "skills":
+			for part in [p.strip("•- \t,;=") for p in ln.replace(";", ",").split(",")]:
+				if part:
+					skills.append(part)
+		elif section == "education":
+			education_lines.append(ln)
+		elif section == "experience":
+			if len(ln) <= 200:
+				experience_snippets.append(ln)
+
+	summary = " ".join(summary_lines).strip() or None
+	education = " \n".join(education_lines).strip() or None
+	seen = set()
+	unique_skills: List[str] = []
+	for s in skills:
+		key = s.lower()
+		if key not in seen:
+			seen.add(key)
+			unique_skills.append(s)
+
+	return ParsedResume(
+		summary=summary,
+		skills=unique_skills[:50],
+		education=education,
+		experience_snippets=experience_snippets[:50],
+	)
+
+
+WORDS = (
+	"data pipeline kafka flink spark airflow python scala sql dashboards latency throughput "
+	"customers revenue launched designed migrated scaled reduced improved team mentored "
+	"platform streaming batch warehouse lakehouse iceberg modeling experimentation"
+).split()
+SKILLS = "Python, SQL, Go, Rust, Kafka, Flink, Spark, Airflow, dbt, Iceberg, Postgres, Redis, AWS, GCP, Docker, Kubernetes".split(", ")
+HEADERS = {
+	"summary": ["SUMMARY", "Professional Summary", "PROFILE", "Career Objective"],
+	"skills": ["SKILLS", "Technical Skills", "CORE SKILLS"],
+	"education": ["EDUCATION", "Education & Training"],
+	"experience": ["EXPERIENCE", "Work Experience", "PROFESSIONAL EXPERIENCE"],
+}
+
+
+def synthetic_resume(rng: random.Random) -> str:
+	def sentence(lo: int, hi: int) -> str:
+		return " ".join(rng.choice(WORDS) for _ in range(rng.randint(lo, hi))).capitalize()
+
+	out = [f"Jane Doe {rng.randint(1, 9999)}", "jane@example.com | +1 555 0100", ""]
+	sections = list(HEADERS)
+	rng.shuffle(sections)
+	for name in sections:
+		out.append(rng.choice(HEADERS[name]))
+		if name == "summary":
+			out.extend(sentence(8, 20) for _ in range(rng.randint(2, 5)))
+		elif name == "skills":
+			for _ in range(rng.randint(2, 4)):
+				out.append("• " + rng.choice([", ", "; "]).join(rng.sample(SKILLS, rng.randint(3, 8))))
+		elif name == "education":
+			out.append(f"B.S. Computer Science, State University, {rng.randint(2000, 2020)}")
+		else:
+			for _ in range(rng.randint(3, 8)):
+				out.append(f"Engineer, Company {rng.randint(1, 99)} ({rng.randint(2010, 2024)})")
+				out.extend("- " + sentence(6, 45) for _ in range(rng.randint(2, 6)))
+		out.append("")
+	return "\n".join(out) + "\f"
+
+
+def _throughput(fn: Callable[[str], ParsedResume], corpus: List[str], rounds: int) -> float:
+	best = float("inf")
+	for _ in range(rounds):
+		start = time.perf_counter()
+		for text in corpus:
+			fn(text)
+		best = min(best, time.perf_counter() - start)
+	return len(corpus) / best
+
+
+def _peak_alloc_kib(fn: Callable[[str], ParsedResume], corpus: List[str]) -> float:
+	peaks = []
+	tracemalloc.start()
+	try:
+		for text in corpus:
+			tracemalloc.reset_peak()
+			base = tracemalloc.get_traced_memory()[0]
+			result = fn(text)
+			peaks.append(tracemalloc.get_traced_memory()[1] - base)
+			del result
+	finally:
+		tracemalloc.stop()
+	return statistics.mean(peaks) / 1024
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--docs", type=int, default=5000)
+	parser.add_argument("--rounds", type=int, default=3)
+	parser.add_argument("--seed", type=int, default=7)
+	args = parser.parse_args()
+
+	rng = random.Random(args.seed)
+	corpus = [synthetic_resume(rng) for _ in range(args.docs)]
+	mismatches = sum(asdict(parse_resume_text(t)) != asdict(legacy_parse_resume_text(t)) for t in corpus)
+	if mismatches:
+		raise SystemExit(f"{mismatches} document(s) parse differently from the legacy implementation")
+
+	size_kib = sum(len(t) for t in corpus) / 1024
+	print(f"{args.docs} synthetic resumes, {size_kib:.0f} KiB total; outputs identical")
+	print(f"{'impl':<9} {'docs/s':>10} {'MiB/s':>8} {'peak KiB/doc':>13}")
+	for name, fn in (("legacy", legacy_parse_resume_text), ("grammar", parse_resume_text)):
+		rate = _throughput(fn, corpus, args.rounds)
+		peak = _peak_alloc_kib(fn, corpus[: min(len(corpus), 500)])
+		print(f"{name:<9} {rate:>10.0f} {rate * size_kib / len(corpus) / 1024:>8.2f} {peak:>13.1f}")
+
+
+if __name__ == "__main__":
+	main()
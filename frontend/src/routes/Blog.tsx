@@ -2,20 +2,45 @@ import { Link } from 'react-router-dom'
 import { useEffect, useState } from 'react'
 import type { BlogPost } from './blogData'
 
+// One page of the blog index; the API sends the cursor for the next page in X-Next-Cursor
+async function fetchPage(base: string, cursor: string | null, signal?: AbortSignal): Promise<{ posts: BlogPost[], next: string | null }> {
+	const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : ''
+	const res = await fetch(`${base}/api/blog/${query}`, { signal })
+	if (!res.ok) throw new Error(`Failed: ${res.status}`)
+	const posts: BlogPost[] = await res.json()
+	return { posts, next: res.headers.get('X-Next-Cursor') }
+}
+
 export default function Blog() {
 	const [posts, setPosts] = useState<BlogPost[]>([])
+	const [nextCursor, setNextCursor] = useState<string | null>(null)
 	const [loading, setLoading] = useState(true)
+	const [loadingMore, setLoadingMore] = useState(false)
 	const [error, setError] = useState<string | null>(null)
 	const base = (import.meta.env.VITE_API_URL as string | undefined) || 'https://libinguo-io.onrender.com'
 
+	async function loadMore() {
+		if (!nextCursor) return
+		setLoadingMore(true)
+		try {
+			const page = await fetchPage(base, nextCursor)
+			setPosts((current) => [...current, ...page.posts])
+			setNextCursor(page.next)
+		} catch (e: any) {
+			setError(e.message ?? 'Error')
+		} finally {
+			setLoadingMore(false)
+		}
+	}
+
 	useEffect(() => {
 		const controller = new AbortController()
+		// Starts again from the first page, so a change anywhere in the list is picked up
 		async function fetchPosts() {
 			try {
-				const res = await fetch(`${base}/api/blog/`, { signal: controller.signal })
-				if (!res.ok) throw new Error(`Failed: ${res.status}`)
-				const data: BlogPost[] = await res.json()
-				setPosts(data)
+				const page = await fetchPage(base, null, controller.signal)
+				setPosts(page.posts)
+				setNextCursor(page.next)
 			} catch (e: any) {
 				if (e.name !== 'AbortError') setError(e.message ?? 'Error')
 			} finally {
@@ -23,7 +48,15 @@ export default function Blog() {
 			}
 		}
 		fetchPosts()
-		return () => controller.abort()
+		// Refetch when the API pushes a change instead of polling
+		const changes = new EventSource(`${base}/api/blog/changes`)
+		for (const op of ['create', 'update', 'delete', 'upsert', 'reset', 'resync']) {
+			changes.addEventListener(op, () => { fetchPosts() })
+		}
+		return () => {
+			changes.close()
+			controller.abort()
+		}
 	}, [])
 
 	if (loading) return <div>Loading posts…</div>
@@ -49,9 +82,9 @@ export default function Blog() {
 									method: 'POST', headers: { 'Content-Type': 'application/json' }, body: JSON.stringify(data)
 								})
 								// reload
-								setLoading(true)
-								const res = await fetch(`${base}/api/blog/`)
-								setPosts(await res.json())
+								const page = await fetchPage(base, null)
+								setPosts(page.posts)
+								setNextCursor(page.next)
 							} catch (err) {
 								console.error(err)
 							}
@@ -67,6 +100,11 @@ export default function Blog() {
 						<p className="text-sm text-zinc-600 dark:text-zinc-400 mt-2">{p.summary}</p>
 					</article>
 				))}
+				{nextCursor && (
+					<button type="button" disabled={loadingMore} onClick={loadMore} className="px-4 py-2 rounded-md bg-zinc-900 text-white dark:bg-zinc-100 dark:text-zinc-900">
+						{loadingMore ? 'Loading…' : 'Load more'}
+					</button>
+				)}
 			</div>
 		</section>
 	)
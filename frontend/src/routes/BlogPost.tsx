@@ -35,10 +35,17 @@ export default function BlogPost() {
 	return (
 		<article className="space-y-4">
 			<h1 className="text-2xl font-semibold">{post.title}</h1>
-			<p className="text-xs text-zinc-500">{new Date(post.created_at).toLocaleDateString()}</p>
-			<div className="prose dark:prose-invert max-w-none whitespace-pre-wrap">
-				{post.content}
-			</div>
+			<p className="text-xs text-zinc-500">
+				{new Date(post.created_at).toLocaleDateString()}
+				{post.reading_minutes ? ` · ${post.reading_minutes} min read` : ''}
+			</p>
+			{post.html ? (
+				<div className="prose dark:prose-invert max-w-none" dangerouslySetInnerHTML={{ __html: post.html }} />
+			) : (
+				<div className="prose dark:prose-invert max-w-none whitespace-pre-wrap">
+					{post.content}
+				</div>
+			)}
 			<div className="mt-4 flex items-center gap-4">
 				<Link className="nav-link" to={`/blog/${post.slug}/edit`}>Edit</Link>
 				<button
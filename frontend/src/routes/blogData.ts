@@ -4,6 +4,11 @@ export type BlogPost = {
 	created_at: string
 	summary: string
 	content: string
+	// Sanitized HTML rendered by the API on write; absent for bundled posts and unrendered rows
+	html?: string | null
+	excerpt?: string | null
+	word_count?: number | null
+	reading_minutes?: number | null
 }
 
 export const blogPosts: BlogPost[] = [